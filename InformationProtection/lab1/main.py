@@ -1,78 +1,19 @@
 """
 Лабораторная работа №1 — криптографическая библиотека (Python)
 
-Содержит три основные функции:
- 1) mod_pow(a, e, m) — быстрое возведение в степень по модулю (реализация "square-and-multiply").
- 2) is_probable_prime_fermat(n, k=5) — тест простоты Ферма (вероятностный).
+Демонстрирует три основные функции общего пакета numtheory:
+ 1) mod_pow(a, e, m) — быстрое возведение в степень по модулю (встроенный pow, gmpy2 или скользящее окно).
+ 2) is_probable_prime_fermat(n, k=8) — тест простоты Ферма (вероятностный).
  3) extended_gcd(a, b) — обобщённый алгоритм Евклида; возвращает (g, x, y), где g = gcd(a,b) и ax + by = g.
 """
 
 import random
+import os
 import sys
 import argparse
-from typing import Tuple
-
-
-def mod_pow(a: int, e: int, m: int) -> int:
-    """Возведение a^e по модулю m — алгоритм быстрого возведения (square-and-multiply).
-
-    Работает корректно для больших целых чисел (Python int — неограничен).
-    """
-    if m == 1:
-        return 0
-    a %= m
-    result = 1
-    base = a
-    exp = e
-    while exp > 0:
-        if exp & 1:
-            result = (result * base) % m
-        base = (base * base) % m
-        exp >>= 1
-    return result
-
-
-def is_probable_prime_fermat(n: int, k: int = 8) -> bool:
-    """Проверка простоты тестом Ферма с k испытаниями.
-
-    Возвращает True, если n вероятно простое; False — если точно составное.
-    Для малого n делает детерминированную проверку.
-    """
-    if n <= 1:
-        return False
-    if n <= 3:
-        return True
-    if n % 2 == 0:
-        return False
-
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        if mod_pow(a, n - 1, n) != 1:
-            return False
-    return True
-
-
-def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
-    """Обобщённый алгоритм Евклида.
-
-    Возвращает (g, x, y) такие, что g = gcd(a, b) и a*x + b*y = g.
-    Работает с отрицательными a, b корректно.
-    """
-    old_r, r = abs(a), abs(b)
-    old_s, s = 1 if a >= 0 else -1, 0
-    old_t, t = 0, 1 if b >= 0 else -1
-
-    while r != 0:
-        q = old_r // r
-        old_r, r = r, old_r - q * r
-        old_s, s = s, old_s - q * s
-        old_t, t = t, old_t - q * t
-
-    g = old_r
-    x = old_s if a >= 0 else -old_s
-    y = old_t if b >= 0 else -old_t
-    return g, x, y
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from numtheory import mod_pow, extended_gcd, is_probable_prime_fermat, gen_probable_prime
 
 
 def gen_random_int(bits: int = 32) -> int:
@@ -87,18 +28,6 @@ def gen_random_in_range(low: int, high: int) -> int:
     return random.randint(low, high)
 
 
-def gen_probable_prime(bits: int = 32, k: int = 8) -> int:
-    """Генерация вероятно-простого числа с указанным количеством битов."""
-    if bits < 2:
-        raise ValueError('bits must be >= 2')
-
-    while True:
-        candidate = random.getrandbits(bits) | 1
-        candidate |= (1 << (bits - 1))
-        if is_probable_prime_fermat(candidate, k=k):
-            return candidate
-
-
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Криптографическая библиотека')
     parser.add_argument('--mode', choices=['input', 'rand', 'primes'], default='input',
@@ -1,72 +1,20 @@
 import hashlib
 import random
+import os
 import sys
 import argparse
-from typing import Tuple, list
-
-
-def mod_pow(base: int, exp: int, mod: int) -> int:
-    """Возведение в степень по модулю (base^exp) % mod."""
-    res = 1
-    base %= mod
-    while exp > 0:
-        if exp % 2 == 1:
-            res = (res * base) % mod
-        base = (base * base) % mod
-        exp //= 2
-    return res
-
-
-def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
-    """Расширенный алгоритм Евклида. Возвращает (НОД, x, y)."""
-    if a == 0:
-        return b, 0, 1
-    d, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return d, x, y
-
-
-def mod_inverse(a: int, m: int) -> int:
-    """Вычисление модульного обратного элемента a⁻¹ mod m."""
-    d, x, y = extended_gcd(a, m)
-    if d != 1:
-        raise ValueError(f"Обратный элемент не существует для a={a}, m={m}")
-    return x % m
-
-
-def is_probable_prime(n: int, k: int = 10) -> bool:
-    """Тест простоты Миллера-Рабина."""
-    if n < 2: return False
-    if n == 2 or n == 3: return True
-    if n % 2 == 0: return False
-    
-    d, s = n - 1, 0
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-    
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = mod_pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(s - 1):
-            x = mod_pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from numtheory import mod_pow, mod_inverse, is_probable_prime, gen_probable_prime, multi_exp, FixedBaseExp
+from numtheory.bench import measure
 
-def gen_probable_prime(bits: int = 32) -> int:
-    """Генерация вероятно-простого числа с заданным количеством битов."""
-    while True:
-        candidate = random.getrandbits(bits)
-        candidate |= (1 << (bits - 1)) | 1
-        if is_probable_prime(candidate):
-            return candidate
+
+# С этого числа уравнений на один ключ таблицы FixedBaseExp окупаются в verify_batch
+BATCH_TABLE_MIN = 8
 
 
 def generate_gost_keys(bits: int = 32) -> Tuple[int, int, int, int]:
@@ -113,10 +61,30 @@ def calculate_file_hash(filepath: str) -> bytes:
     return sha256_hash.digest()
 
 
-def gost_sign(hash_digest: bytes, p: int, q: int, a: int, x: int) -> list[Tuple[int, int]]:
+def _try_file_hash(filepath: str) -> Tuple[Optional[bytes], Optional[str]]:
+    """Хеш файла и None либо None и текст ошибки, если файл не удалось прочитать."""
+    try:
+        return calculate_file_hash(filepath), None
+    except OSError as e:
+        return None, e.strerror or str(e)
+
+
+def calculate_file_hashes(filepaths: list[str], workers: int = 8) -> list[Tuple[Optional[bytes], Optional[str]]]:
+    """Вычисляет хеши SHA-256 нескольких файлов параллельно в пуле потоков (чтение файлов - ввод-вывод).
+
+    Возвращает пары (хеш, ошибка): отсутствующий или нечитаемый файл не
+    прерывает пакет, для него возвращается (None, текст ошибки).
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_try_file_hash, filepaths))
+
+
+def gost_sign(hash_digest: bytes, p: int, q: int, a: int, x: int,
+              a_exp: Optional[FixedBaseExp] = None) -> list[Tuple[int, int]]:
     """
     Подписывает хеш по схеме ГОСТ Р 34.10-94 побайтово.
     Возвращает список пар (r, s) - подпись для каждого байта.
+    a_exp - предвычисленная таблица степеней a (FixedBaseExp), ускоряет a^k.
     """
     signature = []
     
@@ -125,7 +93,7 @@ def gost_sign(hash_digest: bytes, p: int, q: int, a: int, x: int) -> list[Tuple[
         k = random.randrange(1, q)
         
         # Вычисляем r = (a^k mod p) mod q
-        r = mod_pow(a, k, p) % q
+        r = (a_exp.pow(k) if a_exp else mod_pow(a, k, p)) % q
         
         # Вычисляем s = (k*h + x*r) mod q (формула ГОСТ)
         h = byte % q
@@ -136,11 +104,42 @@ def gost_sign(hash_digest: bytes, p: int, q: int, a: int, x: int) -> list[Tuple[
     return signature
 
 
+def digest_to_int(hash_digest: bytes, q: int) -> int:
+    """Хеш как число по модулю q; нулевое значение заменяется на 1 (по ГОСТ)."""
+    return int.from_bytes(hash_digest, 'big') % q or 1
+
+
+def gost_sign_digest(hash_digest: bytes, p: int, q: int, a: int, x: int,
+                     a_exp: Optional[FixedBaseExp] = None) -> list[Tuple[int, int]]:
+    """
+    Подписывает хеш целиком: h = int(hash) mod q.
+    Возвращает список из одной пары (r, s) - тот же формат файла, одна строка.
+    """
+    h = digest_to_int(hash_digest, q)
+    while True:
+        k = random.randrange(1, q)
+        r = (a_exp.pow(k) if a_exp else mod_pow(a, k, p)) % q
+        s = (k * h + x * r) % q
+        if r != 0 and s != 0:
+            return [(r, s)]
+
+
 def gost_verify(hash_digest: bytes, signature: list[Tuple[int, int]], p: int, q: int, a: int, y: int) -> bool:
     """
     Проверяет подпись ГОСТ Р 34.10-94 побайтово.
     Возвращает True, если подпись верна.
+
+    Подпись из одной пары проверяется как подпись всего хеша (gost_sign_digest).
     """
+    if len(signature) == 1 and len(hash_digest) != 1:
+        r, s = signature[0]
+        if r < 1 or r >= q or s < 1 or s >= q:
+            return False
+        h_inv = mod_inverse(digest_to_int(hash_digest, q), q)
+        u1 = (s * h_inv) % q
+        u2 = ((-r) * h_inv) % q
+        return (mod_pow(a, u1, p) * mod_pow(y, u2, p)) % p % q == r
+
     if len(signature) != len(hash_digest):
         return False
     
@@ -171,6 +170,51 @@ def gost_verify(hash_digest: bytes, signature: list[Tuple[int, int]], p: int, q:
     return True
 
 
+def _gost_check(h: int, r: int, s: int, p: int, q: int, a: int, y: int,
+                tables: Optional[Tuple[FixedBaseExp, FixedBaseExp]] = None) -> bool:
+    """Проверяет одно уравнение ГОСТ; a^u1 * y^u2 считается за один проход (трюк Шамира)
+    или по таблицам tables = (FixedBaseExp для основания, FixedBaseExp для y)."""
+    if r < 1 or r >= q or s < 1 or s >= q or h == 0:
+        return False
+    h_inv = mod_inverse(h, q)
+    u1, u2 = s * h_inv % q, (-r) * h_inv % q
+    if tables:
+        return tables[0].pow(u1) * tables[1].pow(u2) % p % q == r
+    return multi_exp([(a, u1), (y, u2)], p) % q == r
+
+
+def verify_batch(items: list[Tuple[bytes, list[Tuple[int, int]], Tuple[int, int, int, int]]]) -> list[bool]:
+    """
+    Пакетная проверка подписей ГОСТ Р 34.10-94.
+    items - список (hash_digest, signature, (p, q, a, y)); возвращает список результатов.
+
+    Тест малых показателей здесь неприменим: подпись хранит r = (a^k mod p) mod q,
+    а не само a^k mod p, и уравнения нельзя перемножить. Поэтому каждое уравнение
+    проверяется отдельно, но обе экспоненты a^u1 * y^u2 вычисляются совместно.
+    Если на один ключ приходится не меньше BATCH_TABLE_MIN уравнений, для a и y
+    строятся таблицы FixedBaseExp, и проверка обходится без возведений в квадрат.
+    """
+    equations = Counter()
+    for _, signature, key in items:
+        equations[key] += len(signature)
+    tables = {}
+    results = []
+    for hash_digest, signature, (p, q, a, y) in items:
+        if len(signature) == 1 and len(hash_digest) != 1:
+            hashes = [digest_to_int(hash_digest, q)]
+        elif len(signature) == len(hash_digest):
+            hashes = [byte % q for byte in hash_digest]
+        else:
+            results.append(False)
+            continue
+        key = (p, q, a, y)
+        if key not in tables and equations[key] >= BATCH_TABLE_MIN:
+            tables[key] = (FixedBaseExp(a, p, q.bit_length()), FixedBaseExp(y, p, q.bit_length()))
+        results.append(all(_gost_check(h, r, s, p, q, a, y, tables.get(key))
+                           for h, (r, s) in zip(hashes, signature)))
+    return results
+
+
 def save_key(key: Tuple[int, int, int, int], filepath: str):
     """Сохраняет ключ в файл."""
     with open(filepath, 'w') as f:
@@ -222,12 +266,26 @@ if __name__ == '__main__':
     sign_parser.add_argument("file", help="Файл, который нужно подписать")
     sign_parser.add_argument("--key", required=True, help="Файл с закрытым ключом")
     sign_parser.add_argument("--out", default=None, help="Файл для сохранения подписи")
+    sign_parser.add_argument("--format", choices=["digest", "bytes"], default="digest",
+                             help="digest - подпись всего хеша, bytes - побайтовая подпись (32 пары)")
+    sign_parser.add_argument("--no-cache", action="store_true",
+                             help="Не сохранять таблицу предвычисленных степеней рядом с ключом")
     
     verify_parser = subparsers.add_parser("verify", help="Проверить подпись файла")
     verify_parser.add_argument("file", help="Файл, подпись которого нужно проверить")
     verify_parser.add_argument("--key", required=True, help="Файл с открытым ключом")
     verify_parser.add_argument("--sig", required=True, help="Файл с подписью")
 
+    batch_parser = subparsers.add_parser("verify-batch", help="Проверить подписи многих файлов одним пакетом")
+    batch_parser.add_argument("files", nargs="+", help="Файлы, подписи которых нужно проверить")
+    batch_parser.add_argument("--key", required=True, help="Файл с открытым ключом")
+    batch_parser.add_argument("--sig-suffix", default=".sig", help="Суффикс файлов подписи (по умолчанию file.sig)")
+    batch_parser.add_argument("--workers", type=int, default=8, help="Число потоков для хеширования файлов")
+
+    bench_parser = subparsers.add_parser("bench", help="Замерить скорость подписи и проверки")
+    bench_parser.add_argument("--bits", type=int, default=512, help="Размер ключа (q будет вдвое короче)")
+    bench_parser.add_argument("--seconds", type=float, default=1.0, help="Время замера каждой операции, с")
+
     args = parser.parse_args()
 
     try:
@@ -252,7 +310,12 @@ if __name__ == '__main__':
             print(f"Хеш файла (SHA-256): {file_hash.hex()}")
             print(f"Размер хеша: {len(file_hash)} байт")
             
-            signature = gost_sign(file_hash, p, q, a, x)
+            # Таблица степеней a хранится рядом с ключом: <key>.a.fbe
+            a_exp = FixedBaseExp.cached(None if args.no_cache else args.key, 'a', a, p, q.bit_length())
+            if args.format == "digest":
+                signature = gost_sign_digest(file_hash, p, q, a, x, a_exp)
+            else:
+                signature = gost_sign(file_hash, p, q, a, x, a_exp)
             
             output_file = args.out if args.out else args.file + ".sig"
             save_signature(signature, output_file)
@@ -275,6 +338,49 @@ if __name__ == '__main__':
             else:
                 print("\nРЕЗУЛЬТАТ: ПРОВЕРКА НЕ ПРОЙДЕНА. Подпись неверна или файл был изменен.")
 
+        elif args.command == "verify-batch":
+            public_key = load_key(args.key)
+            start = time.perf_counter()
+            hashed = calculate_file_hashes(args.files, args.workers)
+            items = []
+            for path, (file_hash, error) in zip(args.files, hashed):
+                if error is not None:
+                    continue
+                try:
+                    signature = load_signature(path + args.sig_suffix)
+                except (OSError, ValueError):
+                    signature = []
+                items.append((file_hash, signature, public_key))
+            checked = iter(verify_batch(items))
+            results = [error is None and next(checked) for _, error in hashed]
+            elapsed = time.perf_counter() - start
+            for path, ok, (_, error) in zip(args.files, results, hashed):
+                if error is not None:
+                    print(f"ОШИБКА {path}: {error}")
+                else:
+                    print(f"{'OK    ' if ok else 'ОШИБКА'} {path}")
+            print(f"\nПроверено файлов: {len(results)}, верных подписей: {sum(results)} за {elapsed:.3f} с")
+            if not all(results):
+                sys.exit(2)
+
+        elif args.command == "bench":
+            print(f"Генерация ключей ГОСТ Р 34.10-94 (q={args.bits // 2} бит)...")
+            p, q, a, x, y = generate_gost_keys(args.bits)
+            # Хеш без нулевых байтов, чтобы побайтовая проверка не делила на ноль
+            file_hash = bytes(b % 255 + 1 for b in hashlib.sha256(b"benchmark").digest())
+            print(f"{'формат':<8} | {'подписей/с':>11} | {'проверок/с':>11}")
+            for name, sign in (("bytes", gost_sign), ("digest", gost_sign_digest)):
+                signature = sign(file_hash, p, q, a, x)
+                sign_rate = measure(sign, [(file_hash, p, q, a, x)], args.seconds)
+                verify_rate = measure(gost_verify, [(file_hash, signature, p, q, a, y)], args.seconds)
+                print(f"{name:<8} | {sign_rate:>11.1f} | {verify_rate:>11.1f}")
+            a_exp = FixedBaseExp(a, p, q.bit_length())
+            table_rate = measure(gost_sign_digest, [(file_hash, p, q, a, x, a_exp)], args.seconds)
+            print(f"{'table':<8} | {table_rate:>11.1f} | {'-':>11}")
+            batch = [(file_hash, gost_sign_digest(file_hash, p, q, a, x), (p, q, a, y)) for _ in range(64)]
+            batch_rate = measure(verify_batch, [(batch,)], args.seconds) * len(batch)
+            print(f"{'batch':<8} | {'-':>11} | {batch_rate:>11.1f}")
+
     except FileNotFoundError as e:
         print(f"\nОшибка: Файл не найден - {e.filename}", file=sys.stderr)
         sys.exit(1)
@@ -3,11 +3,16 @@ from tkinter import ttk, messagebox, scrolledtext
 import random
 import hashlib
 import json
+import os
+import sys
 from typing import List, Dict, Tuple
 import threading
 import time
 from tkinter import font
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from numtheory import gcd, mod_inverse, mod_pow
+
 
 class MentalPoker:
     def __init__(self):
@@ -196,45 +201,13 @@ class MentalPoker:
             # Генерируем Ci и Di такие, что Ci * Di ≡ 1 (mod p-1)
             while True:
                 Ci = random.randint(1, self.p - 1)
-                if self.gcd(Ci, self.p - 1) == 1:
+                if gcd(Ci, self.p - 1) == 1:
                     break
             
-            Di = self.mod_inverse(Ci, self.p - 1)
+            Di = mod_inverse(Ci, self.p - 1)
             self.player_keys[i] = (Ci, Di)
             self.log(f"Игрок {i+1} получил ключи: Ci={Ci}, Di={Di}")
             
-    def gcd(self, a: int, b: int) -> int:
-        """Вычисляет НОД двух чисел"""
-        while b:
-            a, b = b, a % b
-        return a
-    
-    def mod_inverse(self, a: int, m: int) -> int:
-        """Вычисляет обратный элемент a^(-1) mod m"""
-        def extended_gcd(a, b):
-            if a == 0:
-                return b, 0, 1
-            gcd, x1, y1 = extended_gcd(b % a, a)
-            x = y1 - (b // a) * x1
-            y = x1
-            return gcd, x, y
-        
-        gcd, x, y = extended_gcd(a, m)
-        if gcd != 1:
-            raise ValueError("Обратный элемент не существует")
-        return x % m
-    
-    def mod_pow(self, base: int, exp: int, mod: int) -> int:
-        """Возведение в степень по модулю"""
-        result = 1
-        base %= mod
-        while exp > 0:
-            if exp % 2 == 1:
-                result = (result * base) % mod
-            base = (base * base) % mod
-            exp //= 2
-        return result
-    
     def generate_deck(self):
         """Генерирует колоду карт"""
         suits = ['♠', '♥', '♦', '♣']
@@ -265,7 +238,7 @@ class MentalPoker:
             
             # Шифруем каждую карту
             for i in range(len(encrypted_deck)):
-                encrypted_deck[i] = self.mod_pow(encrypted_deck[i], Ci, self.p)
+                encrypted_deck[i] = mod_pow(encrypted_deck[i], Ci, self.p)
             
             # Перемешиваем зашифрованную колоду
             random.shuffle(encrypted_deck)
@@ -313,7 +286,7 @@ class MentalPoker:
             self.log(f"Игрок {player_id + 1} расшифровывает ключом Di={Di}")
             
             for i in range(len(decrypted_community)):
-                decrypted_community[i] = self.mod_pow(decrypted_community[i], Di, self.p)
+                decrypted_community[i] = mod_pow(decrypted_community[i], Di, self.p)
         
         # Преобразуем числа обратно в карты
         suits = ['♠', '♥', '♦', '♣']
@@ -2,11 +2,15 @@ import argparse
 import random
 import hashlib
 import json
+import os
 import sys
 from dataclasses import dataclass
 from typing import Tuple, Dict, Any
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from numtheory import gcd, mod_inverse, mod_pow
+
 
 @dataclass
 class Ballot:
@@ -43,46 +47,14 @@ class BlindSignatureServer:
         
         # Выбираем e (открытый ключ)
         e = 65537
-        while self.gcd(e, phi_n) != 1:
+        while gcd(e, phi_n) != 1:
             e += 2
             
         # Вычисляем d (закрытый ключ)
-        d = self.mod_inverse(e, phi_n)
+        d = mod_inverse(e, phi_n)
         
         return n, e, d
     
-    def gcd(self, a: int, b: int) -> int:
-        """Вычисляет НОД двух чисел"""
-        while b:
-            a, b = b, a % b
-        return a
-    
-    def mod_inverse(self, a: int, m: int) -> int:
-        """Вычисляет обратный элемент a^(-1) mod m"""
-        def extended_gcd(a, b):
-            if a == 0:
-                return b, 0, 1
-            gcd, x1, y1 = extended_gcd(b % a, a)
-            x = y1 - (b // a) * x1
-            y = x1
-            return gcd, x, y
-        
-        gcd, x, y = extended_gcd(a, m)
-        if gcd != 1:
-            raise ValueError("Обратный элемент не существует")
-        return x % m
-    
-    def mod_pow(self, base: int, exp: int, mod: int) -> int:
-        """Возведение в степень по модулю"""
-        result = 1
-        base %= mod
-        while exp > 0:
-            if exp % 2 == 1:
-                result = (result * base) % mod
-            base = (base * base) % mod
-            exp //= 2
-        return result
-    
     def hash_message(self, message: str) -> int:
         """Хеширует сообщение"""
         hash_obj = hashlib.sha256(message.encode())
@@ -92,7 +64,7 @@ class BlindSignatureServer:
     def sign_blinded_message(self, blinded_message: int) -> int:
         """Подписывает ослепленное сообщение"""
         # s' = (h')^d mod n
-        signature = self.mod_pow(blinded_message, self.d, self.n)
+        signature = mod_pow(blinded_message, self.d, self.n)
         self.log(f"Сервер подписал ослепленное сообщение: {signature}")
         return signature
     
@@ -100,7 +72,7 @@ class BlindSignatureServer:
         """Проверяет подпись"""
         h = self.hash_message(message)
         # Проверяем: s^e mod n == h
-        verification = self.mod_pow(signature, self.e, self.n)
+        verification = mod_pow(signature, self.e, self.n)
         return verification == h
     
     def log(self, message: str):
@@ -122,38 +94,6 @@ class BlindSignatureClient:
         self.n, self.e = server.get_public_key()
         self.log(f"Клиент {voter_id} инициализирован")
         
-    def gcd(self, a: int, b: int) -> int:
-        """Вычисляет НОД двух чисел"""
-        while b:
-            a, b = b, a % b
-        return a
-    
-    def mod_inverse(self, a: int, m: int) -> int:
-        """Вычисляет обратный элемент a^(-1) mod m"""
-        def extended_gcd(a, b):
-            if a == 0:
-                return b, 0, 1
-            gcd, x1, y1 = extended_gcd(b % a, a)
-            x = y1 - (b // a) * x1
-            y = x1
-            return gcd, x, y
-        
-        gcd, x, y = extended_gcd(a, m)
-        if gcd != 1:
-            raise ValueError("Обратный элемент не существует")
-        return x % m
-    
-    def mod_pow(self, base: int, exp: int, mod: int) -> int:
-        """Возведение в степень по модулю"""
-        result = 1
-        base %= mod
-        while exp > 0:
-            if exp % 2 == 1:
-                result = (result * base) % mod
-            base = (base * base) % mod
-            exp //= 2
-        return result
-    
     def hash_message(self, message: str) -> int:
         """Хеширует сообщение"""
         hash_obj = hashlib.sha256(message.encode())
@@ -167,11 +107,11 @@ class BlindSignatureClient:
         # Выбираем случайное r такое, что gcd(r, n) = 1
         while True:
             r = random.randint(1, self.n - 1)
-            if self.gcd(r, self.n) == 1:
+            if gcd(r, self.n) == 1:
                 break
         
         # h' = h * r^e mod n
-        blinded_message = (h * self.mod_pow(r, self.e, self.n)) % self.n
+        blinded_message = (h * mod_pow(r, self.e, self.n)) % self.n
         
         self.log(f"Ослепил сообщение: h={h}, r={r}, h'={blinded_message}")
         return blinded_message, r
@@ -179,7 +119,7 @@ class BlindSignatureClient:
     def unblind_signature(self, blinded_signature: int, r: int) -> int:
         """Разослепляет подпись"""
         # s = s' * r^(-1) mod n
-        r_inv = self.mod_inverse(r, self.n)
+        r_inv = mod_inverse(r, self.n)
         signature = (blinded_signature * r_inv) % self.n
         
         self.log(f"Разослепил подпись: s'={blinded_signature}, r^(-1)={r_inv}, s={signature}")
@@ -1,71 +1,11 @@
 import random
+import os
 import sys
 import argparse
 from typing import Tuple
 
-
-def mod_pow(base: int, exp: int, mod: int) -> int:
-    """Возведение в степень по модулю (base^exp) % mod."""
-    res = 1
-    base %= mod
-    while exp > 0:
-        if exp % 2 == 1:
-            res = (res * base) % mod
-        base = (base * base) % mod
-        exp //= 2
-    return res
-
-
-def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
-    """Расширенный алгоритм Евклида. Возвращает (НОД, x, y)."""
-    if a == 0:
-        return b, 0, 1
-    d, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return d, x, y
-
-
-def mod_inverse(a: int, m: int) -> int:
-    """Вычисление модульного обратного элемента a⁻¹ mod m."""
-    d, x, y = extended_gcd(a, m)
-    if d != 1:
-        raise ValueError(f"Обратный элемент не существует для a={a}, m={m}")
-    return x % m
-
-
-def is_probable_prime(n: int, k: int = 10) -> bool:
-    """Тест простоты Миллера-Рабина."""
-    if n < 2: return False
-    if n == 2 or n == 3: return True
-    if n % 2 == 0: return False
-    
-    d, s = n - 1, 0
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-    
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = mod_pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(s - 1):
-            x = mod_pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
-
-
-def gen_probable_prime(bits: int = 32) -> int:
-    """Генерация вероятно-простого числа с заданным количеством битов."""
-    while True:
-        candidate = random.getrandbits(bits)
-        candidate |= (1 << (bits - 1)) | 1
-        if is_probable_prime(candidate):
-            return candidate
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from numtheory import mod_pow, extended_gcd, mod_inverse, is_probable_prime, gen_probable_prime
 
 
 def generate_shamir_keys(p: int) -> Tuple[int, int, int, int]:
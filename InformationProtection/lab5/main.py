@@ -1,104 +1,28 @@
 import random
+import os
 import sys
 import argparse
-from typing import Tuple
-
-
-def mod_pow(base: int, exp: int, mod: int) -> int:
-    """Возведение в степень по модулю (base^exp) % mod."""
-    res = 1
-    base %= mod
-    while exp > 0:
-        if exp % 2 == 1:
-            res = (res * base) % mod
-        base = (base * base) % mod
-        exp //= 2
-    return res
-
-
-def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
-    """Расширенный алгоритм Евклида. Возвращает (НОД, x, y)."""
-    if a == 0:
-        return b, 0, 1
-    d, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return d, x, y
-
-
-def mod_inverse(a: int, m: int) -> int:
-    """Вычисление модульного обратного элемента a⁻¹ mod m."""
-    d, x, y = extended_gcd(a, m)
-    if d != 1:
-        raise ValueError(f"Обратный элемент не существует для a={a}, m={m}")
-    return x % m
-
-
-def is_probable_prime(n: int, k: int = 10) -> bool:
-    """Тест простоты Миллера-Рабина."""
-    if n < 2: return False
-    if n == 2 or n == 3: return True
-    if n % 2 == 0: return False
-    
-    d, s = n - 1, 0
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-    
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = mod_pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(s - 1):
-            x = mod_pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Optional, Tuple
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from numtheory import mod_pow, is_probable_prime, gen_prime_with_factorization, primitive_root, FixedBaseExp
 
-def gen_probable_prime(bits: int = 32) -> int:
-    """Генерация вероятно-простого числа с заданным количеством битов."""
-    while True:
-        candidate = random.getrandbits(bits)
-        candidate |= (1 << (bits - 1)) | 1
-        if is_probable_prime(candidate):
-            return candidate
 
+BLOCK_MAGIC = b'ELGB'
+CHUNK_BLOCKS = 1024
+EPHEMERAL_BATCH = 256
 
-def find_primitive_root(p: int) -> int:
-    """Поиск первообразного корня по модулю p."""
-    if p == 2:
-        return 1
-    
-    phi = p - 1
-    factors = []
-    temp = phi
-    
-    # Разложение phi на простые множители
-    d = 2
-    while d * d <= temp:
-        if temp % d == 0:
-            factors.append(d)
-            while temp % d == 0:
-                temp //= d
-        d += 1
-    if temp > 1:
-        factors.append(temp)
-    
-    # Поиск первообразного корня
-    for g in range(2, p):
-        is_primitive = True
-        for factor in factors:
-            if mod_pow(g, phi // factor, p) == 1:
-                is_primitive = False
-                break
-        if is_primitive:
-            return g
-    
-    raise ValueError("Первообразный корень не найден")
+
+def find_primitive_root(p: int, factors: Optional[dict[int, int]] = None) -> int:
+    """Поиск первообразного корня по модулю p.
+
+    Кандидаты проверяются по разложению p - 1; если оно не передано,
+    p - 1 раскладывается ρ-методом Полларда-Брента с кэшем (numtheory.factorize).
+    """
+    return primitive_root(p, factors)
 
 
 def generate_elgamal_keys(bits: int = 32) -> Tuple[int, int, int, int]:
@@ -110,8 +34,9 @@ def generate_elgamal_keys(bits: int = 32) -> Tuple[int, int, int, int]:
     - Cb - открытый ключ Боба
     - Db - закрытый ключ Боба
     """
-    p = gen_probable_prime(bits)
-    g = find_primitive_root(p)
+    # p - 1 известно в разложенном виде, поэтому корень находится сразу
+    p, factors = gen_prime_with_factorization(bits)
+    g = find_primitive_root(p, factors)
     
     Db = random.randrange(1, p - 1)
     Cb = mod_pow(g, Db, p)
@@ -159,27 +84,173 @@ def elgamal_decrypt(encrypted_data: bytes, p: int, Db: int) -> bytes:
     return bytes(result)
 
 
-def process_file(input_path: str, output_path: str, p: int, g: int, Cb: int, Db: int, encrypt: bool):
+def block_sizes(p: int) -> Tuple[int, int]:
+    """Возвращает (размер блока открытого текста, размер числа шифротекста) в байтах.
+
+    Числа a и b занимают по k = ceil(bits(p)/8) байт, открытый текст — k-1 байт,
+    поэтому число блока всегда меньше p.
+    """
+    k = (p.bit_length() + 7) // 8
+    if k < 2:
+        raise ValueError("Модуль p слишком мал для блочного режима (нужно p >= 256)")
+    return k - 1, k
+
+
+class EphemeralPool:
+    """Пары (g^k mod p, Cb^k mod p) для случайных k, заготавливаемые в фоне.
+
+    g и Cb не меняются, поэтому обе степени считаются по таблицам FixedBaseExp.
+    Пачки по EPHEMERAL_BATCH пар вычисляются в пуле потоков, пока основной
+    поток читает файл и записывает шифротекст.
+    """
+
+    def __init__(self, p: int, g: int, Cb: int, workers: int = 2):
+        self.p = p
+        exp_bits = (p - 1).bit_length()
+        self.g_exp = FixedBaseExp(g, p, exp_bits)
+        self.c_exp = FixedBaseExp(Cb, p, exp_bits)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self.pending = deque(self.executor.submit(self._batch) for _ in range(max(1, workers)))
+        self.ready = []
+
+    def _batch(self) -> list[Tuple[int, int]]:
+        pairs = []
+        for _ in range(EPHEMERAL_BATCH):
+            k = random.randrange(1, self.p - 1)
+            pairs.append((self.g_exp.pow(k), self.c_exp.pow(k)))
+        return pairs
+
+    def take(self, count: int) -> list[Tuple[int, int]]:
+        """Возвращает count пар, ожидая фоновые пачки и сразу заказывая следующие."""
+        while len(self.ready) < count:
+            self.ready += self.pending.popleft().result()
+            self.pending.append(self.executor.submit(self._batch))
+        pairs, self.ready = self.ready[:count], self.ready[count:]
+        return pairs
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def elgamal_encrypt_blocks(data: bytes, p: int, pairs: list[Tuple[int, int]]) -> bytes:
+    """Шифрует данные блоками по k-1 байт; каждый блок — пара (a, b) по k байт big-endian.
+
+    pairs — по одной паре (g^k, Cb^k) на блок (см. EphemeralPool).
+    """
+    plain_size, cipher_size = block_sizes(p)
+    result = bytearray()
+    for index, offset in enumerate(range(0, len(data), plain_size)):
+        m = int.from_bytes(data[offset:offset + plain_size], 'big')
+        a, s = pairs[index]
+        # (a, b) = (g^k mod p, M * Cb^k mod p)
+        result += a.to_bytes(cipher_size, 'big')
+        result += (m * s % p).to_bytes(cipher_size, 'big')
+    return bytes(result)
+
+
+def elgamal_decrypt_blocks(encrypted_data: bytes, p: int, Db: int, length: Optional[int] = None) -> bytes:
+    """Расшифровывает пары (a, b) по k байт; length — размер исходных данных (обрезает последний блок)."""
+    plain_size, cipher_size = block_sizes(p)
+    pair_size = 2 * cipher_size
+    if len(encrypted_data) % pair_size:
+        raise ValueError("Размер шифротекста не кратен размеру пары (a, b)")
+    blocks = len(encrypted_data) // pair_size
+    if length is None:
+        length = blocks * plain_size
+    result = bytearray()
+    for index in range(blocks):
+        offset = index * pair_size
+        a = int.from_bytes(encrypted_data[offset:offset + cipher_size], 'big')
+        b = int.from_bytes(encrypted_data[offset + cipher_size:offset + pair_size], 'big')
+        if a >= p or b >= p:
+            raise ValueError("Число шифротекста больше модуля p")
+        # M = b * a^(p-1-Db) mod p
+        m = b * mod_pow(a, p - 1 - Db, p) % p
+        size = min(plain_size, length - index * plain_size)
+        result += m.to_bytes(plain_size, 'big')[plain_size - size:]
+    return bytes(result)
+
+
+def encrypt_stream(f_in: BinaryIO, f_out: BinaryIO, p: int, g: int, Cb: int, length: int, workers: int = 2):
+    """Потоковое блочное шифрование: заголовок 'ELGB' + длина (8 байт), затем пары (a, b).
+
+    Данные читаются порциями по CHUNK_BLOCKS блоков, поэтому память не зависит от размера файла.
+    """
+    plain_size, _ = block_sizes(p)
+    f_out.write(BLOCK_MAGIC + length.to_bytes(8, 'big'))
+    with EphemeralPool(p, g, Cb, workers) as pool:
+        while chunk := f_in.read(plain_size * CHUNK_BLOCKS):
+            pairs = pool.take((len(chunk) + plain_size - 1) // plain_size)
+            f_out.write(elgamal_encrypt_blocks(chunk, p, pairs))
+
+
+def decrypt_stream(f_in: BinaryIO, f_out: BinaryIO, p: int, Db: int) -> int:
+    """Потоковое блочное расшифрование файла, записанного encrypt_stream. Возвращает длину данных."""
+    header = f_in.read(len(BLOCK_MAGIC) + 8)
+    if header[:len(BLOCK_MAGIC)] != BLOCK_MAGIC:
+        raise ValueError("Файл не является шифротекстом блочного режима Эль-Гамаля")
+    length = int.from_bytes(header[len(BLOCK_MAGIC):], 'big')
+    plain_size, cipher_size = block_sizes(p)
+    remaining = length
+    while chunk := f_in.read(2 * cipher_size * CHUNK_BLOCKS):
+        part = elgamal_decrypt_blocks(chunk, p, Db, min(remaining, len(chunk) // (2 * cipher_size) * plain_size))
+        f_out.write(part)
+        remaining -= len(part)
+    if remaining:
+        raise ValueError("Шифротекст обрезан")
+    return length
+
+
+def save_key(key: Tuple[int, ...], filepath: str):
+    """Сохраняет ключ в файл (по одному числу в строке)."""
+    with open(filepath, 'w') as f:
+        for value in key:
+            f.write(f"{value}\n")
+
+
+def load_key(filepath: str) -> Tuple[int, ...]:
+    """Загружает ключ из файла."""
+    with open(filepath, 'r') as f:
+        return tuple(int(line.strip()) for line in f if line.strip())
+
+
+def process_file(input_path: str, output_path: str, p: int, g: int, Cb: int, Db: int, encrypt: bool,
+                 block_mode: bool = True, workers: int = 2):
     """Обрабатывает файл с помощью шифра Эль-Гамаля."""
     action = "Шифрование" if encrypt else "Расшифрование"
     print(f"{action} файла: {input_path}")
     print(f"Параметры: p={p}, g={g}, Cb={Cb}, Db={Db}")
     
     try:
-        with open(input_path, 'rb') as f:
-            data = f.read()
-        
-        print(f"Размер файла: {len(data)} байт")
-        
-        if encrypt:
-            processed_data = elgamal_encrypt(data, p, g, Cb)
+        size = os.path.getsize(input_path)
+        print(f"Размер файла: {size} байт")
+        start = time.perf_counter()
+
+        if block_mode:
+            with open(input_path, 'rb') as f_in, open(output_path, 'wb') as f_out:
+                if encrypt:
+                    encrypt_stream(f_in, f_out, p, g, Cb, size, workers)
+                else:
+                    decrypt_stream(f_in, f_out, p, Db)
         else:
-            processed_data = elgamal_decrypt(data, p, Db)
-        
-        with open(output_path, 'wb') as f:
-            f.write(processed_data)
-        
+            with open(input_path, 'rb') as f:
+                data = f.read()
+            if encrypt:
+                processed_data = elgamal_encrypt(data, p, g, Cb)
+            else:
+                processed_data = elgamal_decrypt(data, p, Db)
+            with open(output_path, 'wb') as f:
+                f.write(processed_data)
+
+        elapsed = time.perf_counter() - start
         print(f"Результат сохранен в: {output_path}")
+        print(f"Время: {elapsed:.3f} с ({size / max(elapsed, 1e-9) / 1e6:.3f} МБ/с)")
         
     except FileNotFoundError:
         print(f"Ошибка: Файл не найден - {input_path}")
@@ -187,19 +258,52 @@ def process_file(input_path: str, output_path: str, p: int, g: int, Cb: int, Db:
         print(f"Ошибка при обработке файла: {e}")
 
 
+def benchmark(bits_list: list[int], size: int, workers: int = 2):
+    """Скорость блочного шифрования и расшифрования (МБ/с) для разных размеров p."""
+    data = os.urandom(size)
+    print(f"{'бит p':>6} | {'шифр., МБ/с':>12} | {'расшифр., МБ/с':>15}")
+    for bits in bits_list:
+        p, g, Cb, Db = generate_elgamal_keys(bits)
+        plain_size, _ = block_sizes(p)
+        start = time.perf_counter()
+        with EphemeralPool(p, g, Cb, workers) as pool:
+            encrypted = elgamal_encrypt_blocks(data, p, pool.take((size + plain_size - 1) // plain_size))
+        encrypt_time = time.perf_counter() - start
+        start = time.perf_counter()
+        decrypted = elgamal_decrypt_blocks(encrypted, p, Db, size)
+        decrypt_time = time.perf_counter() - start
+        if decrypted != data:
+            raise ValueError(f"Расшифрование не совпало с исходными данными (p из {bits} бит)")
+        print(f"{bits:>6} | {size / encrypt_time / 1e6:>12.3f} | {size / decrypt_time / 1e6:>15.3f}")
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Шифр Эль-Гамаля для шифрования файлов")
-    parser.add_argument("input_file", help="Входной файл")
-    parser.add_argument("output_file", help="Выходной файл")
-    parser.add_argument("--action", choices=['encrypt', 'decrypt'], required=True,
-                        help="Действие: encrypt или decrypt")
-    parser.add_argument("--mode", choices=['input', 'generate'], default='generate',
-                        help="Режим: input - ввод параметров, generate - генерация")
+    parser.add_argument("input_file", nargs='?', help="Входной файл")
+    parser.add_argument("output_file", nargs='?', help="Выходной файл")
+    parser.add_argument("--action", choices=['encrypt', 'decrypt', 'bench'], required=True,
+                        help="Действие: encrypt, decrypt или bench (скорость для разных размеров p)")
+    parser.add_argument("--mode", choices=['input', 'generate', 'file'], default='generate',
+                        help="Режим: input - ввод параметров, generate - генерация, file - ключи из файлов")
     parser.add_argument("--bits", type=int, default=32, help="Размер простого числа в битах")
+    parser.add_argument("--format", choices=['block', 'byte'], default='block',
+                        help="Формат: block - блоки по k-1 байт, пары (a, b) полной длины; byte - побайтовый (устаревший)")
+    parser.add_argument("--pub", default="public.key", help="Файл открытого ключа (p, g, Cb) (режимы generate/file)")
+    parser.add_argument("--priv", default="private.key", help="Файл закрытого ключа (p, g, Db) (режимы generate/file)")
+    parser.add_argument("--workers", type=int, default=2, help="Число потоков для заготовки пар (g^k, Cb^k)")
+    parser.add_argument("--bench-bits", type=int, nargs='+', default=[256, 512, 1024, 2048],
+                        help="Размеры p в битах для --action bench")
+    parser.add_argument("--bench-size", type=int, default=1 << 16, help="Объём данных для --action bench, байт")
     
     args = parser.parse_args()
     
     print("=== Лабораторная работа №5: Шифр Эль-Гамаля ===")
+
+    if args.action == 'bench':
+        benchmark(args.bench_bits, args.bench_size, args.workers)
+        sys.exit(0)
+    if args.input_file is None or args.output_file is None:
+        parser.error("для encrypt/decrypt нужны input_file и output_file")
     
     if args.mode == 'input':
         try:
@@ -220,15 +324,26 @@ if __name__ == '__main__':
         except ValueError as e:
             print(f"Ошибка ввода: {e}")
             sys.exit(1)
+    elif args.mode == 'file':
+        try:
+            p, g, Cb = load_key(args.pub)
+            _, _, Db = load_key(args.priv)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка загрузки ключей: {e}")
+            sys.exit(1)
     else:
         print("Генерация параметров...")
         p, g, Cb, Db = generate_elgamal_keys(args.bits)
+        save_key((p, g, Cb), args.pub)
+        save_key((p, g, Db), args.priv)
         print(f"Сгенерированы параметры:")
         print(f"p = {p}")
         print(f"g = {g}")
         print(f"Cb = {Cb}")
         print(f"Db = {Db}")
+        print(f"Ключи сохранены в: {args.pub}, {args.priv}")
     
     encrypt = args.action == 'encrypt'
-    process_file(args.input_file, args.output_file, p, g, Cb, Db, encrypt)
+    process_file(args.input_file, args.output_file, p, g, Cb, Db, encrypt,
+                 block_mode=args.format == 'block', workers=args.workers)
     print("Готово.")
@@ -1,77 +1,23 @@
-import random
+import os
 import sys
 import argparse
-from typing import Tuple
-
-
-def mod_pow(base: int, exp: int, mod: int) -> int:
-    """Возведение в степень по модулю (base^exp) % mod."""
-    res = 1
-    base %= mod
-    while exp > 0:
-        if exp % 2 == 1:
-            res = (res * base) % mod
-        base = (base * base) % mod
-        exp //= 2
-    return res
-
-
-def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
-    """Расширенный алгоритм Евклида. Возвращает (НОД, x, y)."""
-    if a == 0:
-        return b, 0, 1
-    d, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return d, x, y
-
-
-def mod_inverse(a: int, m: int) -> int:
-    """Вычисление модульного обратного элемента a⁻¹ mod m."""
-    d, x, y = extended_gcd(a, m)
-    if d != 1:
-        raise ValueError(f"Обратный элемент не существует для a={a}, m={m}")
-    return x % m
-
-
-def is_probable_prime(n: int, k: int = 10) -> bool:
-    """Тест простоты Миллера-Рабина."""
-    if n < 2: return False
-    if n == 2 or n == 3: return True
-    if n % 2 == 0: return False
-    
-    d, s = n - 1, 0
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-    
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = mod_pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(s - 1):
-            x = mod_pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
+import time
+from typing import BinaryIO, Tuple
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from numtheory import mod_pow, extended_gcd, mod_inverse, gen_probable_prime
 
-def gen_probable_prime(bits: int = 32) -> int:
-    """Генерация вероятно-простого числа с заданным количеством битов."""
-    while True:
-        candidate = random.getrandbits(bits)
-        candidate |= (1 << (bits - 1)) | 1
-        if is_probable_prime(candidate):
-            return candidate
 
+BLOCK_MAGIC = b'RSAB'
+CHUNK_BLOCKS = 4096
 
-def generate_rsa_keys(bits: int = 32) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+
+def generate_rsa_keys(bits: int = 32) -> Tuple[Tuple[int, int], Tuple[int, ...]]:
     """
     Генерирует пару RSA ключей.
-    Возвращает ((n, e), (n, d)), где (n, e) - открытый ключ, (n, d) - закрытый ключ.
+    Возвращает ((n, e), (n, d, p, q, dP, dQ, qInv)), где (n, e) - открытый ключ,
+    а закрытый ключ дополнительно содержит параметры КТО:
+    dP = d mod (p-1), dQ = d mod (q-1), qInv = q⁻¹ mod p.
     """
     p = gen_probable_prime(bits)
     q = gen_probable_prime(bits)
@@ -91,7 +37,7 @@ def generate_rsa_keys(bits: int = 32) -> Tuple[Tuple[int, int], Tuple[int, int]]
     
     d = mod_inverse(e, phi_n)
     public_key = (n, e)
-    private_key = (n, d)
+    private_key = (n, d, p, q, d % (p - 1), d % (q - 1), mod_inverse(q, p))
     
     return public_key, private_key
 
@@ -112,9 +58,9 @@ def rsa_encrypt(data: bytes, public_key: Tuple[int, int]) -> bytes:
     return bytes(result)
 
 
-def rsa_decrypt(encrypted_data: bytes, private_key: Tuple[int, int]) -> bytes:
+def rsa_decrypt(encrypted_data: bytes, private_key: Tuple[int, ...]) -> bytes:
     """Расшифровывает данные по схеме RSA."""
-    n, d = private_key
+    n, d = private_key[:2]
     result = bytearray()
     
     # Обрабатываем данные парами
@@ -133,29 +79,142 @@ def rsa_decrypt(encrypted_data: bytes, private_key: Tuple[int, int]) -> bytes:
     return bytes(result)
 
 
-def process_file(input_path: str, output_path: str, public_key: Tuple[int, int], 
-                private_key: Tuple[int, int], encrypt: bool):
+def rsa_decrypt_int(c: int, private_key: Tuple[int, ...]) -> int:
+    """Расшифровывает одно число: M = C^d mod n.
+
+    Если закрытый ключ содержит p, q, dP, dQ, qInv, используется китайская
+    теорема об остатках (две экспоненты по модулям p и q вдвое меньшей длины).
+    """
+    if len(private_key) < 7:
+        n, d = private_key[:2]
+        return mod_pow(c, d, n)
+    _, _, p, q, dP, dQ, qInv = private_key
+    m1 = mod_pow(c, dP, p)
+    m2 = mod_pow(c, dQ, q)
+    h = (qInv * (m1 - m2)) % p
+    return m2 + h * q
+
+
+def block_sizes(n: int) -> Tuple[int, int]:
+    """Возвращает (размер блока открытого текста, размер блока шифротекста) в байтах.
+
+    Блок шифротекста занимает k = ceil(bits(n)/8) байт, открытый текст — k-1 байт,
+    поэтому число блока всегда меньше n.
+    """
+    k = (n.bit_length() + 7) // 8
+    if k < 2:
+        raise ValueError("Модуль n слишком мал для блочного режима (нужно n >= 256)")
+    return k - 1, k
+
+
+def rsa_encrypt_blocks(data: bytes, public_key: Tuple[int, int]) -> bytes:
+    """Шифрует данные блоками по k-1 байт; каждый блок шифротекста — k байт big-endian.
+
+    Последний блок может быть короче: длину исходных данных хранит заголовок файла.
+    """
+    n, e = public_key
+    plain_size, cipher_size = block_sizes(n)
+    result = bytearray()
+    for offset in range(0, len(data), plain_size):
+        m = int.from_bytes(data[offset:offset + plain_size], 'big')
+        result += mod_pow(m, e, n).to_bytes(cipher_size, 'big')
+    return bytes(result)
+
+
+def rsa_decrypt_blocks(encrypted_data: bytes, private_key: Tuple[int, ...], length: int = None) -> bytes:
+    """Расшифровывает блоки по k байт; length — размер исходных данных (обрезает последний блок)."""
+    n = private_key[0]
+    plain_size, cipher_size = block_sizes(n)
+    if len(encrypted_data) % cipher_size:
+        raise ValueError("Размер шифротекста не кратен размеру блока")
+    blocks = len(encrypted_data) // cipher_size
+    if length is None:
+        length = blocks * plain_size
+    result = bytearray()
+    for index in range(blocks):
+        c = int.from_bytes(encrypted_data[index * cipher_size:(index + 1) * cipher_size], 'big')
+        if c >= n:
+            raise ValueError("Блок шифротекста больше модуля n")
+        size = min(plain_size, length - index * plain_size)
+        result += rsa_decrypt_int(c, private_key).to_bytes(plain_size, 'big')[plain_size - size:]
+    return bytes(result)
+
+
+def encrypt_stream(f_in: BinaryIO, f_out: BinaryIO, public_key: Tuple[int, int], length: int):
+    """Потоковое блочное шифрование: заголовок 'RSAB' + длина (8 байт), затем блоки по k байт.
+
+    Данные читаются порциями по CHUNK_BLOCKS блоков, поэтому память не зависит от размера файла.
+    """
+    plain_size, _ = block_sizes(public_key[0])
+    f_out.write(BLOCK_MAGIC + length.to_bytes(8, 'big'))
+    while chunk := f_in.read(plain_size * CHUNK_BLOCKS):
+        f_out.write(rsa_encrypt_blocks(chunk, public_key))
+
+
+def decrypt_stream(f_in: BinaryIO, f_out: BinaryIO, private_key: Tuple[int, ...]) -> int:
+    """Потоковое блочное расшифрование файла, записанного encrypt_stream. Возвращает длину данных."""
+    header = f_in.read(len(BLOCK_MAGIC) + 8)
+    if header[:len(BLOCK_MAGIC)] != BLOCK_MAGIC:
+        raise ValueError("Файл не является шифротекстом блочного режима RSA")
+    length = int.from_bytes(header[len(BLOCK_MAGIC):], 'big')
+    plain_size, cipher_size = block_sizes(private_key[0])
+    remaining = length
+    while chunk := f_in.read(cipher_size * CHUNK_BLOCKS):
+        part = rsa_decrypt_blocks(chunk, private_key, min(remaining, len(chunk) // cipher_size * plain_size))
+        f_out.write(part)
+        remaining -= len(part)
+    if remaining:
+        raise ValueError("Шифротекст обрезан")
+    return length
+
+
+def save_key(key: Tuple[int, ...], filepath: str):
+    """Сохраняет ключ в файл (по одному числу в строке)."""
+    with open(filepath, 'w') as f:
+        for value in key:
+            f.write(f"{value}\n")
+
+
+def load_key(filepath: str) -> Tuple[int, ...]:
+    """Загружает ключ из файла."""
+    with open(filepath, 'r') as f:
+        return tuple(int(line.strip()) for line in f if line.strip())
+
+
+def process_file(input_path: str, output_path: str, public_key: Tuple[int, int],
+                private_key: Tuple[int, ...], encrypt: bool, block_mode: bool = True):
     """Обрабатывает файл с помощью шифра RSA."""
     action = "Шифрование" if encrypt else "Расшифрование"
     print(f"{action} файла: {input_path}")
     print(f"Открытый ключ (n, e): {public_key}")
-    print(f"Закрытый ключ (n, d): {private_key}")
+    print(f"Закрытый ключ (n, d): {private_key[:2]}")
+    if not encrypt and block_mode and len(private_key) >= 7:
+        print("Расшифрование по КТО (dP, dQ, qInv)")
     
     try:
-        with open(input_path, 'rb') as f:
-            data = f.read()
-        
-        print(f"Размер файла: {len(data)} байт")
-        
-        if encrypt:
-            processed_data = rsa_encrypt(data, public_key)
+        size = os.path.getsize(input_path)
+        print(f"Размер файла: {size} байт")
+        start = time.perf_counter()
+
+        if block_mode:
+            with open(input_path, 'rb') as f_in, open(output_path, 'wb') as f_out:
+                if encrypt:
+                    encrypt_stream(f_in, f_out, public_key, size)
+                else:
+                    decrypt_stream(f_in, f_out, private_key)
         else:
-            processed_data = rsa_decrypt(data, private_key)
-        
-        with open(output_path, 'wb') as f:
-            f.write(processed_data)
-        
+            with open(input_path, 'rb') as f:
+                data = f.read()
+            if encrypt:
+                processed_data = rsa_encrypt(data, public_key)
+            else:
+                processed_data = rsa_decrypt(data, private_key)
+            with open(output_path, 'wb') as f:
+                f.write(processed_data)
+
+        elapsed = time.perf_counter() - start
         print(f"Результат сохранен в: {output_path}")
+        print(f"Время: {elapsed:.3f} с ({size / max(elapsed, 1e-9) / 1e6:.3f} МБ/с)")
         
     except FileNotFoundError:
         print(f"Ошибка: Файл не найден - {input_path}")
@@ -169,14 +228,26 @@ if __name__ == '__main__':
     parser.add_argument("output_file", help="Выходной файл")
     parser.add_argument("--action", choices=['encrypt', 'decrypt'], required=True,
                         help="Действие: encrypt или decrypt")
-    parser.add_argument("--mode", choices=['input', 'generate'], default='generate',
-                        help="Режим: input - ввод параметров, generate - генерация")
+    parser.add_argument("--mode", choices=['input', 'generate', 'file'], default=None,
+                        help="Режим: input - ввод параметров, generate - генерация, file - ключи из файлов "
+                             "(по умолчанию file, если файлы ключей уже есть, иначе generate)")
     parser.add_argument("--bits", type=int, default=32, help="Размер простых чисел в битах")
+    parser.add_argument("--format", choices=['block', 'byte'], default='block',
+                        help="Формат: block - блоки по k-1 байт с КТО, byte - побайтовый (устаревший)")
+    parser.add_argument("--pub", default="public.key", help="Файл открытого ключа (режимы generate/file)")
+    parser.add_argument("--priv", default="private.key", help="Файл закрытого ключа (режимы generate/file)")
+    parser.add_argument("--force", action="store_true",
+                        help="Перезаписать существующие файлы ключей в режиме generate")
     
     args = parser.parse_args()
     
     print("=== Лабораторная работа №6: Шифр RSA ===")
     
+    if args.mode is None:
+        # Без явного --mode существующие ключи не перезаписываются
+        keys_exist = os.path.exists(args.pub) and os.path.exists(args.priv)
+        args.mode = 'file' if keys_exist else 'generate'
+    
     if args.mode == 'input':
         try:
             n = int(input("Введите модуль n: "))
@@ -198,13 +269,29 @@ if __name__ == '__main__':
         except ValueError as e:
             print(f"Ошибка ввода: {e}")
             sys.exit(1)
+    elif args.mode == 'file':
+        try:
+            public_key = load_key(args.pub)
+            private_key = load_key(args.priv)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка загрузки ключей: {e}")
+            sys.exit(1)
     else:
+        existing = [path for path in (args.pub, args.priv) if os.path.exists(path)]
+        if existing and not args.force:
+            print(f"Файлы ключей уже существуют: {', '.join(existing)}. "
+                  f"Используйте --mode file или --force для перезаписи")
+            sys.exit(1)
         print("Генерация ключей...")
         public_key, private_key = generate_rsa_keys(args.bits)
+        save_key(public_key, args.pub)
+        save_key(private_key, args.priv)
         print(f"Сгенерированы ключи:")
         print(f"Открытый ключ (n, e): {public_key}")
-        print(f"Закрытый ключ (n, d): {private_key}")
+        print(f"Закрытый ключ (n, d): {private_key[:2]}")
+        print(f"Ключи сохранены в: {args.pub}, {args.priv}")
     
     encrypt = args.action == 'encrypt'
-    process_file(args.input_file, args.output_file, public_key, private_key, encrypt)
+    process_file(args.input_file, args.output_file, public_key, private_key, encrypt,
+                 block_mode=args.format == 'block')
     print("Готово.")
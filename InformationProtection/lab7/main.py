@@ -1,46 +1,21 @@
+import argparse
+import hashlib
+import mmap
 import random
+import os
 import sys
 import math
+import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import Tuple
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from numtheory import mod_pow, gen_safe_prime
+
+
+# Размер блока гаммы: блоки вычисляются независимо (режим счётчика)
+KEYSTREAM_BLOCK = 1 << 20
 
-def mod_pow(base: int, exp: int, mod: int) -> int:
-    """Возведение в степень по модулю (base^exp) % mod."""
-    res = 1
-    base %= mod
-    while exp > 0:
-        if exp % 2 == 1:
-            res = (res * base) % mod
-        base = (base * base) % mod
-        exp //= 2
-    return res
-
-def is_probable_prime_fermat(n: int, k: int = 8) -> bool:
-    """Тест простоты Ферма."""
-    if n <= 1: return False
-    if n <= 3: return True
-    if n % 2 == 0: return False
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        if mod_pow(a, n - 1, n) != 1:
-            return False
-    return True
-
-def gen_probable_prime(bits: int = 64, k: int = 8) -> int:
-    """Генерация вероятно-простого числа."""
-    while True:
-        candidate = random.getrandbits(bits) | 1
-        candidate |= (1 << (bits - 1))
-        if is_probable_prime_fermat(candidate, k=k):
-            return candidate
-
-def gen_safe_prime(bits: int = 64, k: int = 8) -> Tuple[int, int]:
-    """Генерация безопасного простого p = 2*q + 1."""
-    while True:
-        q = gen_probable_prime(bits - 1, k)
-        p = 2 * q + 1
-        if is_probable_prime_fermat(p, k=k):
-            return p, q
 
 def find_primitive_root(p: int, q: int) -> int:
     """Поиск первообразного корня для безопасного простого p."""
@@ -81,24 +56,97 @@ def get_dh_shared_key(bits: int = 64) -> int:
     
     return shared_key
 
-def process_vernam_file(input_path: str, output_path: str, key: int):
+def key_to_bytes(key: int) -> bytes:
+    """Представляет числовой ключ Диффи-Хеллмана в виде байтов (big-endian)."""
+    return key.to_bytes(key.bit_length() // 8 + 1, 'big', signed=True)
+
+
+def keystream_block(key_bytes: bytes, index: int, size: int = KEYSTREAM_BLOCK) -> bytes:
+    """Блок гаммы номер index: SHAKE-256(ключ || счётчик), size байт.
+
+    Каждый блок зависит только от ключа и своего номера, поэтому блоки
+    можно вычислять в любом порядке и в разных процессах.
+    """
+    return hashlib.shake_256(key_bytes + index.to_bytes(8, 'big')).digest(size)
+
+
+def xor_bytes(data: bytes, keystream: bytes) -> bytes:
+    """Побитовое XOR двух буферов одной длины целиком, через длинные целые."""
+    size = len(data)
+    return (int.from_bytes(data, 'little') ^ int.from_bytes(keystream[:size], 'little')).to_bytes(size, 'little')
+
+
+def _process_range(input_path: str, output_path: str, key_bytes: bytes, start: int, end: int):
+    """Обрабатывает байты [start, end) входного файла и пишет их по тем же смещениям в выходной."""
+    with open(input_path, 'rb') as f_in, open(output_path, 'r+b') as f_out:
+        f_in.seek(start)
+        f_out.seek(start)
+        for offset in range(start, end, KEYSTREAM_BLOCK):
+            chunk = f_in.read(min(KEYSTREAM_BLOCK, end - offset))
+            f_out.write(xor_bytes(chunk, keystream_block(key_bytes, offset // KEYSTREAM_BLOCK, len(chunk))))
+
+
+def _process_range_mmap(path: str, key_bytes: bytes, start: int, end: int):
+    """Обрабатывает байты [start, end) файла на месте через отображение в память.
+
+    start кратно KEYSTREAM_BLOCK, а значит, и гранулярности mmap.
+    """
+    with open(path, 'r+b') as f, mmap.mmap(f.fileno(), end - start, offset=start) as mm:
+        for offset in range(0, end - start, KEYSTREAM_BLOCK):
+            size = min(KEYSTREAM_BLOCK, end - start - offset)
+            index = (start + offset) // KEYSTREAM_BLOCK
+            mm[offset:offset + size] = xor_bytes(mm[offset:offset + size], keystream_block(key_bytes, index, size))
+
+
+def split_ranges(size: int, parts: int) -> list[Tuple[int, int]]:
+    """Делит [0, size) на не более чем parts отрезков, выровненных по KEYSTREAM_BLOCK."""
+    blocks = (size + KEYSTREAM_BLOCK - 1) // KEYSTREAM_BLOCK
+    per_part = max(1, -(-blocks // max(1, parts)))
+    ranges = []
+    for first in range(0, blocks, per_part):
+        start = first * KEYSTREAM_BLOCK
+        ranges.append((start, min(size, (first + per_part) * KEYSTREAM_BLOCK)))
+    return ranges
+
+
+def process_vernam_file(input_path: str, output_path: str, key: int, workers: int = 1, in_place: bool = False):
     """
-    Шифрует или расшифровывает файл, используя ключ как seed для PRNG.
+    Шифрует или расшифровывает файл гаммой, полученной из ключа в режиме счётчика.
     Операция полностью симметрична.
+
+    workers > 1 распределяет отрезки файла по процессам; in_place=True
+    обрабатывает input_path на месте через mmap (output_path не используется).
     """
     print(f"-> Обработка файла: '{input_path}'")
-    print(f"   Ключ (seed): {key}")
-    
-    random.seed(key)
+    print(f"   Ключ: {key}")
+
+    key_bytes = key_to_bytes(key)
+    target = input_path if in_place else output_path
 
     try:
-        with open(input_path, 'rb') as f_in, open(output_path, 'wb') as f_out:
-            while chunk := f_in.read(1024):
-                keystream = bytearray(random.getrandbits(8) for _ in range(len(chunk)))                
-                processed_chunk = bytearray(a ^ b for a, b in zip(chunk, keystream))
-                f_out.write(processed_chunk)
-        
-        print(f"-> Успех! Результат сохранен в файл: '{output_path}'")
+        size = os.path.getsize(input_path)
+        start_time = time.perf_counter()
+        if not in_place:
+            with open(output_path, 'wb') as f_out:
+                f_out.truncate(size)
+
+        ranges = split_ranges(size, workers)
+        if in_place:
+            task, tasks = _process_range_mmap, [(input_path, key_bytes, a, b) for a, b in ranges]
+        else:
+            task, tasks = _process_range, [(input_path, output_path, key_bytes, a, b) for a, b in ranges]
+
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for future in [executor.submit(task, *args) for args in tasks]:
+                    future.result()
+        else:
+            for args in tasks:
+                task(*args)
+
+        elapsed = time.perf_counter() - start_time
+        print(f"-> Успех! Результат сохранен в файл: '{target}'")
+        print(f"   {size} байт за {elapsed:.3f} с ({size / max(elapsed, 1e-9) / 1e6:.1f} МБ/с)")
 
     except FileNotFoundError:
         print(f"-> Ошибка: Файл не найден по пути '{input_path}'")
@@ -107,6 +155,11 @@ def process_vernam_file(input_path: str, output_path: str, key: int):
         
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Шифр Вернама с ключом Диффи-Хеллмана")
+    parser.add_argument("--workers", type=int, default=1, help="Число процессов для обработки больших файлов")
+    parser.add_argument("--in-place", action="store_true", help="Обработать файл на месте (mmap) без создания копии")
+    args = parser.parse_args()
+
     print("=== Лабораторная работа №7: Шифр Вернама с ключом Диффи-Хеллмана ===")
     
     try:
@@ -120,21 +173,23 @@ if __name__ == '__main__':
         if key_source == 'd':
             encryption_key = get_dh_shared_key(bits=64)
         elif key_source == 'm':
-            encryption_key = int(input("Введите числовой ключ (seed): ").strip())
+            encryption_key = int(input("Введите числовой ключ: ").strip())
         else:
             raise ValueError("Неверный источник ключа. Выберите 'D' или 'M'.")
             
         input_file = input("Введите путь к исходному файлу: ").strip()
-        if action == 'e':
+        if args.in_place:
+            process_vernam_file(input_file, input_file, encryption_key, args.workers, in_place=True)
+        elif action == 'e':
             output_file = input_file + ".vernam"
-            process_vernam_file(input_file, output_file, encryption_key)
+            process_vernam_file(input_file, output_file, encryption_key, args.workers)
         else: 
             
             if input_file.endswith(".vernam"):
                 output_file = input_file[:-7] 
             else:
                 output_file = input_file + ".decrypted"
-            process_vernam_file(input_file, output_file, encryption_key)
+            process_vernam_file(input_file, output_file, encryption_key, args.workers)
 
     except (ValueError, KeyboardInterrupt) as e:
         print(f"\nОшибка: {e}. Программа завершена.")
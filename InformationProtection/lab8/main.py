@@ -1,68 +1,13 @@
 import hashlib
-import random
+import os
 import sys
 import argparse
 from typing import Tuple
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from numtheory import mod_pow, extended_gcd, mod_inverse, gen_probable_prime
+from numtheory.bench import measure
 
-def mod_pow(base: int, exp: int, mod: int) -> int:
-    """Возведение в степень по модулю (base^exp) % mod."""
-    res = 1
-    base %= mod
-    while exp > 0:
-        if exp % 2 == 1:
-            res = (res * base) % mod
-        base = (base * base) % mod
-        exp //= 2
-    return res
-
-def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
-    """Расширенный алгоритм Евклида. Возвращает (НОД, x, y)."""
-    if a == 0:
-        return b, 0, 1
-    d, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return d, x, y
-
-def mod_inverse(a: int, m: int) -> int:
-    """Вычисление модульного обратного элемента a⁻¹ mod m."""
-    d, x, y = extended_gcd(a, m)
-    if d != 1:
-        raise ValueError(f"Обратный элемент не существует для a={a}, m={m}")
-    return x % m
-
-def is_probable_prime(n: int, k: int = 10) -> bool:
-    """Тест простоты Миллера-Рабина (надежнее, чем тест Ферма)."""
-    if n < 2: return False
-    if n == 2 or n == 3: return True
-    if n % 2 == 0: return False
-    
-    d, s = n - 1, 0
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-    
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = mod_pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(s - 1):
-            x = mod_pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
-
-def gen_probable_prime(bits: int = 32) -> int:
-    """Генерация вероятно-простого числа с заданным количеством битов."""
-    while True:
-        candidate = random.getrandbits(bits)
-        candidate |= (1 << (bits - 1)) | 1
-        if is_probable_prime(candidate):
-            return candidate
 
 def generate_rsa_keys(bits: int = 32) -> Tuple[Tuple[int, int], Tuple[int, int]]:
     """
@@ -105,12 +50,26 @@ def sign_hash(hash_digest: bytes, private_key: Tuple[int, int]) -> list[int]:
     signature = [mod_pow(byte, d, n) for byte in hash_digest]
     return signature
 
+def sign_digest(hash_digest: bytes, private_key: Tuple[int, int]) -> list[int]:
+    """
+    Подписывает хеш целиком: h = int(hash) mod n, s = h^d mod n.
+    Возвращает подпись из одного числа (тот же формат файла, одна строка).
+    """
+    n, d = private_key
+    h = int.from_bytes(hash_digest, 'big') % n
+    return [mod_pow(h, d, n)]
+
 def verify_signature(hash_digest: bytes, signature: list[int], public_key: Tuple[int, int]) -> bool:
     """
     Проверяет подпись, "расшифровывая" каждый ее компонент открытым ключом.
     Сравнивает результат с исходным хешем.
+
+    Подпись из одного числа проверяется как подпись всего хеша (sign_digest),
+    подпись из len(hash_digest) чисел — как побайтовая (sign_hash).
     """
     n, e = public_key
+    if len(signature) == 1 and len(hash_digest) != 1:
+        return mod_pow(signature[0], e, n) == int.from_bytes(hash_digest, 'big') % n
     decrypted_hash_bytes = [mod_pow(sig_part, e, n) for sig_part in signature]
     original_hash_bytes = list(hash_digest)
     return decrypted_hash_bytes == original_hash_bytes
@@ -154,12 +113,18 @@ if __name__ == '__main__':
     sign_parser.add_argument("file", help="Файл, который нужно подписать.")
     sign_parser.add_argument("--key", required=True, help="Файл с закрытым ключом.")
     sign_parser.add_argument("--out", default=None, help="Файл для сохранения подписи (по умолчанию file.sig).")
+    sign_parser.add_argument("--format", choices=["digest", "bytes"], default="digest",
+                             help="digest - подпись всего хеша, bytes - побайтовая подпись (32 числа).")
     
     verify_parser = subparsers.add_parser("verify", help="Проверить подпись файла.")
     verify_parser.add_argument("file", help="Файл, подпись которого нужно проверить.")
     verify_parser.add_argument("--key", required=True, help="Файл с открытым ключом.")
     verify_parser.add_argument("--sig", required=True, help="Файл с подписью.")
 
+    bench_parser = subparsers.add_parser("bench", help="Замерить скорость подписи и проверки.")
+    bench_parser.add_argument("--bits", type=int, default=1024, help="Размер простых чисел в битах (n вдвое длиннее).")
+    bench_parser.add_argument("--seconds", type=float, default=1.0, help="Время замера каждой операции, с.")
+
     args = parser.parse_args()
 
     try:
@@ -176,7 +141,10 @@ if __name__ == '__main__':
             private_key = load_key(args.key)
             file_hash = calculate_file_hash(args.file)
             print(f"Хеш файла (SHA-256): {file_hash.hex()}")
-            signature = sign_hash(file_hash, private_key)
+            if args.format == "digest":
+                signature = sign_digest(file_hash, private_key)
+            else:
+                signature = sign_hash(file_hash, private_key)
             
             output_file = args.out if args.out else args.file + ".sig"
             save_signature(signature, output_file)
@@ -193,6 +161,17 @@ if __name__ == '__main__':
             else:
                 print("\nРЕЗУЛЬТАТ: ПРОВЕРКА НЕ ПРОЙДЕНА. Подпись неверна или файл был изменен.")
 
+        elif args.command == "bench":
+            print(f"Генерация {args.bits*2}-битных RSA ключей...")
+            public_key, private_key = generate_rsa_keys(args.bits)
+            file_hash = hashlib.sha256(b"benchmark").digest()
+            print(f"{'формат':<8} | {'подписей/с':>11} | {'проверок/с':>11}")
+            for name, sign in (("bytes", sign_hash), ("digest", sign_digest)):
+                signature = sign(file_hash, private_key)
+                sign_rate = measure(sign, [(file_hash, private_key)], args.seconds)
+                verify_rate = measure(verify_signature, [(file_hash, signature, public_key)], args.seconds)
+                print(f"{name:<8} | {sign_rate:>11.1f} | {verify_rate:>11.1f}")
+
     except FileNotFoundError as e:
         print(f"\nОшибка: Файл не найден - {e.filename}", file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,61 @@
+"""
+Общее теоретико-числовое ядро лабораторных работ по защите информации.
+
+Лабораторные подключают пакет так:
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from numtheory import mod_pow, extended_gcd, mod_inverse, is_probable_prime
+"""
+
+from .backend import available_backends, get_backend, set_backend
+from .core import (
+    SMALL_PRIMES,
+    extended_gcd,
+    gcd,
+    is_probable_prime,
+    is_probable_prime_fermat,
+    jacobi,
+    mod_inverse,
+    mod_pow,
+    mod_pow_window,
+)
+from .dlog import bsgs, check_dlog_input, discrete_log, pohlig_hellman, pollard_rho_log, solve_discrete_log
+from .factor import FactorCache, factorize, pollard_brent
+from .fixedbase import FixedBaseExp
+from .multiexp import batch_exponents, multi_exp
+from .primes import PrimePool, gen_probable_prime, gen_safe_prime, generate_primes
+from .roots import gen_prime_with_factorization, is_primitive_root, primitive_root
+
+__all__ = [
+    'FactorCache',
+    'FixedBaseExp',
+    'PrimePool',
+    'SMALL_PRIMES',
+    'available_backends',
+    'batch_exponents',
+    'bsgs',
+    'check_dlog_input',
+    'discrete_log',
+    'extended_gcd',
+    'factorize',
+    'gcd',
+    'gen_prime_with_factorization',
+    'gen_probable_prime',
+    'gen_safe_prime',
+    'generate_primes',
+    'get_backend',
+    'is_primitive_root',
+    'is_probable_prime',
+    'is_probable_prime_fermat',
+    'jacobi',
+    'mod_inverse',
+    'mod_pow',
+    'mod_pow_window',
+    'multi_exp',
+    'pohlig_hellman',
+    'pollard_brent',
+    'pollard_rho_log',
+    'primitive_root',
+    'set_backend',
+    'solve_discrete_log',
+]
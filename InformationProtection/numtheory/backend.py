@@ -0,0 +1,49 @@
+"""
+Выбор вычислительного бэкенда для модульной арифметики.
+
+Поддерживаются три бэкенда:
+ - 'gmpy2'   — библиотека GMP (если установлена, самый быстрый вариант);
+ - 'builtin' — встроенный pow(a, e, m) и pow(a, -1, m) (реализованы на C);
+ - 'python'  — чистый Python (скользящее окно), эталонная реализация.
+
+Бэкенд выбирается при импорте по переменной окружения NUMTHEORY_BACKEND
+(auto/gmpy2/builtin/python) и может быть изменён через set_backend().
+"""
+
+import os
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+
+BACKENDS = ('gmpy2', 'builtin', 'python')
+
+_current = None
+
+
+def available_backends() -> list[str]:
+    """Возвращает список бэкендов, доступных в текущем окружении."""
+    return [name for name in BACKENDS if name != 'gmpy2' or gmpy2 is not None]
+
+
+def set_backend(name: str = 'auto') -> str:
+    """Устанавливает бэкенд; 'auto' выбирает gmpy2, если он установлен, иначе builtin."""
+    global _current
+    if name == 'auto':
+        name = 'gmpy2' if gmpy2 is not None else 'builtin'
+    if name not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд: {name}")
+    if name == 'gmpy2' and gmpy2 is None:
+        raise ValueError("Бэкенд gmpy2 недоступен: библиотека не установлена")
+    _current = name
+    return name
+
+
+def get_backend() -> str:
+    """Возвращает имя текущего бэкенда."""
+    return _current
+
+
+set_backend(os.environ.get('NUMTHEORY_BACKEND', 'auto'))
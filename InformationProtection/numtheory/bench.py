@@ -0,0 +1,126 @@
+"""
+Микробенчмарк пакета numtheory.
+
+Сравнивает общие функции с прежними копиями из лабораторных (square-and-multiply,
+рекурсивный алгоритм Евклида, тест Миллера-Рабина на mod_pow) на числах от 64 до 4096 бит.
+
+Запуск (из каталога InformationProtection):
+    python -m numtheory.bench --bits 64 256 1024 4096
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Callable, Tuple
+
+from . import backend, core
+
+
+def legacy_mod_pow(base: int, exp: int, mod: int) -> int:
+    """Прежняя реализация из лабораторных (square-and-multiply)."""
+    res = 1
+    base %= mod
+    while exp > 0:
+        if exp % 2 == 1:
+            res = (res * base) % mod
+        base = (base * base) % mod
+        exp //= 2
+    return res
+
+
+def legacy_extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
+    """Прежняя рекурсивная реализация из лабораторных."""
+    if a == 0:
+        return b, 0, 1
+    d, x1, y1 = legacy_extended_gcd(b % a, a)
+    return d, y1 - (b // a) * x1, x1
+
+
+def legacy_mod_inverse(a: int, m: int) -> int:
+    d, x, _ = legacy_extended_gcd(a, m)
+    if d != 1:
+        raise ValueError(f"Обратный элемент не существует для a={a}, m={m}")
+    return x % m
+
+
+def legacy_is_probable_prime(n: int, k: int = 10) -> bool:
+    """Прежний тест Миллера-Рабина из лабораторных."""
+    if n < 2: return False
+    if n == 2 or n == 3: return True
+    if n % 2 == 0: return False
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for _ in range(k):
+        a = random.randrange(2, n - 1)
+        x = legacy_mod_pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = legacy_mod_pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def measure(func: Callable, args_list: list, min_time: float = 0.2) -> float:
+    """Возвращает число вызовов func в секунду на заданном наборе аргументов."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for args in args_list:
+            func(*args)
+        calls += len(args_list)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+
+
+def run(bits_list: list[int], samples: int = 8, min_time: float = 0.2):
+    print(f"Бэкенд: {backend.get_backend()} (доступны: {', '.join(backend.available_backends())})")
+    header = f"{'bits':>6} | {'функция':<18} | {'прежняя, оп/с':>14} | {'numtheory, оп/с':>15} | {'ускорение':>9}"
+    print(header)
+    print('-' * len(header))
+    for bits in bits_list:
+        mods = [random.getrandbits(bits) | (1 << (bits - 1)) | 1 for _ in range(samples)]
+        pow_args = [(random.getrandbits(bits), random.getrandbits(bits), m) for m in mods]
+        inv_args = [(random.randrange(2, m) | 1, m) for m in mods]
+        inv_args = [(a, m) for a, m in inv_args if core.gcd(a, m) == 1] or [(3, mods[0] * 2 + 1)]
+        prime_args = [(m, 4) for m in mods]
+
+        cases = [
+            ('mod_pow', legacy_mod_pow, core.mod_pow, pow_args),
+            ('mod_pow_window', legacy_mod_pow, core.mod_pow_window, pow_args),
+            ('mod_inverse', legacy_mod_inverse, core.mod_inverse, inv_args),
+            ('is_probable_prime', legacy_is_probable_prime, core.is_probable_prime, prime_args),
+        ]
+        for name, old, new, args_list in cases:
+            try:
+                old_rate = measure(old, args_list, min_time)
+            except RecursionError:
+                old_rate = float('nan')
+            new_rate = measure(new, args_list, min_time)
+            print(f"{bits:>6} | {name:<18} | {old_rate:>14.1f} | {new_rate:>15.1f} | {new_rate / old_rate:>8.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Микробенчмарк пакета numtheory")
+    parser.add_argument('--bits', type=int, nargs='+', default=[64, 256, 512, 1024, 2048, 4096],
+                        help='Размеры чисел в битах')
+    parser.add_argument('--samples', type=int, default=8, help='Число случайных наборов аргументов на размер')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Минимальное время замера, с')
+    parser.add_argument('--backend', choices=['auto', *backend.BACKENDS], default=None,
+                        help='Бэкенд numtheory для замера')
+    args = parser.parse_args()
+
+    if args.backend:
+        try:
+            backend.set_backend(args.backend)
+        except ValueError as e:
+            print(f"Ошибка: {e}", file=sys.stderr)
+            sys.exit(1)
+    run(args.bits, args.samples, args.min_time)
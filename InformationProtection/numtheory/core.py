@@ -0,0 +1,223 @@
+"""
+Общие теоретико-числовые функции для лабораторных работ.
+
+Содержит:
+ 1) mod_pow(a, e, m) — возведение в степень по модулю (через выбранный бэкенд);
+ 2) mod_pow_window(a, e, m) — возведение в степень методом скользящего окна (чистый Python);
+ 3) extended_gcd(a, b) — обобщённый алгоритм Евклида;
+ 4) mod_inverse(a, m) — обратный элемент по модулю;
+ 5) is_probable_prime(n, k) — тест Миллера-Рабина;
+ 6) is_probable_prime_fermat(n, k) — тест Ферма;
+ 7) jacobi(a, n) — символ Якоби.
+"""
+
+import random
+from typing import Tuple
+
+from . import backend
+
+
+SMALL_PRIMES = (3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+
+
+def _window_size(bits: int) -> int:
+    """Подбирает ширину окна по длине показателя (как в GMP/OpenSSL)."""
+    if bits <= 24:
+        return 1
+    if bits <= 80:
+        return 3
+    if bits <= 240:
+        return 4
+    if bits <= 672:
+        return 5
+    return 6
+
+
+def mod_pow_window(a: int, e: int, m: int, w: int = None) -> int:
+    """Возведение a^e по модулю m методом скользящего окна.
+
+    Предвычисляются нечётные степени a^1, a^3, ..., a^(2^w - 1), после чего
+    показатель просматривается от старших битов к младшим окнами до w бит.
+    Число умножений уменьшается примерно с bits/2 до bits/(w+1).
+    """
+    if m == 1:
+        return 0
+    if e < 0:
+        return mod_pow_window(mod_inverse(a, m), -e, m, w)
+    a %= m
+    if e == 0:
+        return 1
+    if w is None:
+        w = _window_size(e.bit_length())
+
+    a2 = (a * a) % m
+    table = [a]
+    for _ in range((1 << (w - 1)) - 1):
+        table.append((table[-1] * a2) % m)
+
+    digits = bin(e)[2:]
+    n = len(digits)
+    result = 1
+    i = 0
+    while i < n:
+        if digits[i] == '0':
+            result = (result * result) % m
+            i += 1
+            continue
+        # Самое длинное окно не более w бит, заканчивающееся единичным битом
+        j = min(i + w, n)
+        while digits[j - 1] == '0':
+            j -= 1
+        for _ in range(j - i):
+            result = (result * result) % m
+        result = (result * table[int(digits[i:j], 2) >> 1]) % m
+        i = j
+    return result
+
+
+def mod_pow(a: int, e: int, m: int) -> int:
+    """Возведение a^e по модулю m.
+
+    Использует gmpy2.powmod, встроенный pow или mod_pow_window в зависимости от бэкенда.
+    Отрицательный показатель означает возведение в степень обратного элемента.
+    """
+    name = backend.get_backend()
+    if name == 'builtin':
+        return pow(a, e, m)
+    if name == 'gmpy2':
+        if m == 1:
+            return 0
+        return int(backend.gmpy2.powmod(a, e, m))
+    return mod_pow_window(a, e, m)
+
+
+def gcd(a: int, b: int) -> int:
+    """Наибольший общий делитель (алгоритм Евклида)."""
+    a, b = abs(a), abs(b)
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
+    """Обобщённый алгоритм Евклида.
+
+    Возвращает (g, x, y) такие, что g = gcd(a, b) и a*x + b*y = g.
+    Итеративная версия: не упирается в ограничение глубины рекурсии,
+    корректно работает с отрицательными a, b.
+    """
+    old_r, r = abs(a), abs(b)
+    old_s, s = 1, 0
+    old_t, t = 0, 1
+
+    while r != 0:
+        q = old_r // r
+        old_r, r = r, old_r - q * r
+        old_s, s = s, old_s - q * s
+        old_t, t = t, old_t - q * t
+
+    x = old_s if a >= 0 else -old_s
+    y = old_t if b >= 0 else -old_t
+    return old_r, x, y
+
+
+def mod_inverse(a: int, m: int) -> int:
+    """Вычисление модульного обратного элемента a⁻¹ mod m."""
+    name = backend.get_backend()
+    try:
+        if name == 'builtin':
+            return pow(a, -1, m)
+        if name == 'gmpy2':
+            return int(backend.gmpy2.invert(a, m))
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"Обратный элемент не существует для a={a}, m={m}") from None
+
+    d, x, _ = extended_gcd(a, m)
+    if d != 1:
+        raise ValueError(f"Обратный элемент не существует для a={a}, m={m}")
+    return x % m
+
+
+def jacobi(a: int, n: int) -> int:
+    """Символ Якоби (a/n) для нечётного n > 0: 1, -1 или 0 (если gcd(a, n) > 1).
+
+    Для простого n это символ Лежандра: 1 для квадратичных вычетов, -1 для невычетов.
+    Считается по закону взаимности без возведения в степень.
+    """
+    if n <= 0 or n % 2 == 0:
+        raise ValueError(f"n должно быть нечётным положительным, n={n}")
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _small_prime_check(n: int):
+    """Быстрая проверка по таблице малых простых.
+
+    Возвращает True/False, если вопрос решён, и None, если нужен полный тест.
+    """
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    for prime in SMALL_PRIMES:
+        if n % prime == 0:
+            return n == prime
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+    return None
+
+
+def is_probable_prime(n: int, k: int = 10) -> bool:
+    """Тест простоты Миллера-Рабина с k раундами.
+
+    Перед тестом число проверяется на делимость малыми простыми.
+    """
+    quick = _small_prime_check(n)
+    if quick is not None:
+        return quick
+    if backend.get_backend() == 'gmpy2':
+        return bool(backend.gmpy2.is_prime(n, k))
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for _ in range(k):
+        a = random.randrange(2, n - 1)
+        x = mod_pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = (x * x) % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_probable_prime_fermat(n: int, k: int = 8) -> bool:
+    """Проверка простоты тестом Ферма с k испытаниями.
+
+    Возвращает True, если n вероятно простое; False — если точно составное.
+    """
+    quick = _small_prime_check(n)
+    if quick is not None:
+        return quick
+
+    for _ in range(k):
+        a = random.randrange(2, n - 1)
+        if mod_pow(a, n - 1, n) != 1:
+            return False
+    return True
@@ -0,0 +1,294 @@
+"""
+Дискретное логарифмирование: h = g^x mod p.
+
+ 1) bsgs — шаг младенца, шаг великана. Шаги считаются одним умножением
+    (g^(j+1) = g^j * g, h * g^(-m(i+1)) = h * g^(-mi) * g^(-m)), таблица
+    младенческих шагов — открытая адресация в двух массивах array('I')
+    (32-битный отпечаток значения и номер шага): ячеек — степень двойки не
+    меньше 2·size, по 8 байт на ячейку, т. е. ~16 байт на элемент вместо
+    ~100 байт у dict с большими целыми.
+ 2) pohlig_hellman — сводит задачу в группе порядка n к задачам в подгруппах
+    простых порядков q | n; для гладкого p-1 работает за O(sum e*sqrt(q)).
+ 3) pollard_rho_log — ρ-метод Полларда для группы простого порядка q с
+    r-добавочным блужданием и различимыми точками; блуждания можно раздать
+    нескольким процессам, совпадение ищется по общему словарю точек.
+ 4) discrete_log — выбирает метод по разложению порядка g.
+ 5) solve_discrete_log — то же для лабораторных: проверка входа
+    (check_dlog_input), разложение p - 1 и сообщения в консоль.
+"""
+
+import math
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from .core import is_probable_prime_fermat, mod_inverse, mod_pow
+from .factor import factorize
+
+
+# Подгруппы простого порядка до стольких бит решаются BSGS, большие — ρ-методом
+BSGS_MAX_BITS = 40
+# Наибольшее число младенческих шагов (остальное добирается шагами великана)
+BSGS_TABLE_LIMIT = 1 << 24
+RHO_PARTITIONS = 32
+
+_EMPTY = 0xFFFFFFFF
+_MASK32 = 0xFFFFFFFF
+_HASH_MUL = 0x9E3779B1
+
+
+def _baby_steps(g: int, p: int, size: int):
+    """Строит таблицу g^j, j < size. Возвращает (keys, values, bits, steps).
+
+    steps < size, если порядок g оказался меньше size (g^steps == 1).
+    """
+    bits = max(4, (2 * size - 1).bit_length())
+    shift = 32 - bits
+    mask = (1 << bits) - 1
+    keys = array('I', bytes(4 << bits))
+    values = array('I', [_EMPTY]) * (1 << bits)
+    current = 1
+    for j in range(size):
+        fingerprint = current & _MASK32
+        slot = ((fingerprint * _HASH_MUL) & _MASK32) >> shift
+        while values[slot] != _EMPTY:
+            slot = (slot + 1) & mask
+        keys[slot] = fingerprint
+        values[slot] = j
+        current = current * g % p
+        if current == 1:
+            return keys, values, bits, j + 1
+    return keys, values, bits, size
+
+
+def bsgs(g: int, h: int, p: int, order: Optional[int] = None,
+         table_size: Optional[int] = None) -> Optional[int]:
+    """Шаг младенца, шаг великана: наименьшее x in [0, order) с g^x = h (mod p).
+
+    order — верхняя граница порядка g (по умолчанию p - 1). table_size
+    ограничивает память: при меньшей таблице растёт число шагов великана.
+    Возвращает None, если решения нет.
+    """
+    if order is None:
+        order = p - 1
+    g %= p
+    h %= p
+    if h == 1:
+        return 0
+    size = table_size or min(math.isqrt(order - 1) + 1, BSGS_TABLE_LIMIT)
+    if size >= 1 << 31:
+        raise ValueError('table_size must be < 2^31')
+    keys, values, bits, m = _baby_steps(g, p, size)
+    if m < size:
+        # Порядок g равен m — вся группа уже в таблице
+        order = m
+    shift = 32 - bits
+    mask = (1 << bits) - 1
+
+    factor = mod_pow(mod_inverse(g, p), m, p)
+    gamma = h
+    for i in range((order + m - 1) // m):
+        fingerprint = gamma & _MASK32
+        slot = ((fingerprint * _HASH_MUL) & _MASK32) >> shift
+        while values[slot] != _EMPTY:
+            if keys[slot] == fingerprint:
+                # Отпечаток 32-битный — совпадение проверяем возведением в степень
+                x = i * m + values[slot]
+                if x < order and mod_pow(g, x, p) == h:
+                    return x
+            slot = (slot + 1) & mask
+        gamma = gamma * factor % p
+    return None
+
+
+def _rho_walks(g: int, h: int, p: int, q: int, steps: list, dp_bits: int,
+               walks: int, seed: int) -> list[tuple]:
+    """Выполняет walks блужданий до различимой точки (младшие dp_bits бит нулевые).
+
+    steps — общие для всех процессов множители (g^c * h^d, c, d).
+    Возвращает список (точка, a, b), где точка = g^a * h^b mod p.
+    """
+    rng = random.Random(seed)
+    dp_mask = (1 << dp_bits) - 1
+    max_length = 20 << dp_bits
+    found = []
+    for _ in range(walks):
+        a = rng.randrange(q)
+        b = rng.randrange(1, q)
+        v = mod_pow(g, a, p) * mod_pow(h, b, p) % p
+        for _ in range(max_length):
+            if v & dp_mask == 0:
+                found.append((v, a % q, b % q))
+                break
+            multiplier, c, d = steps[(v >> dp_bits) % RHO_PARTITIONS]
+            v = v * multiplier % p
+            a += c
+            b += d
+    return found
+
+
+def pollard_rho_log(g: int, h: int, p: int, q: int, workers: int = 1,
+                    dp_bits: Optional[int] = None) -> int:
+    """ρ-метод Полларда для g^x = h (mod p), где порядок g — простое q.
+
+    h должно лежать в подгруппе, порождённой g (h^q = 1), иначе поиск не закончится.
+    Блуждания раздаются workers процессам пачками; различимые точки
+    собираются в словарь, и первое совпадение с разными b даёт x.
+    """
+    g %= p
+    h %= p
+    if h == 1:
+        return 0
+    if dp_bits is None:
+        dp_bits = max(0, q.bit_length() // 4 - 2)
+    steps = []
+    for _ in range(RHO_PARTITIONS):
+        c, d = random.randrange(q), random.randrange(q)
+        steps.append((mod_pow(g, c, p) * mod_pow(h, d, p) % p, c, d))
+    walks = 64
+
+    seen = {}
+
+    def collide(points) -> Optional[int]:
+        for v, a, b in points:
+            if v not in seen:
+                seen[v] = (a, b)
+                continue
+            a2, b2 = seen[v]
+            if (b - b2) % q == 0:
+                continue
+            x = (a2 - a) * mod_inverse(b - b2, q) % q
+            if mod_pow(g, x, p) == h:
+                return x
+        return None
+
+    if workers <= 1:
+        while True:
+            x = collide(_rho_walks(g, h, p, q, steps, dp_bits, walks, random.getrandbits(64)))
+            if x is not None:
+                return x
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = [executor.submit(_rho_walks, g, h, p, q, steps, dp_bits, walks, random.getrandbits(64))
+                   for _ in range(workers)]
+        while True:
+            future = pending.pop(0)
+            x = collide(future.result())
+            if x is not None:
+                for other in pending:
+                    other.cancel()
+                return x
+            pending.append(executor.submit(_rho_walks, g, h, p, q, steps, dp_bits, walks,
+                                           random.getrandbits(64)))
+
+
+def _prime_order_log(g: int, h: int, p: int, q: int, workers: int) -> Optional[int]:
+    """Логарифм в подгруппе простого порядка q: BSGS для малых q, иначе ρ-метод."""
+    if q.bit_length() <= BSGS_MAX_BITS:
+        return bsgs(g, h, p, q)
+    if mod_pow(h, q, p) != 1:
+        return None
+    return pollard_rho_log(g, h, p, q, workers)
+
+
+def pohlig_hellman(g: int, h: int, p: int, factors: dict[int, int], workers: int = 1) -> Optional[int]:
+    """Метод Полига-Хеллмана: x по модулю порядка g, разложенного как factors.
+
+    factors — {q: e} для точного порядка n = prod q^e элемента g.
+    Для каждой степени q^e цифры x по основанию q находятся логарифмом в
+    подгруппе порядка q, после чего остатки склеиваются по КТО.
+    Возвращает None, если h не лежит в подгруппе, порождённой g.
+    """
+    n = _product(factors)
+    g %= p
+    h %= p
+
+    x = 0
+    modulus = 1
+    for q, e in factors.items():
+        cofactor = n // q ** e
+        g_q = mod_pow(g, cofactor, p)
+        h_q = mod_pow(h, cofactor, p)
+        gamma = mod_pow(g_q, q ** (e - 1), p)
+        g_q_inv = mod_inverse(g_q, p)
+        x_q = 0
+        for k in range(e):
+            # (g_q^(-x_q) * h_q)^(q^(e-1-k)) = gamma^(d_k)
+            delta = mod_pow(mod_pow(g_q_inv, x_q, p) * h_q % p, q ** (e - 1 - k), p)
+            digit = _prime_order_log(gamma, delta, p, q, workers)
+            if digit is None:
+                return None
+            x_q += digit * q ** k
+        # Китайская теорема об остатках: x ≡ x_q (mod q^e)
+        qe = q ** e
+        x += modulus * ((x_q - x) * mod_inverse(modulus, qe) % qe)
+        modulus *= qe
+    return x if mod_pow(g, x, p) == h else None
+
+
+def _product(factors: dict[int, int]) -> int:
+    n = 1
+    for q, e in factors.items():
+        n *= q ** e
+    return n
+
+
+def element_order(g: int, p: int, factors: dict[int, int]) -> dict[int, int]:
+    """Разложение порядка g по модулю p; factors — разложение p - 1 (или кратного порядку)."""
+    n = _product(factors)
+    order = dict(factors)
+    for q in factors:
+        while order[q] and mod_pow(g, n // q, p) == 1:
+            n //= q
+            order[q] -= 1
+    return {q: e for q, e in order.items() if e}
+
+
+def discrete_log(g: int, h: int, p: int, factors: Optional[dict[int, int]] = None,
+                 workers: int = 1) -> Optional[int]:
+    """Дискретный логарифм h по основанию g по простому модулю p.
+
+    factors — разложение p - 1 (если известно заранее). Порядок g вычисляется
+    по разложению; если он гладкий или состоит из нескольких простых, работает
+    Полиг-Хеллман, а подзадачи решаются BSGS (q до BSGS_MAX_BITS бит) или
+    параллельным ρ-методом (workers процессов). Возвращает наименьший
+    x >= 0 или None, если h не является степенью g.
+    """
+    g %= p
+    h %= p
+    if g == 0 or h == 0:
+        return None
+    if factors is None:
+        factors = factorize(p - 1)
+    order = element_order(g, p, factors)
+    if mod_pow(h, _product(order), p) != 1:
+        return None
+    return pohlig_hellman(g, h, p, order, workers)
+
+
+def check_dlog_input(a: int, y: int, p: int) -> bool:
+    """Проверка входных данных задачи y = a^x mod p."""
+    if not is_probable_prime_fermat(p):
+        print("Ошибка: p должно быть простым числом")
+        return False
+    if a % p == 0 or y % p == 0:
+        print("Ошибка: a или y не должны быть кратны p")
+        return False
+    return True
+
+
+def solve_discrete_log(a: int, y: int, p: int, workers: int = 1) -> Optional[int]:
+    """Решение y = a^x mod p с выбором алгоритма по разложению p - 1.
+
+    Полиг-Хеллман сводит задачу к подгруппам простых порядков q | p - 1,
+    которые решаются BSGS (малые q) или ρ-методом Полларда на workers процессах.
+    """
+    if not check_dlog_input(a, y, p):
+        return None
+    factors = factorize(p - 1)
+    print("Разложение p - 1:", ' * '.join(f"{q}^{e}" if e > 1 else str(q) for q, e in factors.items()))
+    x = discrete_log(a, y, p, factors, workers)
+    if x is None:
+        print("Решение не найдено: y не является степенью a")
+    return x
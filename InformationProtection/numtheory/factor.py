@@ -0,0 +1,143 @@
+"""
+Разложение целых чисел на простые множители.
+
+Малые множители снимаются пробным делением по таблице простых из решета,
+оставшаяся составная часть раскладывается ρ-методом Полларда в варианте
+Брента (умножения накапливаются, НОД считается раз в несколько сотен шагов).
+
+Разложения, потребовавшие ρ-метода, запоминаются в памяти и, если задана
+переменная окружения NUMTHEORY_FACTOR_CACHE, в JSON-файле (FactorCache),
+чтобы повторная генерация ключей с тем же p не раскладывала p-1 заново.
+"""
+
+import json
+import os
+import random
+from math import gcd
+from typing import Optional
+
+from .core import is_probable_prime
+from .primes import SIEVE_PRIMES
+
+
+def pollard_brent(n: int, seed: Optional[int] = None) -> int:
+    """Находит нетривиальный делитель составного n ρ-методом Полларда-Брента."""
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(seed)
+    while True:
+        y = rng.randrange(1, n)
+        c = rng.randrange(1, n)
+        block = 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                saved = y
+                for _ in range(min(block, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += block
+            r *= 2
+        if g == n:
+            # Произведение проскочило делитель — повторяем шаги по одному от сохранённой точки
+            g = 1
+            while g == 1:
+                saved = (saved * saved + c) % n
+                g = gcd(abs(x - saved), n)
+        if g != n:
+            return g
+
+
+class FactorCache:
+    """Кэш разложений в JSON-файле: {"n": {"q": e}}, числа хранятся строками."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def get(self, n: int) -> Optional[dict[int, int]]:
+        factors = self._load().get(str(n))
+        if factors is None:
+            return None
+        return {int(q): e for q, e in factors.items()}
+
+    def put(self, n: int, factors: dict[int, int]):
+        data = self._load()
+        data[str(n)] = {str(q): e for q, e in factors.items()}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+
+_memory_cache = {}
+
+
+def _default_cache() -> Optional[FactorCache]:
+    path = os.environ.get('NUMTHEORY_FACTOR_CACHE')
+    return FactorCache(path) if path else None
+
+
+def factorize(n: int, cache: Optional[FactorCache] = None) -> dict[int, int]:
+    """Разложение n > 0 на простые множители: словарь {простое: степень}.
+
+    cache — файл-кэш разложений; по умолчанию берётся из NUMTHEORY_FACTOR_CACHE.
+    """
+    if n < 1:
+        raise ValueError('n must be > 0')
+    if n in _memory_cache:
+        return dict(_memory_cache[n])
+    if cache is None:
+        cache = _default_cache()
+    if cache is not None:
+        factors = cache.get(n)
+        if factors is not None:
+            _memory_cache[n] = factors
+            return dict(factors)
+
+    original = n
+    factors = {}
+    while n % 2 == 0:
+        factors[2] = factors.get(2, 0) + 1
+        n //= 2
+    for prime in SIEVE_PRIMES:
+        if prime * prime > n:
+            break
+        while n % prime == 0:
+            factors[prime] = factors.get(prime, 0) + 1
+            n //= prime
+
+    stack = [n] if n > 1 else []
+    used_rho = False
+    while stack:
+        m = stack.pop()
+        if m < SIEVE_PRIMES[-1] ** 2 or is_probable_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        used_rho = True
+        d = pollard_brent(m)
+        stack.extend((d, m // d))
+    factors = dict(sorted(factors.items()))
+
+    # Разложения, найденные пробным делением, дёшевы — кэшируем только работу ρ-метода
+    if used_rho:
+        _memory_cache[original] = factors
+        if cache is not None:
+            try:
+                cache.put(original, factors)
+            except OSError:
+                pass
+    return dict(factors)
@@ -0,0 +1,130 @@
+"""
+Возведение в степень с фиксированным основанием (fixed-base windowing).
+
+Если основание и модуль не меняются (генератор g в DSA/ГОСТ/Эль-Гамале,
+открытый ключ y), можно один раз предвычислить таблицу
+
+    T[i][d] = base^(d * 2^(w*i)) mod m,   d = 1 .. 2^w - 1,
+
+после чего base^e mod m — это произведение T[i][d_i] по w-битным цифрам d_i
+показателя: около bits/w умножений и ни одного возведения в квадрат.
+
+Таблицу можно сохранить рядом с файлом ключа (FixedBaseExp.cached), чтобы
+следующие запуски не тратили время на предвычисление.
+"""
+
+import json
+import os
+from typing import Optional
+
+from .core import mod_pow
+
+
+class FixedBaseExp:
+    """Таблица степеней основания base по модулю modulus для показателей до exp_bits бит."""
+
+    _memory_cache = {}
+
+    def __init__(self, base: int, modulus: int, exp_bits: int, w: int = 4, table: Optional[list[list[int]]] = None):
+        self.base = base % modulus
+        self.modulus = modulus
+        self.exp_bits = exp_bits
+        self.w = w
+        self.table = table if table is not None else self._build()
+
+    def _build(self) -> list[list[int]]:
+        m = self.modulus
+        size = 1 << self.w
+        table = []
+        power = self.base
+        for _ in range((self.exp_bits + self.w - 1) // self.w):
+            row = [1, power]
+            for _ in range(size - 2):
+                row.append((row[-1] * power) % m)
+            table.append(row)
+            power = (row[-1] * power) % m
+        return table
+
+    def pow(self, e: int) -> int:
+        """Возвращает base^e mod modulus.
+
+        Показатели длиннее exp_bits и отрицательные передаются в обычный mod_pow.
+        """
+        if e < 0 or e.bit_length() > self.exp_bits:
+            return mod_pow(self.base, e, self.modulus)
+        m = self.modulus
+        mask = (1 << self.w) - 1
+        result = 1
+        for row in self.table:
+            if not e:
+                break
+            digit = e & mask
+            if digit:
+                result = (result * row[digit]) % m
+            e >>= self.w
+        return result % m
+
+    def save(self, path: str):
+        """Сохраняет таблицу: строка JSON-заголовка, затем элементы фиксированной длины big-endian."""
+        width = (self.modulus.bit_length() + 7) // 8
+        header = {'base': str(self.base), 'modulus': str(self.modulus),
+                  'exp_bits': self.exp_bits, 'w': self.w}
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(header).encode() + b'\n')
+            for row in self.table:
+                f.write(b''.join(value.to_bytes(width, 'big') for value in row[1:]))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'FixedBaseExp':
+        """Загружает таблицу, сохранённую методом save."""
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline())
+            data = f.read()
+        modulus = int(header['modulus'])
+        w = header['w']
+        exp_bits = header['exp_bits']
+        width = (modulus.bit_length() + 7) // 8
+        per_row = (1 << w) - 1
+        rows = (exp_bits + w - 1) // w
+        if len(data) != rows * per_row * width:
+            raise ValueError(f"Повреждённый файл таблицы: {path}")
+        table = []
+        for i in range(rows):
+            offset = i * per_row * width
+            row = [1] + [int.from_bytes(data[offset + j * width:offset + (j + 1) * width], 'big')
+                         for j in range(per_row)]
+            table.append(row)
+        return cls(int(header['base']), modulus, exp_bits, w, table)
+
+    @classmethod
+    def cached(cls, key_path: Optional[str], name: str, base: int, modulus: int, exp_bits: int,
+               w: int = 4) -> 'FixedBaseExp':
+        """Возвращает таблицу для (base, modulus), используя кэш в памяти и файл key_path.name.fbe.
+
+        Если файла нет или он построен для других параметров, таблица строится
+        заново и сохраняется рядом с ключом. key_path=None — только кэш в памяти.
+        """
+        cache_key = (base % modulus, modulus, exp_bits, w)
+        table = cls._memory_cache.get(cache_key)
+        if table is not None:
+            return table
+
+        path = f"{key_path}.{name}.fbe" if key_path else None
+        if path and os.path.exists(path):
+            try:
+                table = cls.load(path)
+            except (OSError, ValueError, KeyError):
+                table = None
+            if table is not None and (table.base, table.modulus, table.exp_bits, table.w) != cache_key:
+                table = None
+        if table is None:
+            table = cls(base, modulus, exp_bits, w)
+            if path:
+                try:
+                    table.save(path)
+                except OSError:
+                    pass
+        cls._memory_cache[cache_key] = table
+        return table
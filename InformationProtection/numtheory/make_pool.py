@@ -0,0 +1,62 @@
+"""
+Заполнение пула простых чисел на диске и замер скорости генерации.
+
+Запуск (из каталога InformationProtection):
+    python -m numtheory.make_pool fill --bits 1024 --count 8 --safe --workers 4
+    python -m numtheory.make_pool show
+    python -m numtheory.make_pool bench --bits 512 --count 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from .primes import PrimePool, generate_primes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Генерация простых чисел и пул на диске")
+    parser.add_argument('--pool', default=os.environ.get('NUMTHEORY_PRIME_POOL', 'prime_pool.json'),
+                        help='Файл пула (по умолчанию NUMTHEORY_PRIME_POOL или prime_pool.json)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fill_parser = subparsers.add_parser('fill', help='Заполнить пул простыми числами')
+    fill_parser.add_argument('--bits', type=int, required=True, help='Размер простых в битах')
+    fill_parser.add_argument('--count', type=int, default=8, help='Сколько чисел должно быть в пуле')
+    fill_parser.add_argument('--safe', action='store_true', help='Безопасные простые p = 2q + 1')
+    fill_parser.add_argument('--workers', type=int, default=None, help='Число процессов (по умолчанию — все ядра)')
+
+    subparsers.add_parser('show', help='Показать содержимое пула')
+
+    bench_parser = subparsers.add_parser('bench', help='Сравнить скорость генерации на 1 и N процессах')
+    bench_parser.add_argument('--bits', type=int, default=512, help='Размер простых в битах')
+    bench_parser.add_argument('--count', type=int, default=4, help='Число генерируемых простых')
+    bench_parser.add_argument('--safe', action='store_true', help='Безопасные простые p = 2q + 1')
+    bench_parser.add_argument('--workers', type=int, default=None, help='Число процессов')
+
+    args = parser.parse_args()
+    pool = PrimePool(args.pool)
+
+    if args.command == 'fill':
+        kind = 'безопасных простых' if args.safe else 'простых'
+        print(f"Заполнение пула {args.pool}: {args.count} {kind} по {args.bits} бит...")
+        start = time.perf_counter()
+        added = pool.fill(args.bits, args.count, args.safe, args.workers)
+        print(f"Добавлено {added} чисел за {time.perf_counter() - start:.2f} с")
+    elif args.command == 'show':
+        summary = pool.summary()
+        if not summary:
+            print(f"Пул {args.pool} пуст")
+        for key, size in sorted(summary.items()):
+            print(f"{key}: {size}")
+    elif args.command == 'bench':
+        workers = args.workers or os.cpu_count() or 1
+        for n in sorted({1, workers}):
+            start = time.perf_counter()
+            generate_primes(args.bits, args.count, n, args.safe)
+            elapsed = time.perf_counter() - start
+            print(f"workers={n}: {args.count} чисел по {args.bits} бит за {elapsed:.2f} с "
+                  f"({args.count / elapsed:.2f} чисел/с)")
+    else:
+        sys.exit(1)
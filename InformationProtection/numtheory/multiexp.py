@@ -0,0 +1,66 @@
+"""
+Одновременное возведение в степень нескольких оснований (трюк Штрауса/Шамира).
+
+Произведение b1^e1 * b2^e2 * ... * bn^en mod m вычисляется за один проход по
+битам показателей: возведения в квадрат общие для всех оснований, а умножения
+выполняются окнами по w бит из таблиц предвычисленных степеней каждого основания.
+Для двух оснований (проверка DSA/ГОСТ: g^u1 * y^u2) это трюк Шамира.
+
+Здесь же — случайные малые показатели для пакетной проверки подписей
+(small exponents test, Bellare-Garay-Rabin).
+"""
+
+import random
+from typing import Iterable, Tuple
+
+from .core import mod_pow
+
+
+BATCH_EXPONENT_BITS = 64
+
+
+def multi_exp(pairs: Iterable[Tuple[int, int]], m: int, w: int = 4) -> int:
+    """Вычисляет произведение base^exp по модулю m для всех пар (base, exp).
+
+    Показатели должны быть неотрицательными.
+    """
+    pairs = [(base % m, exp) for base, exp in pairs if exp]
+    if m == 1:
+        return 0
+    if not pairs:
+        return 1
+    if len(pairs) == 1:
+        return mod_pow(pairs[0][0], pairs[0][1], m)
+
+    # Таблицы base^0 .. base^(2^w - 1) для каждого основания
+    size = 1 << w
+    tables = []
+    for base, _ in pairs:
+        table = [1, base]
+        for _ in range(size - 2):
+            table.append((table[-1] * base) % m)
+        tables.append(table)
+
+    bits = max(exp.bit_length() for _, exp in pairs)
+    windows = (bits + w - 1) // w
+    mask = size - 1
+    result = 1
+    for index in range(windows - 1, -1, -1):
+        if result != 1:
+            for _ in range(w):
+                result = (result * result) % m
+        shift = index * w
+        for (_, exp), table in zip(pairs, tables):
+            digit = (exp >> shift) & mask
+            if digit:
+                result = (result * table[digit]) % m
+    return result
+
+
+def batch_exponents(count: int, bits: int = BATCH_EXPONENT_BITS) -> list[int]:
+    """Случайные нечётные (а значит, ненулевые) показатели для пакетной проверки.
+
+    Вероятность пропустить неверную подпись в группе простого порядка —
+    не более 2^-bits.
+    """
+    return [random.getrandbits(bits) | 1 for _ in range(count)]
@@ -0,0 +1,240 @@
+"""
+Генерация вероятно-простых и безопасных простых чисел.
+
+Вместо проверки каждого случайного нечётного кандидата полным тестом
+кандидаты берутся окнами подряд идущих нечётных чисел, и окно просеивается
+по таблице малых простых (решето). Полный тест Миллера-Рабина запускается
+только для уцелевших чисел. Для безопасных простых p = 2q + 1 решето
+одновременно отбрасывает q, для которых 2q + 1 делится на малое простое.
+
+Поиск можно распределить по процессам (concurrent.futures), а заранее
+сгенерированные простые хранить в файле-пуле (PrimePool) для последующей
+генерации ключей.
+
+Заполнение пула из командной строки — см. numtheory/make_pool.py.
+"""
+
+import json
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Optional, Tuple
+
+from .core import is_probable_prime
+
+
+SIEVE_LIMIT = 1 << 16
+WINDOW = 4096
+
+
+def _small_primes(limit: int) -> list[int]:
+    """Решето Эратосфена: нечётные простые меньше limit."""
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b'\x00\x00'
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(3, limit) if sieve[i]]
+
+
+SIEVE_PRIMES = _small_primes(SIEVE_LIMIT)
+
+
+def sieve_window(start: int, size: int, safe: bool = False) -> bytearray:
+    """Просеивает окно кандидатов start, start + 2, ..., start + 2*(size-1).
+
+    start должно быть нечётным. Возвращает bytearray, где 1 означает, что
+    кандидат не делится ни на одно малое простое (а для safe=True ещё и
+    2*кандидат + 1 не делится). Малые простые, не меньшие start, не
+    используются, чтобы не отбросить сами простые числа.
+    """
+    alive = bytearray([1]) * size
+    for prime in SIEVE_PRIMES:
+        if prime >= start:
+            break
+        # Индекс i, при котором start + 2i ≡ 0 (mod prime): i ≡ -start * 2⁻¹
+        half = (prime + 1) // 2
+        first = (-start * half) % prime
+        alive[first::prime] = bytes(len(range(first, size, prime)))
+        if safe:
+            # 2(start + 2i) + 1 ≡ 0 (mod prime): start + 2i ≡ -2⁻¹
+            first = ((-half - start) * half) % prime
+            alive[first::prime] = bytes(len(range(first, size, prime)))
+    return alive
+
+
+def _passes_fermat_base2(n: int) -> bool:
+    return pow(2, n - 1, n) == 1
+
+
+def is_safe_prime_pair(q: int, k: int = 10) -> bool:
+    """Совместная проверка q и p = 2q + 1.
+
+    Сначала дешёвый тест Ферма по основанию 2 для q и p, затем полный
+    тест Миллера-Рабина для обоих чисел.
+    """
+    p = 2 * q + 1
+    if not _passes_fermat_base2(q) or not _passes_fermat_base2(p):
+        return False
+    return is_probable_prime(q, k) and is_probable_prime(p, k)
+
+
+def _search_window(bits: int, safe: bool, k: int, seed: int) -> Optional[int]:
+    """Просматривает одно случайное окно и возвращает первое найденное простое.
+
+    Для safe=True bits — размер p, в окне ищется q размера bits - 1,
+    и возвращается p = 2q + 1. Если в окне простых нет, возвращает None.
+
+    Окно просматривается со случайной позиции с переходом через конец:
+    при малых bits окно покрывает весь диапазон, и без этого всегда
+    возвращалось бы одно и то же простое.
+    """
+    rng = random.Random(seed)
+    qbits = bits - 1 if safe else bits
+    low = 1 << (qbits - 1)
+    span = low // 2
+    size = min(WINDOW, span)
+    start = low + 1 + 2 * rng.randrange(span - size + 1)
+    offset = rng.randrange(size)
+
+    alive = sieve_window(start, size, safe)
+    for j in range(size):
+        i = (offset + j) % size
+        if not alive[i]:
+            continue
+        candidate = start + 2 * i
+        if safe:
+            if is_safe_prime_pair(candidate, k):
+                return 2 * candidate + 1
+        elif _passes_fermat_base2(candidate) and is_probable_prime(candidate, k):
+            return candidate
+    return None
+
+
+def _check_bits(bits: int, safe: bool):
+    if safe and bits < 3:
+        raise ValueError('bits must be >= 3 для генерации безопасного простого')
+    if bits < 2:
+        raise ValueError('bits must be >= 2')
+
+
+def _generate(bits: int, count: int, safe: bool, k: int, workers: int) -> list[int]:
+    """Находит count простых, распределяя окна по workers процессам."""
+    _check_bits(bits, safe)
+    found = []
+    if workers <= 1:
+        while len(found) < count:
+            prime = _search_window(bits, safe, k, random.getrandbits(64))
+            if prime is not None:
+                found.append(prime)
+        return found
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(_search_window, bits, safe, k, random.getrandbits(64))
+                   for _ in range(workers)}
+        while len(found) < count:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                prime = future.result()
+                if prime is not None and len(found) < count:
+                    found.append(prime)
+                if len(found) < count:
+                    pending.add(executor.submit(_search_window, bits, safe, k, random.getrandbits(64)))
+        for future in pending:
+            future.cancel()
+    return found
+
+
+def _pool_take(bits: int, safe: bool) -> Optional[int]:
+    path = os.environ.get('NUMTHEORY_PRIME_POOL')
+    if not path or not os.path.exists(path):
+        return None
+    return PrimePool(path).take(bits, safe)
+
+
+def gen_probable_prime(bits: int = 32, k: int = 10, workers: int = 1) -> int:
+    """Генерация вероятно-простого числа с заданным количеством битов.
+
+    Если задана переменная окружения NUMTHEORY_PRIME_POOL, число сначала
+    берётся из пула на диске.
+    """
+    prime = _pool_take(bits, False)
+    if prime is not None:
+        return prime
+    return _generate(bits, 1, False, k, workers)[0]
+
+
+def gen_safe_prime(bits: int = 32, k: int = 10, workers: int = 1) -> Tuple[int, int]:
+    """Генерация безопасного простого p = 2*q + 1.
+
+    Возвращает (p, q), где p и q — вероятно-простые, p имеет bits бит.
+    """
+    p = _pool_take(bits, True)
+    if p is None:
+        p = _generate(bits, 1, True, k, workers)[0]
+    return p, (p - 1) // 2
+
+
+def generate_primes(bits: int, count: int, workers: Optional[int] = None,
+                    safe: bool = False, k: int = 10) -> list[int]:
+    """Пакетная генерация count простых (для safe=True — безопасных p).
+
+    workers=None означает число процессоров.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return _generate(bits, count, safe, k, workers)
+
+
+class PrimePool:
+    """Пул заранее сгенерированных простых чисел в JSON-файле.
+
+    Числа хранятся по ключам вида 'prime:1024' и 'safe:1024'.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @staticmethod
+    def _key(bits: int, safe: bool) -> str:
+        return f"{'safe' if safe else 'prime'}:{bits}"
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def _save(self, data: dict):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def size(self, bits: int, safe: bool = False) -> int:
+        return len(self._load().get(self._key(bits, safe), []))
+
+    def fill(self, bits: int, count: int, safe: bool = False, workers: Optional[int] = None) -> int:
+        """Догенерирует простые, пока в пуле не станет count штук. Возвращает число добавленных."""
+        missing = count - self.size(bits, safe)
+        if missing <= 0:
+            return 0
+        primes = generate_primes(bits, missing, workers, safe)
+        data = self._load()
+        data.setdefault(self._key(bits, safe), []).extend(str(p) for p in primes)
+        self._save(data)
+        return missing
+
+    def take(self, bits: int, safe: bool = False) -> Optional[int]:
+        """Извлекает одно простое из пула или возвращает None, если пул пуст."""
+        data = self._load()
+        values = data.get(self._key(bits, safe))
+        if not values:
+            return None
+        value = int(values.pop())
+        self._save(data)
+        return value
+
+    def summary(self) -> dict:
+        return {key: len(values) for key, values in self._load().items()}
+
@@ -0,0 +1,64 @@
+"""
+Первообразные корни и простые числа с известным разложением p - 1.
+
+g — первообразный корень по модулю p тогда и только тогда, когда
+g^((p-1)/q) != 1 (mod p) для каждого простого q | p - 1. Поэтому
+поиск корня упирается в разложение p - 1: для случайного p оно берётся
+из factorize (ρ-метод и кэш), а gen_prime_with_factorization строит
+p = k*q + 1 так, что разложение известно сразу.
+"""
+
+import random
+from typing import Optional, Tuple
+
+from .core import is_probable_prime, mod_pow
+from .factor import factorize
+from .primes import gen_probable_prime
+
+
+# Длина множителя k в p = k*q + 1 (k раскладывается пробным делением)
+COFACTOR_BITS = 20
+
+
+def is_primitive_root(g: int, p: int, factors: dict[int, int]) -> bool:
+    """Проверяет g по разложению factors числа p - 1."""
+    return all(mod_pow(g, (p - 1) // q, p) != 1 for q in factors)
+
+
+def primitive_root(p: int, factors: Optional[dict[int, int]] = None) -> int:
+    """Наименьший первообразный корень по простому модулю p.
+
+    factors — разложение p - 1, если оно известно; иначе вызывается factorize.
+    """
+    if p == 2:
+        return 1
+    if factors is None:
+        factors = factorize(p - 1)
+    for g in range(2, p):
+        if is_primitive_root(g, p, factors):
+            return g
+    raise ValueError("Первообразный корень не найден")
+
+
+def gen_prime_with_factorization(bits: int = 32, k: int = 10) -> Tuple[int, dict[int, int]]:
+    """Генерирует простое p из bits бит вместе с разложением p - 1.
+
+    p = m*q + 1, где q — случайное простое, а чётный множитель m не длиннее
+    COFACTOR_BITS бит и раскладывается мгновенно. Возвращает (p, {простое: степень}).
+    """
+    if bits < 2 * COFACTOR_BITS:
+        p = gen_probable_prime(bits, k)
+        return p, factorize(p - 1)
+
+    q = gen_probable_prime(bits - COFACTOR_BITS, k)
+    low = ((1 << (bits - 1)) + q - 1) // q
+    high = ((1 << bits) - 2) // q
+    while True:
+        m = random.randint(low, high) & ~1
+        if m < low:
+            continue
+        p = m * q + 1
+        if is_probable_prime(p, k):
+            factors = factorize(m)
+            factors[q] = factors.get(q, 0) + 1
+            return p, dict(sorted(factors.items()))
@@ -0,0 +1,111 @@
+import importlib.util
+import os
+import sys
+import unittest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from numtheory import gen_probable_prime, gen_safe_prime, is_probable_prime, jacobi
+
+
+def load_lab(name: str):
+    path = os.path.join(ROOT, name, 'main.py')
+    spec = importlib.util.spec_from_file_location(f'{name}_main', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class SmallPrimeTests(unittest.TestCase):
+    def setUp(self):
+        self._pool = os.environ.pop('NUMTHEORY_PRIME_POOL', None)
+
+    def tearDown(self):
+        if self._pool is not None:
+            os.environ['NUMTHEORY_PRIME_POOL'] = self._pool
+
+    def test_probable_prime_varies_at_small_sizes(self):
+        for bits in (4, 8, 12, 14):
+            primes = {gen_probable_prime(bits) for _ in range(50)}
+            self.assertGreater(len(primes), 1, bits)
+            for p in primes:
+                self.assertEqual(p.bit_length(), bits)
+                self.assertTrue(is_probable_prime(p))
+
+    def test_safe_prime_varies_at_small_sizes(self):
+        for bits in (6, 8, 12, 14):
+            primes = {gen_safe_prime(bits) for _ in range(50)}
+            self.assertGreater(len(primes), 1, bits)
+            for p, q in primes:
+                self.assertEqual(p.bit_length(), bits)
+                self.assertEqual(p, 2 * q + 1)
+                self.assertTrue(is_probable_prime(q))
+
+    def test_rsa_keygen_finishes_at_small_sizes(self):
+        for lab in ('lab6', 'lab8'):
+            module = load_lab(lab)
+            for bits in (4, 8):
+                for _ in range(10):
+                    public_key, private_key = module.generate_rsa_keys(bits)
+                    n, e = public_key
+                    self.assertEqual(pow(pow(5, e, n), private_key[1], n), 5 % n)
+
+
+class ElGamalBatchTests(unittest.TestCase):
+    def setUp(self):
+        self._pool = os.environ.pop('NUMTHEORY_PRIME_POOL', None)
+        self.lab = load_lab('lab9')
+
+    def tearDown(self):
+        if self._pool is not None:
+            os.environ['NUMTHEORY_PRIME_POOL'] = self._pool
+
+    def _forged(self, digest, key, shift):
+        """Подпись digest, у которой s сдвинуто на shift, а r — квадратичный невычет."""
+        p, g, x, _ = key
+        while True:
+            (r, s), = self.lab.elgamal_sign_digest(digest, p, g, x)
+            forged = (s + shift) % (p - 1)
+            if jacobi(r, p) == -1 and forged != 0:
+                return [(r, forged)]
+
+    def test_valid_signatures_pass(self):
+        for safe in (True, False):
+            p, g, x, y = self.lab.generate_elgamal_keys(64, safe)
+            items = []
+            for i in range(6):
+                digest = bytes([i]) * 32
+                items.append((digest, self.lab.elgamal_sign_digest(digest, p, g, x), (p, g, y)))
+            items.append((b'\x07' * 32, self.lab.elgamal_sign(b'\x07' * 32, p, g, x), (p, g, y)))
+            self.assertEqual(self.lab.verify_batch(items), [True] * len(items))
+
+    def test_paired_half_order_forgeries_rejected(self):
+        for safe in (True, False):
+            p, g, x, y = key = self.lab.generate_elgamal_keys(64, safe)
+            items = []
+            for digest in (b'\x01' * 32, b'\x02' * 32):
+                signature = self._forged(digest, key, (p - 1) // 2)
+                self.assertFalse(self.lab.elgamal_verify(digest, signature, p, g, y))
+                items.append((digest, signature, (p, g, y)))
+            for _ in range(20):
+                self.assertEqual(self.lab.verify_batch(items), [False, False])
+
+    def test_third_order_forgery_rejected(self):
+        while True:
+            p, g, x, y = self.lab.generate_elgamal_keys(64)
+            if (p - 1) % 3 == 0:
+                break
+        digest = b'\x03' * 32
+        valid = (b'\x04' * 32, self.lab.elgamal_sign_digest(b'\x04' * 32, p, g, x), (p, g, y))
+        while True:
+            (r, s), = self.lab.elgamal_sign_digest(digest, p, g, x)
+            forged = [(r, (s + (p - 1) // 3) % (p - 1))]
+            if forged[0][1] and not self.lab.elgamal_verify(digest, forged, p, g, y):
+                break
+        for _ in range(30):
+            self.assertEqual(self.lab.verify_batch([valid, (digest, forged, (p, g, y))]), [True, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
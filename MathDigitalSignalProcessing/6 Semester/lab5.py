@@ -1,7 +1,12 @@
+import os
+import sys
 import numpy as np
 import scipy.signal as sig
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'SignalGenerationMethods'))
+from commsim.stats import acf, welch_psd, xcorr
+
 fs = 30000  
 N = 1000    
 f_c = 5000  
@@ -41,17 +46,16 @@ A = np.sqrt(Xc**2 + Xs**2)
 
 def autocorr(x):
     x = x - np.mean(x)
-    result = np.correlate(x, x, mode='full')
-    return result[len(x)-1:]
+    return acf(x, one_sided=True)
 
 acf_y = autocorr(y)
 
-f_y, Pxx_y = sig.welch(y, fs, nperseg=512)
+f_y, Pxx_y = welch_psd(y, fs, nperseg=512)
 
 def crosscorr(x, y):
     x = x - np.mean(x)
     y = y - np.mean(y)
-    return np.correlate(x, y, mode='full')
+    return xcorr(x, y)
 
 ccf = crosscorr(y, y_channel)
 
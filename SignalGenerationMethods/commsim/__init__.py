@@ -0,0 +1,26 @@
+"""
+Общие модели систем связи для лабораторных работ по методам формирования сигналов.
+
+Лабораторные подключают пакет так:
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from commsim import OFDMLink
+"""
+
+from .chest import ChannelEstimator, estimation_matrix, linear_interp_matrix
+from .modem import MODULATIONS, QAMModem, QPSK_TABLE
+from .ofdm import OFDMLink
+from .sync import StreamingCPCorrelator, cp_metric, symbol_sync
+
+__all__ = [
+    'ChannelEstimator',
+    'MODULATIONS',
+    'OFDMLink',
+    'QAMModem',
+    'QPSK_TABLE',
+    'StreamingCPCorrelator',
+    'cp_metric',
+    'estimation_matrix',
+    'linear_interp_matrix',
+    'symbol_sync',
+]
@@ -0,0 +1,178 @@
+"""
+Множители антенных решёток (лабораторные работы №9-11).
+
+Для равномерной эквидистантной решётки сумма по элементам — ядро Дирихле
+
+    sum_{n<N} exp(1j*n*psi) = exp(1j*(N-1)*psi/2) * sin(N*psi/2) / sin(psi/2),
+
+поэтому линейная и (разделимая) планарная решётки считаются без тензора
+(углы x элементы): память O(N_theta * N_phi) вместо O(N_theta * N_phi * N).
+
+Для произвольного амплитудно-фазового распределения w (Nv, Nh) множитель
+AF(psi_v, psi_h) = sum w[m, n] exp(1j*(m*psi_v + n*psi_h)) на сетке
+psi = 2*pi*k/P — это двумерное ОБПФ дополненных нулями весов. Сетка по psi
+строится один раз (для весов и P), а значения для любых углов и
+направлений луча берутся билинейной интерполяцией по периодической сетке.
+
+Результаты кэшируются по (геометрия, направление луча, сетка углов), так
+что повторные вызовы при переборе направлений и размеров почти бесплатны.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+
+# Число хранимых результатов в кэше диаграмм
+CACHE_SIZE = 64
+
+_cache: OrderedDict = OrderedDict()
+
+
+def _array_key(a) -> tuple:
+    a = np.ascontiguousarray(a)
+    return a.shape, a.dtype.str, hashlib.blake2b(a.tobytes(), digest_size=16).hexdigest()
+
+
+def _cached(key, compute):
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    value = compute()
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    else:
+        for item in value:
+            item.setflags(write=False)
+    _cache[key] = value
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return value
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def dirichlet(psi: np.ndarray, N: int) -> np.ndarray:
+    """sum_{n<N} exp(1j*n*psi) в замкнутой форме (в нулях знаменателя — предел)."""
+    psi = np.asarray(psi, dtype=float)
+    half = psi / 2
+    den = np.sin(half)
+    singular = np.abs(den) < 1e-12
+    ratio = np.where(singular, N * np.cos(N * half) / np.where(singular, np.cos(half), 1.0),
+                     np.sin(N * half) / np.where(singular, 1.0, den))
+    return np.exp(1j * (N - 1) * half) * ratio
+
+
+def linear_af(theta_deg, N: int, d_lambda: float, theta0_deg: float = 0.0) -> np.ndarray:
+    """Множитель линейной решётки: psi = 2*pi*d*(sin(theta) - sin(theta0))."""
+    theta = np.deg2rad(np.asarray(theta_deg, dtype=float))
+    psi = 2 * np.pi * d_lambda * (np.sin(theta) - np.sin(np.deg2rad(theta0_deg)))
+    return dirichlet(psi, N)
+
+
+def planar_psi(theta_deg, phi_deg, dv_lambda: float, dh_lambda: float,
+               theta0_deg: float = 0.0, phi0_deg: float = 0.0):
+    """Фазовые набеги на элемент по вертикали (ось z) и горизонтали (ось y)."""
+    theta = np.deg2rad(np.asarray(theta_deg, dtype=float))
+    phi = np.deg2rad(np.asarray(phi_deg, dtype=float))
+    theta0, phi0 = np.deg2rad(theta0_deg), np.deg2rad(phi0_deg)
+    psi_v = 2 * np.pi * dv_lambda * (np.cos(theta) - np.cos(theta0))
+    psi_h = 2 * np.pi * dh_lambda * (np.sin(theta) * np.sin(phi) - np.sin(theta0) * np.sin(phi0))
+    return psi_v, psi_h
+
+
+def planar_af(theta_deg, phi_deg, Nv: int, Nh: int, dv_lambda: float, dh_lambda: float,
+              theta0_deg: float = 0.0, phi0_deg: float = 0.0, cache: bool = True):
+    """Разделимый множитель равномерной планарной решётки: (af_v, af_h), AF = af_v * af_h."""
+    def compute():
+        psi_v, psi_h = planar_psi(theta_deg, phi_deg, dv_lambda, dh_lambda, theta0_deg, phi0_deg)
+        return dirichlet(psi_v, Nv), dirichlet(psi_h, Nh)
+
+    if not cache:
+        return compute()
+    key = ('planar', Nv, Nh, float(dv_lambda), float(dh_lambda), float(theta0_deg), float(phi0_deg),
+           _array_key(theta_deg), _array_key(phi_deg))
+    return _cached(key, compute)
+
+
+def taper(N: int, kind: str = 'uniform', sidelobe_db: float = 30.0) -> np.ndarray:
+    """Амплитудное распределение по N элементам (максимум 1)."""
+    if kind == 'uniform':
+        w = np.ones(N)
+    elif kind == 'hann':
+        w = np.hanning(N + 2)[1:-1]
+    elif kind == 'hamming':
+        w = np.hamming(N)
+    elif kind in ('taylor', 'chebwin'):
+        from scipy.signal import windows
+
+        w = windows.taylor(N, sll=sidelobe_db) if kind == 'taylor' else windows.chebwin(N, at=sidelobe_db)
+    else:
+        raise ValueError(f"Неизвестное распределение: {kind}")
+    return w / np.max(w)
+
+
+def af_grid(weights: np.ndarray, fft_size=(512, 512)) -> np.ndarray:
+    """AF на сетке psi = 2*pi*k/P по обеим осям: ОБПФ весов, дополненных нулями (кэшируется)."""
+    weights = np.asarray(weights, dtype=complex)
+    Pv, Ph = fft_size
+    if weights.shape[0] > Pv or weights.shape[1] > Ph:
+        raise ValueError("Размер БПФ меньше размера решётки")
+    key = ('grid', _array_key(weights), Pv, Ph)
+    return _cached(key, lambda: np.fft.ifft2(weights, s=(Pv, Ph)) * (Pv * Ph))
+
+
+def _sample_periodic(grid: np.ndarray, psi_v: np.ndarray, psi_h: np.ndarray) -> np.ndarray:
+    """Билинейная интерполяция периодической по 2*pi сетки grid в точках (psi_v, psi_h)."""
+    Pv, Ph = grid.shape
+    u = np.mod(psi_v / (2 * np.pi) * Pv, Pv)
+    v = np.mod(psi_h / (2 * np.pi) * Ph, Ph)
+    i0 = np.floor(u).astype(np.intp)
+    j0 = np.floor(v).astype(np.intp)
+    fu, fv = u - i0, v - j0
+    i0 %= Pv
+    j0 %= Ph
+    i1, j1 = (i0 + 1) % Pv, (j0 + 1) % Ph
+    return ((1 - fu) * (1 - fv) * grid[i0, j0] + fu * (1 - fv) * grid[i1, j0]
+            + (1 - fu) * fv * grid[i0, j1] + fu * fv * grid[i1, j1])
+
+
+def planar_af_weighted(theta_deg, phi_deg, weights: np.ndarray, dv_lambda: float, dh_lambda: float,
+                       theta0_deg: float = 0.0, phi0_deg: float = 0.0, fft_size=(512, 512),
+                       cache: bool = True) -> np.ndarray:
+    """AF планарной решётки с произвольными весами weights (Nv, Nh) через двумерное БПФ.
+
+    Направление луча сдвигает psi, поэтому сетка БПФ одна на все направления.
+    """
+    def compute():
+        grid = af_grid(weights, fft_size)
+        psi_v, psi_h = planar_psi(theta_deg, phi_deg, dv_lambda, dh_lambda, theta0_deg, phi0_deg)
+        return _sample_periodic(grid, psi_v, psi_h)
+
+    if not cache:
+        return compute()
+    key = ('weighted', _array_key(weights), tuple(fft_size), float(dv_lambda), float(dh_lambda),
+           float(theta0_deg), float(phi0_deg), _array_key(theta_deg), _array_key(phi_deg))
+    return _cached(key, compute)
+
+
+def planar_af_direct(theta_deg, phi_deg, weights: np.ndarray, dv_lambda: float, dh_lambda: float,
+                     theta0_deg: float = 0.0, phi0_deg: float = 0.0, block: Optional[int] = 4096) -> np.ndarray:
+    """Прямая сумма по элементам (эталон для проверки), блоками по block углов."""
+    weights = np.asarray(weights, dtype=complex)
+    psi_v, psi_h = planar_psi(theta_deg, phi_deg, dv_lambda, dh_lambda, theta0_deg, phi0_deg)
+    shape = np.broadcast(psi_v, psi_h).shape
+    psi_v = np.broadcast_to(psi_v, shape).ravel()
+    psi_h = np.broadcast_to(psi_h, shape).ravel()
+    m = np.arange(weights.shape[0])
+    n = np.arange(weights.shape[1])
+    af = np.empty(len(psi_v), dtype=complex)
+    for start in range(0, len(psi_v), block):
+        ev = np.exp(1j * np.outer(psi_v[start:start + block], m))
+        eh = np.exp(1j * np.outer(psi_h[start:start + block], n))
+        af[start:start + block] = np.einsum('km,mn,kn->k', ev, weights, eh)
+    return af.reshape(shape)
@@ -0,0 +1,107 @@
+"""
+Формирование луча на приёме: MRC и SVD-формирование (лабораторные работы №10 и №11).
+
+Геометрический канал из Np лучей
+
+    H = sum_l alpha_l a_r(theta_r,l) a_t(theta_t,l)^H = A_r diag(alpha) A_t^H
+
+считается одним матричным произведением матриц управляющих векторов.
+
+Моделирование сложения z = w^T r, r = h s + n, для набора конфигураций
+(вектор канала h_c и весовой вектор w_c, число элементов может различаться)
+и всех SNR за один проход:
+
+ - конфигурации дополняются нулями до наибольшего числа элементов, так что
+   проекция шума W n — одно матричное произведение на блок;
+ - шум единичной дисперсии генерируется один раз на блок и лишь
+   масштабируется для каждой точки SNR (sigma_c,s = sqrt(P_c / SNR_s));
+ - символы обрабатываются блоками по block_size, память не зависит от
+   длины моделирования.
+
+SNR, как в лабораторных, — отношение средней мощности сигнала на элементе
+АР к дисперсии шума на элементе.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .modem import QAMModem
+
+
+def steering_matrix(N: int, angles_deg, d_lambda: float = 0.5, normalize: bool = False) -> np.ndarray:
+    """Управляющие векторы линейной АР для углов angles_deg: (N, число углов).
+
+    Элемент n: exp(-1j * 2*pi * d * n * sin(theta)); normalize=True делит на sqrt(N).
+    """
+    theta = np.deg2rad(np.atleast_1d(np.asarray(angles_deg, dtype=float)))
+    n = np.arange(N)[:, None]
+    A = np.exp(-1j * 2 * np.pi * d_lambda * n * np.sin(theta))
+    return A / np.sqrt(N) if normalize else A
+
+
+def geometric_channel(Nr: int, Nt: int, rx_angles_deg, tx_angles_deg, alphas,
+                      d_lambda: float = 0.5, normalize: bool = True) -> np.ndarray:
+    """Матрица канала (Nr, Nt) из лучей с углами прихода/ухода и комплексными амплитудами alphas."""
+    Ar = steering_matrix(Nr, rx_angles_deg, d_lambda, normalize)
+    At = steering_matrix(Nt, tx_angles_deg, d_lambda, normalize)
+    return (Ar * np.asarray(alphas)) @ At.conj().T
+
+
+def _pad(vectors: Sequence[np.ndarray]) -> np.ndarray:
+    size = max(len(v) for v in vectors)
+    out = np.zeros((len(vectors), size), dtype=complex)
+    for c, v in enumerate(vectors):
+        out[c, :len(v)] = v
+    return out
+
+
+def combining_error_rates(channels: Sequence[np.ndarray], weights: Sequence[np.ndarray], snr_dbs,
+                          num_symbols: int, modem: Optional[QAMModem] = None, block_size: int = 1 << 15,
+                          seed: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+    """SER и BER схем сложения z = w_c^T r для всех конфигураций c и точек SNR.
+
+    channels[c] — эффективный вектор канала на элементах АР (N_c,), weights[c] —
+    весовой вектор той же длины (для одной антенны — единичный орт). modem=None —
+    BPSK (символы ±1). Решение принимается после деления z на усиление w_c^T h_c.
+    Возвращает (SER, BER) формы (конфигурации, SNR).
+    """
+    if len(channels) != len(weights):
+        raise ValueError("Число векторов канала и весовых векторов различается")
+    H = _pad([np.asarray(h) for h in channels])
+    W = _pad([np.asarray(w) for w in weights])
+    sizes = np.array([len(h) for h in channels])
+    snr = 10 ** (np.asarray(list(snr_dbs), dtype=float) / 10)
+
+    if modem is None:
+        order, constellation, bits_per_symbol = 2, np.array([1.0, -1.0]), 1
+        bit_errors = np.array([0, 1])
+    else:
+        order, constellation, bits_per_symbol = modem.order, modem.constellation, modem.bits_per_symbol
+        # Число различающихся бит для индексов i ^ j
+        bit_errors = modem.bit_table.sum(axis=1)
+    symbol_power = np.mean(np.abs(constellation) ** 2)
+
+    gain = np.sum(W * H, axis=1)                                             # (C,)
+    signal_power = symbol_power * np.sum(np.abs(H) ** 2, axis=1) / sizes     # (C,)
+    # Шум после сложения и выравнивания: (sigma / gain) * (w^T n), n ~ CN(0, 1)
+    noise_scale = np.sqrt(signal_power[:, None] / snr[None, :]) / gain[:, None]  # (C, S)
+
+    rng = np.random.default_rng(seed)
+    symbol_err = np.zeros(noise_scale.shape, dtype=np.int64)
+    bit_err = np.zeros(noise_scale.shape, dtype=np.int64)
+    for start in range(0, num_symbols, block_size):
+        count = min(block_size, num_symbols - start)
+        tx = rng.integers(0, order, count)
+        noise = (rng.standard_normal((H.shape[1], count))
+                 + 1j * rng.standard_normal((H.shape[1], count))) / np.sqrt(2)
+        projected = W @ noise                                                # (C, B)
+        z = constellation[tx] + noise_scale[:, :, None] * projected[:, None, :]  # (C, S, B)
+        if modem is None:
+            rx = (z.real < 0).view(np.int8)
+        else:
+            rx = modem.hard_indices(z)
+        diff = rx ^ tx
+        symbol_err += np.count_nonzero(diff, axis=-1)
+        bit_err += bit_errors[diff].sum(axis=-1)
+    return symbol_err / num_symbols, bit_err / (num_symbols * bits_per_symbol)
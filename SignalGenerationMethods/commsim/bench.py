@@ -0,0 +1,184 @@
+"""
+Сравнение прежней символьной синхронизации лабораторной работы №8 с commsim.sync.
+
+Запуск (из каталога SignalGenerationMethods):
+
+    python -m commsim.bench
+    python -m commsim.bench --symbols 100 1000 10000 --snr 20
+
+Для каждой длины записи (в OFDM-символах) замеряются:
+  * symbol_sync — прежний цикл по смещениям окна поиска против
+    commsim.sync.symbol_sync (метрика считается один раз для всего буфера);
+  * полная метрика — прежняя формула для каждого смещения буфера против
+    cp_metric и StreamingCPCorrelator (порции по --chunk отсчётов).
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from .ofdm import OFDMLink
+from .sync import StreamingCPCorrelator, cp_metric, symbol_sync
+
+
+def legacy_cp_metric(y, N, N_g, start_pos, end_pos):
+    """Метрика прежней symbol_sync: суммы по окну заново для каждого смещения."""
+    cc = np.zeros(end_pos - start_pos, dtype=float)
+    for d in range(start_pos, end_pos):
+        W1 = y[d:d + N_g]
+        W2 = y[d + N:d + N + N_g]
+        C = np.sum(W1 * np.conj(W2))
+        E1 = np.sum(np.abs(W1) ** 2)
+        E2 = np.sum(np.abs(W2) ** 2)
+        cc[d - start_pos] = np.abs(C) / np.sqrt(E1 * E2) if E1 * E2 > 0 else 0
+    return cc
+
+
+def legacy_symbol_sync(y, N, N_g, symbol_length, num_symbols, search_window=None, threshold=0.65):
+    """symbol_sync лабораторной работы №8 до перехода на commsim.sync (без изменений, кроме параметров)."""
+    len_y = len(y)
+    symbol_starts = []
+    cc_all = []
+    d_max_all = []
+
+    expected_positions = []
+    for i in range(num_symbols):
+        expected_pos = i * symbol_length
+        expected_positions.append(expected_pos)
+
+    if search_window is None:
+        search_window = N_g * 2
+
+    for expected_pos in expected_positions:
+        start_pos = max(0, expected_pos - search_window)
+        end_pos = min(len_y - N - N_g, expected_pos + search_window)
+
+        if end_pos <= start_pos:
+            continue
+
+        cc = np.zeros(end_pos - start_pos, dtype=float)
+
+        for d in range(start_pos, end_pos):
+            if d + N + N_g >= len_y:
+                continue
+
+            W1 = y[d:d + N_g]
+            W2 = y[d + N:d + N + N_g]
+            C = np.sum(W1 * np.conj(W2))
+            E1 = np.sum(np.abs(W1)**2)
+            E2 = np.sum(np.abs(W2)**2)
+            cc_index = d - start_pos
+            cc[cc_index] = np.abs(C) / np.sqrt(E1 * E2) if E1 * E2 > 0 else 0
+
+        if len(cc) > 0:
+            max_index = np.argmax(cc)
+            max_value = cc[max_index]
+
+            if max_value > threshold:
+                d_max = start_pos + max_index
+                symbol_start = d_max + N_g
+
+                is_duplicate = False
+                for existing_start in symbol_starts:
+                    if abs(symbol_start - existing_start) < N_g:
+                        is_duplicate = True
+                        break
+
+                if not is_duplicate:
+                    symbol_starts.append(symbol_start)
+                    d_max_all.append(d_max)
+                    cc_all.append(cc)
+
+    if len(symbol_starts) < num_symbols:
+        if len(symbol_starts) >= 2:
+            intervals = [symbol_starts[i+1] - symbol_starts[i] for i in range(len(symbol_starts)-1)]
+            mean_interval = int(np.mean(intervals))
+
+            base_start = symbol_starts[0]
+            existing_starts = set(symbol_starts)
+
+            for i in range(num_symbols):
+                estimated_pos = base_start + i * mean_interval
+                estimated_d_max = estimated_pos - N_g
+
+                if all(abs(estimated_pos - existing) > N_g for existing in existing_starts):
+                    symbol_starts.append(estimated_pos)
+                    d_max_all.append(estimated_d_max)
+                    dummy_cc = np.zeros(N_g * 2)
+                    dummy_cc[N_g] = 0.6
+                    cc_all.append(dummy_cc)
+
+            combined = list(zip(symbol_starts, d_max_all, cc_all))
+            combined.sort(key=lambda x: x[0])
+            symbol_starts = [item[0] for item in combined]
+            d_max_all = [item[1] for item in combined]
+            cc_all = [item[2] for item in combined]
+
+            symbol_starts = symbol_starts[:num_symbols]
+            d_max_all = d_max_all[:num_symbols]
+            cc_all = cc_all[:num_symbols]
+
+    return symbol_starts, cc_all, d_max_all
+
+
+def capture(num_symbols: int, snr_db: float, seed: int = 0) -> np.ndarray:
+    """Запись OFDM-сигнала из num_symbols символов после канала лабораторной №8."""
+    link = OFDMLink(num_symbols=num_symbols)
+    bits, noise = link._draw(seed, range(1))
+    return link.channel(link.transmit(bits), snr_db, noise)[0]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run(symbols_list: list[int], snr_db: float = 20, chunk: int = 4096, full_limit: int = 2000):
+    N, N_g = 64, 16
+    symbol_length = N + N_g
+    header = (f"{'символов':>9} | {'отсчётов':>9} | {'тест':<14} | {'прежняя, с':>11} | "
+              f"{'commsim, с':>11} | {'поток, с':>9} | {'ускорение':>9}")
+    print(header)
+    print('-' * len(header))
+    for num_symbols in symbols_list:
+        y = capture(num_symbols, snr_db)
+
+        (old_starts, _, _), old_time = timed(legacy_symbol_sync, y, N, N_g, symbol_length, num_symbols)
+        (new_starts, _, _), new_time = timed(symbol_sync, y, N, N_g, symbol_length, num_symbols)
+        status = '' if new_starts == old_starts else '  (начала символов не совпали)'
+        print(f"{num_symbols:>9} | {len(y):>9} | {'symbol_sync':<14} | {old_time:>11.4f} | "
+              f"{new_time:>11.4f} | {'-':>9} | {old_time / new_time:>8.1f}x{status}")
+
+        metric, new_time = timed(cp_metric, y, N, N_g)
+
+        def stream():
+            correlator = StreamingCPCorrelator(N, N_g)
+            return np.concatenate([correlator.push(y[i:i + chunk])[1] for i in range(0, len(y), chunk)])
+
+        streamed, stream_time = timed(stream)
+        if not np.allclose(streamed[:len(metric)], metric):
+            print("Потоковая метрика не совпала с cp_metric")
+        if num_symbols <= full_limit:
+            old_metric, old_time = timed(legacy_cp_metric, y, N, N_g, 0, len(y) - N - N_g)
+            error = np.max(np.abs(old_metric - metric))
+            old_cell = f"{old_time:>11.4f}"
+            speedup = f"{old_time / new_time:>8.1f}x  (макс. расхождение {error:.1e})"
+        else:
+            old_cell, speedup = f"{'-':>11}", f"{'-':>9}"
+        print(f"{num_symbols:>9} | {len(y):>9} | {'полная метрика':<14} | {old_cell} | "
+              f"{new_time:>11.4f} | {stream_time:>9.4f} | {speedup}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Бенчмарк символьной синхронизации OFDM по CP")
+    parser.add_argument('--symbols', type=int, nargs='+', default=[20, 200, 2000],
+                        help='Длины записей в OFDM-символах')
+    parser.add_argument('--snr', type=float, default=20, help='SNR канала, дБ')
+    parser.add_argument('--chunk', type=int, default=4096, help='Размер порции для потоковой метрики')
+    parser.add_argument('--full-limit', type=int, default=2000,
+                        help='Наибольшая длина (в символах), для которой прежняя метрика считается по всему буферу')
+    args = parser.parse_args()
+
+    run(args.symbols, args.snr, args.chunk, args.full_limit)
@@ -0,0 +1,147 @@
+"""
+Оценка канала OFDM по пилотным поднесущим.
+
+Любой из методов — LS с удержанием ближайшего пилота, линейная и
+кубическая сплайн-интерполяция, LMMSE — линеен по LS-оценкам на пилотах:
+H = H_pilots @ W.T, где W — матрица весов (K, P). Поэтому W строится один
+раз для расположения пилотов (и кэшируется), а оценка пачки символов
+(..., K) сводится к одному матричному умножению.
+
+Для LMMSE W = R_hp (R_pp + I / SNR)^(-1), где R — частотная корреляция
+канала с экспоненциальным профилем задержек:
+
+    r(dk) = 1 / (1 + 2j*pi * tau * dk / K),
+
+tau — среднеквадратичная задержка в отсчётах. Матрица кэшируется по
+(пилоты, K, tau, SNR).
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+
+MODES = ('ls', 'linear', 'spline', 'lmmse')
+
+
+def linear_interp_matrix(pilot_carriers: np.ndarray, num_carriers: int) -> np.ndarray:
+    """Матрица W (num_carriers, P) линейной интерполяции: значения на всех поднесущих = W @ значения на пилотах.
+
+    Совпадает с scipy.interpolate.interp1d(kind='linear') на отрезке пилотов,
+    за его пределами — линейная экстраполяция по крайним пилотам.
+    """
+    pilot_carriers = np.asarray(pilot_carriers)
+    k = np.arange(num_carriers)
+    j = np.clip(np.searchsorted(pilot_carriers, k, side='right') - 1, 0, len(pilot_carriers) - 2)
+    x0, x1 = pilot_carriers[j], pilot_carriers[j + 1]
+    t = (k - x0) / (x1 - x0)
+    W = np.zeros((num_carriers, len(pilot_carriers)))
+    W[k, j] = 1 - t
+    W[k, j + 1] = t
+    return W
+
+
+def nearest_pilot_matrix(pilot_carriers: np.ndarray, num_carriers: int) -> np.ndarray:
+    """Матрица W, повторяющая на каждой поднесущей LS-оценку ближайшего пилота."""
+    pilot_carriers = np.asarray(pilot_carriers)
+    k = np.arange(num_carriers)
+    nearest = np.abs(k[:, None] - pilot_carriers[None, :]).argmin(axis=1)
+    W = np.zeros((num_carriers, len(pilot_carriers)))
+    W[k, nearest] = 1
+    return W
+
+
+def spline_interp_matrix(pilot_carriers: np.ndarray, num_carriers: int) -> np.ndarray:
+    """Матрица W кубического сплайна (not-a-knot): сплайн линеен по значениям в узлах."""
+    from scipy.interpolate import CubicSpline
+
+    pilot_carriers = np.asarray(pilot_carriers)
+    basis = CubicSpline(pilot_carriers, np.eye(len(pilot_carriers)), axis=0)
+    return basis(np.arange(num_carriers))
+
+
+def frequency_correlation(carriers_a: np.ndarray, carriers_b: np.ndarray, num_carriers: int,
+                          delay_spread: float) -> np.ndarray:
+    """Корреляция канала между поднесущими для экспоненциального профиля задержек."""
+    dk = np.subtract.outer(np.asarray(carriers_a), np.asarray(carriers_b))
+    return 1 / (1 + 2j * np.pi * delay_spread * dk / num_carriers)
+
+
+def lmmse_matrix(pilot_carriers: np.ndarray, num_carriers: int, delay_spread: float, snr_db: float) -> np.ndarray:
+    """Матрица W LMMSE-сглаживания LS-оценок на пилотах."""
+    pilot_carriers = np.asarray(pilot_carriers)
+    R_hp = frequency_correlation(np.arange(num_carriers), pilot_carriers, num_carriers, delay_spread)
+    R_pp = frequency_correlation(pilot_carriers, pilot_carriers, num_carriers, delay_spread)
+    snr = 10 ** (snr_db / 10)
+    # W = R_hp (R_pp + I/SNR)^(-1) через решение системы вместо обращения
+    return np.linalg.solve((R_pp + np.eye(len(pilot_carriers)) / snr).T, R_hp.T).T
+
+
+@lru_cache(maxsize=64)
+def _weights(mode: str, pilots: tuple, num_carriers: int, delay_spread: Optional[float],
+             snr_db: Optional[float]) -> np.ndarray:
+    pilots = np.array(pilots)
+    if mode == 'ls':
+        W = nearest_pilot_matrix(pilots, num_carriers)
+    elif mode == 'linear':
+        W = linear_interp_matrix(pilots, num_carriers)
+    elif mode == 'spline':
+        W = spline_interp_matrix(pilots, num_carriers)
+    else:
+        W = lmmse_matrix(pilots, num_carriers, delay_spread, snr_db)
+    W.setflags(write=False)
+    return W
+
+
+def estimation_matrix(pilot_carriers, num_carriers: int, mode: str = 'linear',
+                      delay_spread: Optional[float] = None, snr_db: Optional[float] = None) -> np.ndarray:
+    """Кэшированная матрица весов (num_carriers, P) для заданного метода и расположения пилотов."""
+    if mode not in MODES:
+        raise ValueError(f"Неизвестный метод оценки канала: {mode}")
+    if mode == 'lmmse':
+        if delay_spread is None or snr_db is None:
+            raise ValueError("Для LMMSE нужны delay_spread и snr_db")
+        delay_spread, snr_db = float(delay_spread), float(snr_db)
+    else:
+        delay_spread = snr_db = None
+    pilots = tuple(int(p) for p in np.asarray(pilot_carriers))
+    return _weights(mode, pilots, int(num_carriers), delay_spread, snr_db)
+
+
+class ChannelEstimator:
+    """Оценка канала для фиксированного расположения пилотов.
+
+    polar=True интерполирует модуль и фазу LS-оценок отдельно (как channelEstimate
+    лабораторной работы №8); для LMMSE всегда используется комплексная оценка.
+    """
+
+    def __init__(self, pilot_carriers, num_carriers: int, pilot_value: complex = 1 + 1j,
+                 mode: str = 'linear', delay_spread: Optional[float] = None, polar: bool = False):
+        self.pilot_carriers = np.asarray(pilot_carriers)
+        self.num_carriers = num_carriers
+        self.pilot_value = pilot_value
+        self.mode = mode
+        self.delay_spread = delay_spread
+        self.polar = polar and mode != 'lmmse'
+        # Проверка метода и заполнение кэша для методов, не зависящих от SNR
+        if mode != 'lmmse':
+            self.weights()
+
+    def weights(self, snr_db: Optional[float] = None) -> np.ndarray:
+        return estimation_matrix(self.pilot_carriers, self.num_carriers, self.mode, self.delay_spread, snr_db)
+
+    def ls(self, Y: np.ndarray) -> np.ndarray:
+        """LS-оценки на пилотах: Y (..., K) -> (..., P)."""
+        return Y[..., self.pilot_carriers] / self.pilot_value
+
+    def interpolate(self, H_pilots: np.ndarray, snr_db: Optional[float] = None) -> np.ndarray:
+        """Оценки на пилотах (..., P) -> оценка канала на всех поднесущих (..., K)."""
+        W = self.weights(snr_db)
+        if self.polar:
+            return (np.abs(H_pilots) @ W.T) * np.exp(1j * (np.angle(H_pilots) @ W.T))
+        return H_pilots @ W.T
+
+    def estimate(self, Y: np.ndarray, snr_db: Optional[float] = None) -> np.ndarray:
+        """Принятые символы в частотной области (..., K) -> оценка канала (..., K)."""
+        return self.interpolate(self.ls(Y), snr_db)
@@ -0,0 +1,132 @@
+"""
+Реализации релеевского замирания: геометрическая модель рассеивателей и сумма синусоид.
+
+ScatteringChannel — сигнал BS -> рассеиватель -> MS для точек трека MS:
+
+    r(n) = sum_i exp(-1j * k * (|BS - SC_i| + |SC_i - MS(n)|)).
+
+Расстояния считаются блоками (точки трека x рассеиватели) с broadcasting;
+размер блока ограничен max_block элементами, так что память не зависит ни
+от длины трека, ни от числа рассеивателей.
+
+SumOfSinusoids — замирание с доплеровским спектром Кларка напрямую по
+частоте Доплера: модель Чжэна-Сяо (случайные углы и фазы, статистически
+точная) или классическая детерминированная модель Джейкса.
+
+Обе модели умеют samples(start, count) для произвольного отрезка и
+blocks(block_size, total) — генератор последовательных блоков для
+длинных моделирований без хранения всей реализации.
+"""
+
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+# Наибольшее число элементов (точки трека x рассеиватели) в одном блоке
+MAX_BLOCK = 1 << 20
+
+
+class _BlockStream:
+    """Общий генератор блоков поверх samples(start, count)."""
+
+    def samples(self, start: int, count: int) -> np.ndarray:
+        raise NotImplementedError
+
+    def blocks(self, block_size: int = 65536, total: Optional[int] = None, start: int = 0) -> Iterator[np.ndarray]:
+        """Последовательные блоки по block_size отсчётов; total=None — бесконечный поток."""
+        position = start
+        end = None if total is None else start + total
+        while end is None or position < end:
+            count = block_size if end is None else min(block_size, end - position)
+            yield self.samples(position, count)
+            position += count
+
+
+class ScatteringChannel(_BlockStream):
+    """Канал с точечными рассеивателями для MS, движущейся по прямой.
+
+    bs — координаты BS (2,), scatterers — (Nsc, 2), wavelength — длина волны;
+    точка трека n: start + n * step * (cos(direction), sin(direction)).
+    """
+
+    def __init__(self, bs, scatterers, wavelength: float, step: float, start=(0.0, 0.0),
+                 direction: float = 0.0, max_block: int = MAX_BLOCK):
+        self.bs = np.asarray(bs, dtype=float)
+        self.scatterers = np.asarray(scatterers, dtype=float)
+        self.k = 2 * np.pi / wavelength
+        self.step = step
+        self.start = np.asarray(start, dtype=float)
+        self.velocity_dir = np.array([np.cos(direction), np.sin(direction)])
+        self.max_block = max_block
+        # Фаза пути BS -> рассеиватель постоянна: exp(-1j*k*d_BS) считается один раз
+        self.bs_phase = np.exp(-1j * self.k * np.linalg.norm(self.bs - self.scatterers, axis=1))
+
+    def track(self, start: int, count: int) -> np.ndarray:
+        """Координаты точек трека start ... start + count - 1: (count, 2)."""
+        n = np.arange(start, start + count)
+        return self.start + np.outer(n * self.step, self.velocity_dir)
+
+    def response(self, points: np.ndarray) -> np.ndarray:
+        """Сигнал в произвольных точках (N, 2): блоки (точки x рассеиватели) не больше max_block."""
+        points = np.asarray(points, dtype=float)
+        num_sc = len(self.scatterers)
+        sc_block = min(num_sc, self.max_block)
+        pt_block = max(1, self.max_block // sc_block)
+        r = np.zeros(len(points), dtype=complex)
+        for p0 in range(0, len(points), pt_block):
+            px = points[p0:p0 + pt_block, 0:1]
+            py = points[p0:p0 + pt_block, 1:2]
+            for s0 in range(0, num_sc, sc_block):
+                sc = self.scatterers[s0:s0 + sc_block]
+                d = np.hypot(sc[:, 0] - px, sc[:, 1] - py)
+                r[p0:p0 + pt_block] += np.exp(-1j * self.k * d) @ self.bs_phase[s0:s0 + sc_block]
+        return r
+
+    def samples(self, start: int, count: int) -> np.ndarray:
+        return self.response(self.track(start, count))
+
+
+class SumOfSinusoids(_BlockStream):
+    """Релеевское замирание суммой num_sinusoids синусоид с единичной средней мощностью.
+
+    doppler — максимальная частота Доплера, Гц; fs — частота дискретизации, Гц.
+    method='zheng' — модель Чжэна-Сяо со случайными углами прихода и фазами
+    (seed задаёт реализацию), 'jakes' — детерминированная модель Джейкса.
+    """
+
+    def __init__(self, doppler: float, fs: float, num_sinusoids: int = 16, method: str = 'zheng',
+                 seed: Optional[int] = None):
+        self.doppler = doppler
+        self.fs = fs
+        self.method = method
+        M = num_sinusoids
+        wd = 2 * np.pi * doppler
+        n = np.arange(1, M + 1)
+        if method == 'zheng':
+            rng = np.random.default_rng(seed)
+            theta = rng.uniform(-np.pi, np.pi)
+            alpha = (2 * np.pi * n - np.pi + theta) / (4 * M)
+            self.w_i = wd * np.cos(alpha)
+            self.w_q = wd * np.sin(alpha)
+            self.phi_i = rng.uniform(-np.pi, np.pi, M)
+            self.phi_q = rng.uniform(-np.pi, np.pi, M)
+            # sqrt(2/M) даёт единичную мощность каждой квадратуры
+            self.gain_i = self.gain_q = np.full(M, np.sqrt(2 / M) / np.sqrt(2))
+        elif method == 'jakes':
+            N = 4 * M + 2
+            beta = np.pi * n / M
+            w = np.append(wd * np.cos(2 * np.pi * n / N), wd)
+            norm = np.sqrt(2 * M + 1)
+            self.w_i = self.w_q = w
+            self.phi_i = self.phi_q = np.zeros(M + 1)
+            self.gain_i = np.append(2 * np.cos(beta), np.sqrt(2)) / norm
+            self.gain_q = np.append(2 * np.sin(beta), 0.0) / norm
+        else:
+            raise ValueError(f"Неизвестная модель суммы синусоид: {method}")
+
+    def samples(self, start: int, count: int) -> np.ndarray:
+        t = np.arange(start, start + count)[:, None] / self.fs
+        h_i = np.cos(t * self.w_i + self.phi_i) @ self.gain_i
+        h_q = np.cos(t * self.w_q + self.phi_q) @ self.gain_q
+        return h_i + 1j * h_q
@@ -0,0 +1,144 @@
+"""
+Приём MIMO: SVD-передача, ZF и MMSE для пачки каналов (..., Nr, Nt).
+
+Все детекторы выражаются через одно SVD-разложение H = U S V^H:
+
+    SVD:  x = V_r s  ->  s_hat = diag(1/S) U^H y,
+    ZF:   W = pinv(H) = V diag(1/S) U^H,
+    MMSE: W = (H^H H + sigma^2 I)^(-1) H^H = V diag(S / (S^2 + sigma^2)) U^H,
+
+поэтому np.linalg.svd вызывается один раз для всех каналов, а MMSE для
+каждого SNR — только другое диагональное масштабирование (без inv на
+каждую точку). Проекция z = U^H y и единичный шум считаются один раз,
+для точки SNR шум лишь умножается на sigma.
+"""
+
+import time
+from typing import Optional
+
+import numpy as np
+
+from .modem import QAMModem
+
+
+DETECTORS = ('SVD', 'ZF', 'MMSE')
+
+
+def stack_channels(H_full: np.ndarray, Nr: int, Nt: int) -> np.ndarray:
+    """Массив канала (Nr_all, Nt_all, поднесущие, снимки) -> пачка (снимки * поднесущие, Nr, Nt).
+
+    Каждая матрица нормируется так, что ||H||_F^2 = Nr * Nt (как в лабораторной работе №13).
+    """
+    H = np.asarray(H_full)[:Nr, :Nt]
+    if H.ndim == 2:
+        H = H[:, :, None]
+    H = np.moveaxis(H.reshape(Nr, Nt, -1), -1, 0)
+    norms = np.linalg.norm(H, axis=(-2, -1), keepdims=True)
+    return H / norms * np.sqrt(Nr * Nt)
+
+
+def mmse_from_svd(U: np.ndarray, S: np.ndarray, Vh: np.ndarray, noise_var) -> np.ndarray:
+    """Матрица MMSE (..., Nt, Nr) из готового SVD-разложения канала."""
+    k = S.shape[-1]
+    gain = S / (S ** 2 + np.asarray(noise_var)[..., None])
+    V = Vh[..., :k, :].conj().swapaxes(-1, -2)
+    return (V * gain[..., None, :]) @ U[..., :, :k].conj().swapaxes(-1, -2)
+
+
+def detector_ser(H: np.ndarray, snr_dbs, num_vectors: int = 256, seed: int = 0, batch: int = 1024,
+                 modem: Optional[QAMModem] = None) -> tuple[dict, dict]:
+    """SER детекторов SVD, ZF и MMSE по всем каналам пачки H (B, Nr, Nt).
+
+    Для каждого канала передаются num_vectors векторов символов; SNR — отношение
+    средней мощности на приёмной антенне к дисперсии шума. Возвращает
+    ({детектор: массив SER по snr_dbs}, {этап: время, с}).
+    """
+    modem = modem or QAMModem(4, unit_power=True)
+    snr_dbs = np.asarray(list(snr_dbs), dtype=float)
+    B, Nr, Nt = H.shape
+    streams = min(Nr, Nt)
+    rng = np.random.default_rng(seed)
+
+    errors = {name: np.zeros(len(snr_dbs)) for name in DETECTORS}
+    timing = {'svd': 0.0, 'signal': 0.0, **{name: 0.0 for name in DETECTORS}}
+    for start in range(0, B, batch):
+        Hb = H[start:start + batch]
+        n = len(Hb)
+
+        t0 = time.perf_counter()
+        U, S, Vh = np.linalg.svd(Hb)
+        Uh = U[..., :, :streams].conj().swapaxes(-1, -2)
+        V = Vh.conj().swapaxes(-1, -2)
+        timing['svd'] += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        bits = rng.integers(0, 2, size=(n, streams, num_vectors * modem.bits_per_symbol), dtype=np.int8)
+        x = modem.modulate(bits)
+        tx = modem.hard_indices(x)
+        # Единичный шум: один на все точки SNR, масштабируется sigma
+        noise = rng.standard_normal((2, n, Nr, num_vectors))
+        z_noise = Uh @ (noise[0] + 1j * noise[1]) / np.sqrt(2)
+        # Мощность на приёмной антенне при единичной мощности символов: ||H||_F^2 / Nr
+        rx_power = np.sum(S ** 2, axis=-1) / Nr
+        sigma = np.sqrt(rx_power[:, None] * 10 ** (-snr_dbs / 10))  # (n, SNR)
+        # В базисе U: SVD-передача даёт S * x, прямая передача x (Nt = streams) даёт S V^H x
+        z_svd = S[..., None] * x
+        z_direct = S[..., None] * (Vh[..., :streams, :] @ x) if Nt == streams else None
+        timing['signal'] += time.perf_counter() - t0
+
+        for i in range(len(snr_dbs)):
+            z_n = sigma[:, i, None, None] * z_noise
+
+            t0 = time.perf_counter()
+            s_hat = (z_svd + z_n) / S[..., None]
+            errors['SVD'][i] += np.sum(modem.hard_indices(s_hat) != tx)
+            timing['SVD'] += time.perf_counter() - t0
+
+            if z_direct is None:
+                continue
+            z = z_direct + z_n
+            t0 = time.perf_counter()
+            x_zf = V @ (z / S[..., None])
+            errors['ZF'][i] += np.sum(modem.hard_indices(x_zf) != tx)
+            timing['ZF'] += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            gain = S / (S ** 2 + sigma[:, i, None] ** 2)
+            x_mmse = V @ (gain[..., None] * z)
+            errors['MMSE'][i] += np.sum(modem.hard_indices(x_mmse) != tx)
+            timing['MMSE'] += time.perf_counter() - t0
+
+    total = B * streams * num_vectors
+    ser = {name: errors[name] / total for name in DETECTORS}
+    if Nt != streams:
+        # ZF/MMSE без прекодирования требуют Nt <= Nr
+        del ser['ZF'], ser['MMSE']
+    return ser, timing
+
+
+def legacy_detector_ser(H: np.ndarray, snr_dbs, num_vectors: int = 256, seed: int = 0) -> dict:
+    """Прежняя схема лабораторной: для каждого канала и SNR отдельные svd/pinv/inv (Nt <= Nr)."""
+    modem = QAMModem(4, unit_power=True)
+    rng = np.random.default_rng(seed)
+    snr_dbs = list(snr_dbs)
+    errors = {name: np.zeros(len(snr_dbs)) for name in DETECTORS}
+    for H1 in H:
+        Nr, Nt = H1.shape
+        U, S, Vh = np.linalg.svd(H1)
+        rank = min(Nr, Nt)
+        x = modem.modulate(rng.integers(0, 2, size=(rank, num_vectors * modem.bits_per_symbol)))
+        tx = modem.hard_indices(x)
+        W_zf = np.linalg.pinv(H1)
+        for i, snr in enumerate(snr_dbs):
+            noise_var = np.sum(S ** 2) / Nr * 10 ** (-snr / 10)
+            noise = np.sqrt(noise_var / 2) * (rng.standard_normal((Nr, num_vectors))
+                                              + 1j * rng.standard_normal((Nr, num_vectors)))
+            y_svd = H1 @ (Vh.conj().T[:, :rank] @ x) + noise
+            s_hat = (U.conj().T[:rank] @ y_svd) / S[:rank, None]
+            errors['SVD'][i] += np.sum(modem.hard_indices(s_hat) != tx)
+            y = H1 @ x + noise
+            errors['ZF'][i] += np.sum(modem.hard_indices(W_zf @ y) != tx)
+            W_mmse = np.linalg.inv(H1.conj().T @ H1 + noise_var * np.eye(Nt)) @ H1.conj().T
+            errors['MMSE'][i] += np.sum(modem.hard_indices(W_mmse @ y) != tx)
+    total = len(H) * min(H.shape[1:]) * num_vectors
+    return {name: errors[name] / total for name in DETECTORS}
@@ -0,0 +1,124 @@
+"""
+Квадратурная амплитудная модуляция: QPSK, 16-, 64- и 256-QAM с кодом Грея.
+
+Созвездие хранится массивом constellation, индекс которого — биты символа,
+упакованные в целое (старший бит первым): первая половина бит задаёт
+уровень по I, вторая — по Q. Поэтому отображение бит — одно умножение на
+вектор весов и одна индексация, без кортежей и словарей.
+
+Жёсткое решение для квадратного созвездия не требует матрицы расстояний:
+I и Q независимо округляются к ближайшему уровню ПАМ («нарезка»), а номер
+уровня переводится в биты таблицей. LLR считаются по каждой оси отдельно
+(max-log: разность минимальных квадратов расстояний до уровней с битом 1
+и битом 0); положительный LLR соответствует биту 0.
+
+Для QPSK отображение совпадает с таблицей лабораторной работы №8:
+(0, 0) -> 1+1j, (0, 1) -> 1-1j, (1, 0) -> -1+1j, (1, 1) -> -1-1j.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+MODULATIONS = {'QPSK': 4, '16QAM': 16, '64QAM': 64, '256QAM': 256}
+
+
+class QAMModem:
+    """Модем квадратной QAM порядка order (4, 16, 64 или 256).
+
+    unit_power=True нормирует созвездие к единичной средней мощности
+    (QPSK — (±1 ± 1j)/sqrt(2)), иначе уровни по осям равны ±1, ±3, ...
+    """
+
+    def __init__(self, order: int = 4, unit_power: bool = False):
+        if order not in MODULATIONS.values():
+            raise ValueError(f"Поддерживаются порядки QAM {sorted(MODULATIONS.values())}, получено {order}")
+        self.order = order
+        self.bits_per_symbol = order.bit_length() - 1
+        self.axis_bits = self.bits_per_symbol // 2
+        levels = 1 << self.axis_bits
+
+        # Уровень номер i (сверху вниз) имеет код Грея i ^ (i >> 1)
+        index = np.arange(levels)
+        gray = index ^ (index >> 1)
+        amplitudes = (levels - 1 - 2 * index).astype(float)
+        pam = np.empty(levels)
+        pam[gray] = amplitudes
+        self.scale = 1 / np.sqrt(2 * (levels ** 2 - 1) / 3) if unit_power else 1.0
+        self.levels = amplitudes * self.scale
+        self.gray = gray
+
+        symbols = np.arange(order)
+        self.constellation = self.scale * (pam[symbols >> self.axis_bits] + 1j * pam[symbols & (levels - 1)])
+        shifts = np.arange(self.bits_per_symbol - 1, -1, -1)
+        self.bit_table = ((symbols[:, None] >> shifts) & 1).astype(np.int8)
+        self.weights = 1 << shifts
+        # Биты кода Грея каждого уровня оси: (levels, axis_bits)
+        self.level_bits = (gray[:, None] >> np.arange(self.axis_bits - 1, -1, -1)) & 1
+
+    @classmethod
+    def named(cls, name: str, unit_power: bool = False) -> 'QAMModem':
+        """Модем по названию: 'QPSK', '16QAM', '64QAM', '256QAM'."""
+        try:
+            return cls(MODULATIONS[name.upper()], unit_power)
+        except KeyError:
+            raise ValueError(f"Неизвестная модуляция: {name}") from None
+
+    def indices(self, bits: np.ndarray) -> np.ndarray:
+        """Биты (..., n * bits_per_symbol) -> индексы символов (..., n)."""
+        bits = np.asarray(bits)
+        groups = bits.reshape(bits.shape[:-1] + (-1, self.bits_per_symbol))
+        return groups @ self.weights
+
+    def modulate(self, bits: np.ndarray) -> np.ndarray:
+        """Биты (..., n * bits_per_symbol) -> символы (..., n)."""
+        return self.constellation[self.indices(bits)]
+
+    def _axis_levels(self, x: np.ndarray) -> np.ndarray:
+        """Номер ближайшего уровня ПАМ (0 — верхний) для координаты x; граница относится к верхнему."""
+        levels = len(self.levels)
+        if levels == 2:
+            # QPSK: решение по знаку
+            return (x < 0).view(np.int8)
+        i = np.ceil(((levels - 2) - x / self.scale) / 2)
+        return np.clip(i, 0, levels - 1).astype(np.intp)
+
+    def hard_indices(self, symbols: np.ndarray) -> np.ndarray:
+        """Индексы ближайших точек созвездия (нарезка по I и Q)."""
+        symbols = np.asarray(symbols)
+        gray_i = self.gray[self._axis_levels(symbols.real)]
+        gray_q = self.gray[self._axis_levels(symbols.imag)]
+        return (gray_i << self.axis_bits) | gray_q
+
+    def decide(self, symbols: np.ndarray) -> np.ndarray:
+        """Ближайшие точки созвездия."""
+        return self.constellation[self.hard_indices(symbols)]
+
+    def demodulate(self, symbols: np.ndarray) -> np.ndarray:
+        """Жёсткое решение: символы (..., n) -> биты (..., n * bits_per_symbol)."""
+        bits = self.bit_table[self.hard_indices(symbols)]
+        return bits.reshape(bits.shape[:-2] + (-1,))
+
+    def llr(self, symbols: np.ndarray, noise_var: Optional[float] = 1.0) -> np.ndarray:
+        """Мягкое решение (max-log LLR): символы (..., n) -> LLR (..., n * bits_per_symbol).
+
+        noise_var — дисперсия комплексного шума (на обе оси вместе); None —
+        ненормированные разности квадратов расстояний.
+        """
+        symbols = np.asarray(symbols)
+        per_axis = []
+        for x in (symbols.real, symbols.imag):
+            # Квадраты расстояний до уровней: (..., n, levels)
+            d2 = (x[..., None] - self.levels) ** 2
+            for b in range(self.axis_bits):
+                ones = self.level_bits[:, b] == 1
+                per_axis.append(d2[..., ones].min(axis=-1) - d2[..., ~ones].min(axis=-1))
+        llr = np.stack(per_axis, axis=-1)
+        if noise_var is not None:
+            llr = llr / noise_var
+        return llr.reshape(llr.shape[:-2] + (-1,))
+
+
+# Таблица QPSK лабораторной работы №8: индекс = 2*b0 + b1
+QPSK_TABLE = QAMModem(4).constellation
@@ -0,0 +1,104 @@
+"""
+Линейное прекодирование MU-MIMO для пачки поднесущих.
+
+Канал задаётся тензором H (..., U, M): U абонентов по одной антенне,
+M антенн базовой станции, ведущие оси — поднесущие (и любые другие пачки).
+Прекодеры
+
+    ZF:   W = H^H (H H^H)^(-1),
+    RZF:  W = H^H (H H^H + alpha I)^(-1),
+    MMSE: RZF с alpha = U * sigma^2 (при единичной суммарной мощности),
+
+считаются одним np.linalg.solve для всех поднесущих сразу: W^H = G^(-1) H,
+где G = H H^H (+ alpha I) — эрмитова матрица U x U. Столбцы W нормируются
+к единичной норме, как в calc_zf_precoder лабораторной работы №14.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+PRECODERS = ('zf', 'rzf', 'mmse')
+
+# SIR, который сообщается при нулевой интерференции (как в check_interference), дБ
+SIR_CAP_DB = 100.0
+
+
+def user_channels(h_full: np.ndarray, users: Sequence[int], subcarriers=None) -> np.ndarray:
+    """Массив (антенны, поднесущие, абоненты) -> тензор (поднесущие, U, M) с единичными векторами каналов."""
+    h = np.asarray(h_full)
+    if subcarriers is not None:
+        h = h[:, subcarriers]
+    H = np.transpose(h[:, :, list(users)], (1, 2, 0))
+    return H / np.linalg.norm(H, axis=-1, keepdims=True)
+
+
+def precoder(H: np.ndarray, kind: str = 'zf', noise_var: Optional[float] = None,
+             alpha: Optional[float] = None) -> np.ndarray:
+    """Прекодер W (..., M, U) с нормированными столбцами для канала H (..., U, M).
+
+    kind='rzf' использует регуляризацию alpha, 'mmse' — alpha = U * noise_var.
+    """
+    if kind not in PRECODERS:
+        raise ValueError(f"Неизвестный прекодер: {kind}")
+    users = H.shape[-2]
+    G = H @ H.conj().swapaxes(-1, -2)
+    if kind == 'mmse':
+        if noise_var is None:
+            raise ValueError("Для MMSE нужна дисперсия шума noise_var")
+        alpha = users * noise_var
+    elif kind == 'rzf' and alpha is None:
+        raise ValueError("Для RZF нужен коэффициент регуляризации alpha")
+    if kind != 'zf':
+        G = G + alpha * np.eye(users)
+    W = np.linalg.solve(G, H).conj().swapaxes(-1, -2)
+    return W / np.linalg.norm(W, axis=-2, keepdims=True)
+
+
+def sir_db(H: np.ndarray, W: np.ndarray) -> np.ndarray:
+    """SIR (..., ) в дБ: мощность диагонали H W к мощности внедиагональных элементов."""
+    power = np.abs(H @ W) ** 2
+    diag_pwr = np.trace(power, axis1=-2, axis2=-1)
+    interf_pwr = power.sum(axis=(-2, -1)) - diag_pwr
+    with np.errstate(divide='ignore'):
+        sir = 10 * np.log10(diag_pwr / np.maximum(interf_pwr, 0))
+    return np.where(interf_pwr < 1e-15, SIR_CAP_DB, sir)
+
+
+def sum_rate(H: np.ndarray, W: np.ndarray, noise_var: float) -> np.ndarray:
+    """Суммарная спектральная эффективность (..., ) при равном делении мощности между абонентами."""
+    users = H.shape[-2]
+    power = np.abs(H @ W) ** 2 / users
+    signal = np.diagonal(power, axis1=-2, axis2=-1)
+    interference = power.sum(axis=-1) - signal
+    return np.sum(np.log2(1 + signal / (interference + noise_var)), axis=-1)
+
+
+def greedy_user_selection(h_full: np.ndarray, num_users: int, kind: str = 'zf', noise_var: float = 0.1,
+                          alpha: Optional[float] = None, subcarriers=None,
+                          candidates: Optional[Sequence[int]] = None) -> tuple[list[int], list[float]]:
+    """Жадный выбор num_users абонентов по средней по поднесущим суммарной скорости.
+
+    На каждом шаге к выбранным добавляется каждый оставшийся кандидат, и прекодеры
+    для всех вариантов и всех поднесущих считаются одним пакетным solve.
+    Возвращает (выбранные абоненты, средняя скорость после каждого шага).
+    """
+    if candidates is None:
+        candidates = range(np.asarray(h_full).shape[-1])
+    remaining = list(candidates)
+    H_all = user_channels(h_full, remaining, subcarriers)  # (поднесущие, кандидаты, M)
+    chosen = []
+    rates = []
+    for _ in range(min(num_users, len(remaining))):
+        picked = [remaining.index(u) for u in chosen]
+        options = [i for i in range(len(remaining)) if remaining[i] not in chosen]
+        # (варианты, поднесущие, k + 1, M)
+        subsets = np.array([picked + [i] for i in options])
+        H = np.moveaxis(H_all[:, subsets], 1, 0)
+        W = precoder(H, kind, noise_var, alpha)
+        mean_rate = sum_rate(H, W, noise_var).mean(axis=-1)
+        best = int(np.argmax(mean_rate))
+        chosen.append(remaining[options[best]])
+        rates.append(float(mean_rate[best]))
+    return chosen, rates
@@ -0,0 +1,226 @@
+"""
+Статистики замирания для длинных реализаций.
+
+ 1) acf / xcorr — корреляция через БПФ (теорема Винера-Хинчина) с
+    дополнением нулями до степени двойки >= 2N - 1: O(N log N) вместо
+    O(N^2) у np.correlate, порядок отсчётов как у np.correlate(mode='full').
+ 2) welch_psd и WelchAccumulator — СПМ методом Уэлча (окно Ханна,
+    вычитание среднего в сегменте, как scipy.signal.welch по умолчанию);
+    накопитель принимает сигнал порциями.
+ 3) Онлайн-оценки за один проход по порциям: StreamingACF (лаги до
+    max_lag), OnlineHistogram, LevelCrossingCounter (частота пересечений
+    уровня LCR и средняя длительность замирания AFD).
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def _fft_len(n: int) -> int:
+    return 1 << max(0, (n - 1).bit_length())
+
+
+def xcorr(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Взаимная корреляция, совпадающая с np.correlate(x, y, mode='full')."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = _fft_len(len(x) + len(y) - 1)
+    complex_input = np.iscomplexobj(x) or np.iscomplexobj(y)
+    if complex_input:
+        r = np.fft.ifft(np.fft.fft(x, n) * np.conj(np.fft.fft(y, n)))
+    else:
+        r = np.fft.irfft(np.fft.rfft(x, n) * np.conj(np.fft.rfft(y, n)), n)
+    # Лаги -(len(y) - 1) ... len(x) - 1
+    return np.concatenate([r[n - len(y) + 1:], r[:len(x)]])
+
+
+def acf(x: np.ndarray, max_lag: Optional[int] = None, scale: Optional[str] = None,
+        one_sided: bool = False) -> np.ndarray:
+    """Автокорреляция r[k] = sum x[n+k] * conj(x[n]) через БПФ.
+
+    По умолчанию — все лаги -(N-1) ... N-1, как np.correlate(x, x, mode='full');
+    one_sided=True — только лаги 0 ... max_lag. scale: None, 'biased' (/N),
+    'unbiased' (/(N-|k|)) или 'coeff' (r[0] = 1).
+    """
+    x = np.asarray(x)
+    N = len(x)
+    max_lag = N - 1 if max_lag is None else min(max_lag, N - 1)
+    n = _fft_len(N + max_lag)
+    if np.iscomplexobj(x):
+        r = np.fft.ifft(np.abs(np.fft.fft(x, n)) ** 2)
+    else:
+        r = np.fft.irfft(np.abs(np.fft.rfft(x, n)) ** 2, n)
+    positive = r[:max_lag + 1]
+    lags = np.arange(max_lag + 1)
+    if scale == 'biased':
+        positive = positive / N
+    elif scale == 'unbiased':
+        positive = positive / (N - lags)
+    elif scale == 'coeff':
+        positive = positive / positive[0].real
+    elif scale is not None:
+        raise ValueError(f"Неизвестная нормировка АКФ: {scale}")
+    if one_sided:
+        return positive
+    # r[-k] = conj(r[k])
+    return np.concatenate([np.conj(positive[:0:-1]), positive])
+
+
+class StreamingACF:
+    """АКФ (лаги 0 ... max_lag) сигнала, поданного порциями.
+
+    Хранит последние max_lag отсчётов; вклад новой порции — разность АКФ
+    буфера «хвост + порция» и АКФ одного хвоста, поэтому сумма по всем
+    порциям совпадает с acf(весь сигнал, max_lag, one_sided=True).
+    """
+
+    def __init__(self, max_lag: int):
+        self.max_lag = max_lag
+        self.tail = np.zeros(0)
+        self.sums = np.zeros(max_lag + 1, dtype=complex)
+        self.count = 0
+
+    def push(self, chunk: np.ndarray):
+        chunk = np.asarray(chunk)
+        if len(chunk) == 0:
+            return
+        buffer = np.concatenate([self.tail, chunk])
+        lags = min(self.max_lag, len(buffer) - 1)
+        self.sums[:lags + 1] += acf(buffer, lags, one_sided=True)
+        if len(self.tail):
+            tail_lags = min(lags, len(self.tail) - 1)
+            self.sums[:tail_lags + 1] -= acf(self.tail, tail_lags, one_sided=True)
+        self.tail = buffer[-self.max_lag:] if self.max_lag else buffer[:0]
+        self.count += len(chunk)
+
+    def result(self, scale: Optional[str] = 'unbiased') -> np.ndarray:
+        """Накопленная АКФ; нормировка — как в acf."""
+        lags = np.arange(self.max_lag + 1)
+        r = self.sums.copy()
+        if scale == 'biased':
+            r /= self.count
+        elif scale == 'unbiased':
+            r /= np.maximum(self.count - lags, 1)
+        elif scale == 'coeff':
+            r /= r[0].real
+        return r
+
+
+class WelchAccumulator:
+    """СПМ методом Уэлча для сигнала, поданного порциями.
+
+    Сегменты длины nperseg с шагом nperseg - noverlap режутся по потоку;
+    неполный хвост переносится в следующую порцию. Для вещественного
+    сигнала результат односторонний, для комплексного — двусторонний
+    (частоты в порядке np.fft.fftfreq), как у scipy.signal.welch.
+    """
+
+    def __init__(self, fs: float = 1.0, nperseg: int = 256, noverlap: Optional[int] = None):
+        self.fs = fs
+        self.nperseg = nperseg
+        self.noverlap = nperseg // 2 if noverlap is None else noverlap
+        self.window = np.hanning(nperseg + 1)[:-1]  # периодическое окно Ханна
+        self.scale = 1 / (fs * np.sum(self.window ** 2))
+        self.tail = np.zeros(0)
+        self.total = None
+        self.segments = 0
+        self.complex_input = False
+
+    def push(self, chunk: np.ndarray):
+        buffer = np.concatenate([self.tail, np.asarray(chunk)])
+        self.complex_input |= np.iscomplexobj(buffer)
+        step = self.nperseg - self.noverlap
+        count = (len(buffer) - self.noverlap) // step if len(buffer) >= self.nperseg else 0
+        if count:
+            frames = np.lib.stride_tricks.sliding_window_view(buffer, self.nperseg)[::step][:count]
+            frames = (frames - frames.mean(axis=-1, keepdims=True)) * self.window
+            spectrum = np.fft.fft(frames, axis=-1) if self.complex_input else np.fft.rfft(frames, axis=-1)
+            power = np.sum(np.abs(spectrum) ** 2, axis=0)
+            if self.total is not None and len(power) != len(self.total):
+                raise ValueError("Смешаны вещественные и комплексные порции")
+            self.total = power if self.total is None else self.total + power
+            self.segments += count
+        self.tail = buffer[count * step:]
+
+    def result(self):
+        """(частоты, СПМ)."""
+        if not self.segments:
+            raise ValueError(f"Нужно не меньше nperseg = {self.nperseg} отсчётов")
+        psd = self.total * self.scale / self.segments
+        if self.complex_input:
+            return np.fft.fftfreq(self.nperseg, 1 / self.fs), psd
+        psd = psd.copy()
+        # Односторонняя СПМ: удваиваются все частоты, кроме 0 и Найквиста
+        psd[1:-1 if self.nperseg % 2 == 0 else None] *= 2
+        return np.fft.rfftfreq(self.nperseg, 1 / self.fs), psd
+
+
+def welch_psd(x: np.ndarray, fs: float = 1.0, nperseg: int = 256, noverlap: Optional[int] = None):
+    """СПМ методом Уэлча: (частоты, СПМ), как scipy.signal.welch(x, fs, nperseg=nperseg)."""
+    acc = WelchAccumulator(fs, min(nperseg, len(x)), noverlap)
+    acc.push(x)
+    return acc.result()
+
+
+class OnlineHistogram:
+    """Гистограмма с фиксированными границами bins, накапливаемая по порциям."""
+
+    def __init__(self, bins: np.ndarray):
+        self.bins = np.asarray(bins, dtype=float)
+        self.counts = np.zeros(len(self.bins) - 1, dtype=np.int64)
+        self.total = 0
+
+    def push(self, values: np.ndarray):
+        values = np.asarray(values)
+        self.counts += np.histogram(values, bins=self.bins)[0]
+        self.total += values.size
+
+    def density(self) -> np.ndarray:
+        """Оценка плотности: доля отсчётов в интервале на его ширину (по всем отсчётам)."""
+        return self.counts / (self.total * np.diff(self.bins))
+
+    def centers(self) -> np.ndarray:
+        return (self.bins[:-1] + self.bins[1:]) / 2
+
+
+class LevelCrossingCounter:
+    """Частота пересечений уровня (LCR) и средняя длительность замирания (AFD) огибающей.
+
+    levels — пороги (массив); push(envelope) принимает очередную порцию
+    огибающей, последний отсчёт порции переносится, так что пересечения на
+    стыке порций не теряются. Замирание — интервал ниже порога, число
+    замираний считается по пересечениям вниз.
+    """
+
+    def __init__(self, levels, fs: float):
+        self.levels = np.atleast_1d(np.asarray(levels, dtype=float))
+        self.fs = fs
+        self.up = np.zeros(len(self.levels), dtype=np.int64)
+        self.down = np.zeros(len(self.levels), dtype=np.int64)
+        self.below = np.zeros(len(self.levels), dtype=np.int64)
+        self.count = 0
+        self.last = None
+
+    def push(self, envelope: np.ndarray):
+        envelope = np.asarray(envelope, dtype=float)
+        if len(envelope) == 0:
+            return
+        under = envelope[None, :] < self.levels[:, None]  # (уровни, отсчёты)
+        self.below += under.sum(axis=1)
+        if self.last is not None:
+            under = np.concatenate([(self.last < self.levels)[:, None], under], axis=1)
+        change = np.diff(under.astype(np.int8), axis=1)
+        self.down += np.sum(change == 1, axis=1)
+        self.up += np.sum(change == -1, axis=1)
+        self.count += len(envelope)
+        self.last = envelope[-1]
+
+    def lcr(self) -> np.ndarray:
+        """Число пересечений уровня вверх в секунду."""
+        return self.up / (self.count / self.fs)
+
+    def afd(self) -> np.ndarray:
+        """Средняя длительность пребывания ниже уровня, с."""
+        fades = np.maximum(self.down, 1)
+        return self.below / self.fs / fades
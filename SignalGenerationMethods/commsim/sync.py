@@ -0,0 +1,200 @@
+"""
+Символьная синхронизация OFDM по циклическому префиксу.
+
+Метрика для смещения d (N — длина БПФ, N_g — длина CP):
+
+    C(d)  = sum_{k<N_g} y[d+k] * conj(y[d+k+N])
+    E1(d) = sum_{k<N_g} |y[d+k]|^2,  E2(d) = sum_{k<N_g} |y[d+k+N]|^2
+
+Все три суммы — скользящие суммы длины N_g, поэтому для всего буфера они
+считаются за один проход через накопленные суммы (O(len(y)) вместо
+O(len(y) * N_g)). Поддерживаются нормированная метрика лабораторной
+|C| / sqrt(E1*E2) и метрика ван де Бека |C| - rho/2 * (E1 + E2).
+
+symbol_sync разбит на шаги search_windows / window_peaks / select_starts:
+максимумы окон поиска находятся сразу для пачки буферов (так синхронизирует
+OFDMLink), а отбор и достройка начал выполняются для каждого буфера.
+
+StreamingCPCorrelator считает ту же метрику для потока отсчётов, поданного
+порциями: между порциями хранится хвост из N + N_g - 1 отсчётов, а
+скользящие суммы каждой порции считаются за O(len(chunk)).
+"""
+
+from bisect import bisect_left, insort
+from typing import Optional
+
+import numpy as np
+
+
+def moving_sum(x: np.ndarray, n: int) -> np.ndarray:
+    """Суммы n подряд идущих элементов по последней оси: длина len - n + 1."""
+    c = np.cumsum(x, axis=-1)
+    zero = np.zeros(x.shape[:-1] + (1,), dtype=c.dtype)
+    c = np.concatenate([zero, c], axis=-1)
+    return c[..., n:] - c[..., :-n]
+
+
+def cp_sums(y: np.ndarray, N: int, N_g: int):
+    """Скользящие C, E1, E2 для всех d in [0, len - N - N_g) (по последней оси)."""
+    length = y.shape[-1] - N - N_g
+    if length <= 0:
+        empty = np.zeros(y.shape[:-1] + (0,))
+        return empty.astype(complex), empty, empty
+    head = y[..., :length + N_g - 1]
+    tail = y[..., N:N + length + N_g - 1]
+    energy = np.abs(y) ** 2
+    C = moving_sum(head * np.conj(tail), N_g)
+    E1 = moving_sum(energy[..., :length + N_g - 1], N_g)
+    E2 = moving_sum(energy[..., N:N + length + N_g - 1], N_g)
+    return C, E1, E2
+
+
+def cp_metric(y: np.ndarray, N: int, N_g: int, kind: str = 'normalized', snr_db: Optional[float] = None) -> np.ndarray:
+    """Метрика синхронизации для всех смещений буфера y (или пачки буферов по последней оси).
+
+    kind='normalized' — |C| / sqrt(E1*E2) (как в symbol_sync), 'van_de_beek' —
+    |C| - rho/2 * (E1 + E2), rho = SNR / (SNR + 1).
+    """
+    C, E1, E2 = cp_sums(np.asarray(y), N, N_g)
+    if kind == 'normalized':
+        denom = np.sqrt(E1 * E2)
+        return np.divide(np.abs(C), denom, out=np.zeros_like(denom), where=denom > 0)
+    if kind == 'van_de_beek':
+        snr = 10 ** (snr_db / 10) if snr_db is not None else np.inf
+        rho = 1.0 if np.isinf(snr) else snr / (snr + 1)
+        return np.abs(C) - rho / 2 * (E1 + E2)
+    raise ValueError(f"Неизвестная метрика: {kind}")
+
+
+def search_windows(len_y: int, N: int, N_g: int, symbol_length: int, num_symbols: int,
+                   search_window: int) -> list[tuple[int, int]]:
+    """Окна поиска [start_pos, end_pos) вокруг ожидаемых начал символов (пустые окна пропускаются)."""
+    windows = []
+    for i in range(num_symbols):
+        expected_pos = i * symbol_length
+        start_pos = max(0, expected_pos - search_window)
+        end_pos = min(len_y - N - N_g, expected_pos + search_window)
+        if end_pos > start_pos:
+            windows.append((start_pos, end_pos))
+    return windows
+
+
+def window_peaks(metric: np.ndarray, windows: list[tuple[int, int]]):
+    """Положение и значение максимума метрики в каждом окне: (d_max, peak) формы (..., окна).
+
+    metric может быть пачкой буферов по последней оси; все окна обрабатываются
+    одним argmax по матрице индексов, дополненной -inf.
+    """
+    if not windows:
+        empty = np.zeros(metric.shape[:-1] + (0,))
+        return empty.astype(int), empty
+    starts = np.array([start for start, _ in windows])
+    lengths = np.array([end - start for start, end in windows])
+    offsets = np.arange(lengths.max())
+    valid = offsets < lengths[:, None]
+    index = np.where(valid, starts[:, None] + offsets, 0)
+    values = np.where(valid, metric[..., index], -np.inf)
+    arg = np.argmax(values, axis=-1)
+    peaks = np.take_along_axis(values, arg[..., None], axis=-1)[..., 0]
+    return starts + arg, peaks
+
+
+def select_starts(d_max, peaks, N_g: int, num_symbols: int, threshold: float = 0.65):
+    """Начала символов одного буфера по максимумам окон, как в symbol_sync лабораторной №8.
+
+    Максимумы выше threshold принимаются, если не ближе N_g к уже принятым;
+    недостающие символы достраиваются по среднему интервалу между найденными.
+    Возвращает (symbol_starts, d_max_all, sources), где sources[k] — номер окна,
+    давшего начало k, или -1 для достроенного символа.
+    """
+    symbol_starts = []
+    d_max_all = []
+    sources = []
+    # Отсортированная копия symbol_starts: проверка дубликата за O(log n)
+    found = []
+
+    for w, (d, peak) in enumerate(zip(d_max, peaks)):
+        if peak > threshold:
+            symbol_start = d + N_g
+            j = bisect_left(found, symbol_start - N_g + 1)
+            if j == len(found) or found[j] >= symbol_start + N_g:
+                insort(found, symbol_start)
+                symbol_starts.append(symbol_start)
+                d_max_all.append(d)
+                sources.append(w)
+
+    if len(symbol_starts) < num_symbols and len(symbol_starts) >= 2:
+        # Недостающие символы достраиваются по среднему интервалу между найденными
+        mean_interval = int(np.mean(np.diff(symbol_starts)))
+        base_start = symbol_starts[0]
+        # Ближайшее найденное начало ищется в отсортированном found за O(log n)
+        for i in range(num_symbols):
+            estimated_pos = base_start + i * mean_interval
+            j = bisect_left(found, estimated_pos - N_g)
+            if j == len(found) or found[j] > estimated_pos + N_g:
+                symbol_starts.append(estimated_pos)
+                d_max_all.append(estimated_pos - N_g)
+                sources.append(-1)
+
+        order = sorted(range(len(symbol_starts)), key=lambda k: symbol_starts[k])[:num_symbols]
+        symbol_starts = [symbol_starts[k] for k in order]
+        d_max_all = [d_max_all[k] for k in order]
+        sources = [sources[k] for k in order]
+
+    return symbol_starts, d_max_all, sources
+
+
+def symbol_sync(y, N, N_g, symbol_length, num_symbols, search_window=None, threshold=0.65):
+    """Синхронизация символов OFDM по метрике cp_metric, посчитанной один раз для всего буфера.
+
+    Возвращает то же, что symbol_sync лабораторной работы №8: (symbol_starts, cc_all, d_max_all).
+    """
+    if search_window is None:
+        search_window = N_g * 2
+    metric = cp_metric(y, N, N_g)
+    windows = search_windows(len(y), N, N_g, symbol_length, num_symbols, search_window)
+    d_max, peaks = window_peaks(metric, windows)
+    symbol_starts, d_max_all, sources = select_starts(d_max.tolist(), peaks.tolist(), N_g, num_symbols, threshold)
+
+    cc_all = []
+    for w in sources:
+        if w >= 0:
+            start_pos, end_pos = windows[w]
+            cc_all.append(metric[start_pos:end_pos].copy())
+        else:
+            dummy_cc = np.zeros(N_g * 2)
+            dummy_cc[N_g] = 0.6
+            cc_all.append(dummy_cc)
+    return symbol_starts, cc_all, d_max_all
+
+
+class StreamingCPCorrelator:
+    """Потоковая метрика CP-корреляции.
+
+    push(chunk) возвращает (offset, metric): значения метрики для смещений
+    offset, offset + 1, ..., которые стали вычислимы после этой порции.
+    Склеенные результаты совпадают с cp_metric по всему потоку целиком
+    (плюс последнее смещение d = len - N - N_g, которое cp_metric не считает).
+    """
+
+    def __init__(self, N: int, N_g: int, kind: str = 'normalized', snr_db: Optional[float] = None):
+        self.N = N
+        self.N_g = N_g
+        self.kind = kind
+        self.snr_db = snr_db
+        self.tail = np.zeros(0, dtype=complex)
+        self.offset = 0
+
+    def push(self, chunk: np.ndarray):
+        buffer = np.concatenate([self.tail, np.asarray(chunk, dtype=complex)])
+        # Хватает отсчётов для смещений d, у которых d + N + N_g <= len(buffer)
+        metric = cp_metric(np.concatenate([buffer, np.zeros(1, dtype=complex)]), self.N, self.N_g,
+                           self.kind, self.snr_db)
+        offset = self.offset
+        self.offset += len(metric)
+        self.tail = buffer[len(metric):]
+        return offset, metric
+
+    def reset(self):
+        self.tail = np.zeros(0, dtype=complex)
+        self.offset = 0
@@ -1,6 +1,11 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from commsim.stats import acf
+
 sigma = 1.0
 N = 8000
 
@@ -19,11 +24,11 @@ plt.subplot(1,3,2)
 plt.hist(np.angle(h), bins=80, density=True)
 plt.title('arg(h)')
 
-acf = np.correlate(h, h, mode= 'full') / N
+acf_h = acf(h, scale='biased')  # то же, что np.correlate(h, h, mode='full') / N, через БПФ
 lags  = np.arange(-N+1, N)
 
 plt.subplot(1,3,3)
-plt.plot(lags, np.abs(acf))
+plt.plot(lags, np.abs(acf_h))
 plt.title('Autocorr h')
 
 plt.tight_layout()
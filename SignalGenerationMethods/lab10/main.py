@@ -1,26 +1,30 @@
+import os
+import sys
+import time
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from commsim import QAMModem
+from commsim.beamforming import combining_error_rates, steering_matrix
+
 
 N_bits = 10000  # Количество бит
 channel_loss_dB = 40  # Потери в канале, дБ
 d_lambda_ratio = 0.5  # Отношение расстояния между элементами к длине волны
 theta_deg = 30  # Угол прихода сигнала, градусы
+qpsk = QAMModem(4, unit_power=True)
 
 def get_steering_vector(N, theta_deg, d_lambda_ratio=0.5):
     """Вычисляет управляющий вектор для линейной АР."""
-    theta_rad = np.deg2rad(theta_deg)
-    n = np.arange(N)
-    return np.exp(-1j * 2 * np.pi * d_lambda_ratio * n * np.sin(theta_rad))
+    return steering_matrix(N, theta_deg, d_lambda_ratio)[:, 0]
 
 def bpsk_qpsk_modulate(bits, modulation_type='BPSK'):
     """Модулирует биты в BPSK или QPSK."""
     if modulation_type == 'BPSK':
         return 2 * bits - 1
     elif modulation_type == 'QPSK':
-        I = 2 * bits[0::2] - 1
-        Q = 2 * bits[1::2] - 1
-        return (I + 1j * Q) / np.sqrt(2)
+        return qpsk.modulate(bits)
     else:
         raise ValueError("Поддерживаются только 'BPSK' и 'QPSK'")
 
@@ -31,11 +35,7 @@ def calculate_ser(received_symbols, transmitted_symbols, modulation_type='BPSK')
         transmitted_bits = (np.real(transmitted_symbols) > 0).astype(int)
         return np.sum(demodulated_bits != transmitted_bits) / len(transmitted_bits)
     elif modulation_type == 'QPSK':
-        demod_I = (np.real(received_symbols) > 0).astype(int)
-        demod_Q = (np.imag(received_symbols) > 0).astype(int)
-        orig_I = (np.real(transmitted_symbols) > 0).astype(int)
-        orig_Q = (np.imag(transmitted_symbols) > 0).astype(int)
-        symbol_errors = np.sum((demod_I != orig_I) | (demod_Q != orig_Q))
+        symbol_errors = np.sum(qpsk.hard_indices(received_symbols) != qpsk.hard_indices(transmitted_symbols))
         return symbol_errors / len(transmitted_symbols)
 
 
@@ -87,18 +87,14 @@ def run_simulation(N_elements, modulation='QPSK'):
     print("6. Сигнальные диаграммы построены.")
 
     # 7. Моделирование для диапазона SNR и определение выигрыша
+    # Все точки SNR и обе схемы (одна антенна и MRC) — за один проход:
+    # шум единичной дисперсии генерируется один раз и масштабируется под каждый SNR
     snr_range_db = np.arange(0, 13, 1)
-    ser_single_antenna = []
-    ser_mrc = []
-
-    for snr_db_iter in snr_range_db:
-        snr_linear_iter = 10**(snr_db_iter / 10)
-        noise_power_iter = signal_power / snr_linear_iter
-        noise_iter = np.sqrt(noise_power_iter / 2) * (np.random.randn(*received_signal_matrix.shape) + 1j * np.random.randn(*received_signal_matrix.shape))
-        received_noisy_iter = received_signal_matrix + noise_iter
-        ser_single_antenna.append(calculate_ser(received_noisy_iter[0, :], tx_symbols, modulation))
-        combined_signal_iter = np.dot(w.T, received_noisy_iter)
-        ser_mrc.append(calculate_ser(combined_signal_iter, tx_symbols * np.dot(w.T, h), modulation))
+    single = np.zeros(N_elements, dtype=complex)
+    single[0] = 1
+    modem = qpsk if modulation == 'QPSK' else None
+    ser, _ = combining_error_rates([h, h], [single, w], snr_range_db, len(tx_symbols), modem)
+    ser_single_antenna, ser_mrc = ser
 
     plt.figure(figsize=(8, 6))
     plt.semilogy(snr_range_db, ser_single_antenna, 'o-', label=f'Одна антенна')
@@ -123,5 +119,52 @@ def run_simulation(N_elements, modulation='QPSK'):
     except Exception as e:
         print(f"7. Не удалось вычислить выигрыш: {e}")
 
+
+def legacy_ser(N_elements, snr_range_db, num_symbols):
+    """SER MRC прежним способом: новый шум и полная матрица (N, число символов) на каждый SNR."""
+    h = 10**(-channel_loss_dB / 20) * get_steering_vector(N_elements, theta_deg, d_lambda_ratio)
+    tx_symbols = qpsk.modulate(np.random.randint(0, 2, 2 * num_symbols))
+    received_signal_matrix = np.outer(h, tx_symbols)
+    signal_power = np.mean(np.abs(received_signal_matrix)**2)
+    ser = []
+    for snr_db_iter in snr_range_db:
+        noise_power_iter = signal_power / 10**(snr_db_iter / 10)
+        noise_iter = np.sqrt(noise_power_iter / 2) * (np.random.randn(*received_signal_matrix.shape) + 1j * np.random.randn(*received_signal_matrix.shape))
+        combined = np.dot(np.conj(h), received_signal_matrix + noise_iter)
+        ser.append(calculate_ser(combined, tx_symbols * np.dot(np.conj(h), h), 'QPSK'))
+    return ser
+
+
+def sweep_elements(N_values, num_symbols=10**6, block_size=1 << 15):
+    """SER MRC для всех N и SNR одним проходом; символы обрабатываются блоками."""
+    print(f"\n--- Перебор числа элементов N = {list(N_values)}, {num_symbols} символов QPSK ---")
+    snr_range_db = np.arange(-10, 13, 1)
+    loss = 10**(-channel_loss_dB / 20)
+    channels = [loss * get_steering_vector(N, theta_deg, d_lambda_ratio) for N in N_values]
+    weights = [np.conj(h) for h in channels]
+
+    start = time.perf_counter()
+    ser, _ = combining_error_rates(channels, weights, snr_range_db, num_symbols, qpsk, block_size)
+    t_batch = time.perf_counter() - start
+
+    legacy_symbols = 10**4
+    start = time.perf_counter()
+    for N in N_values:
+        legacy_ser(N, snr_range_db, legacy_symbols)
+    t_legacy = (time.perf_counter() - start) * num_symbols / legacy_symbols
+    print(f"Пакетный расчёт: {t_batch:.2f} с, прежний цикл по SNR и N (оценка): {t_legacy:.2f} с")
+
+    plt.figure(figsize=(8, 6))
+    for N, ser_N in zip(N_values, ser):
+        plt.semilogy(snr_range_db, np.maximum(ser_N, 1 / num_symbols), 'o-', label=f'N={N}')
+    plt.grid(True, which='both')
+    plt.xlabel("Отношение сигнал/шум на элементе (SNR), дБ")
+    plt.ylabel("Вероятность символьной ошибки (SER)")
+    plt.title("SER схемы MRC для разного числа элементов")
+    plt.legend(); plt.ylim(1 / num_symbols, 1)
+    plt.show()
+
+
 run_simulation(N_elements=4, modulation='QPSK')
-run_simulation(N_elements=8, modulation='QPSK')
\ No newline at end of file
+run_simulation(N_elements=8, modulation='QPSK')
+sweep_elements([1, 2, 4, 8, 16])
@@ -1,37 +1,31 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from commsim import QAMModem
+from commsim.beamforming import combining_error_rates, geometric_channel, steering_matrix
+
 np.random.seed(42)
 
 def get_steering_vector(N, theta_deg):
     """
     Формирует нормированный управляющий вектор.
     """
-    theta_rad = np.deg2rad(theta_deg)
-    n = np.arange(N)
     # d = lambda/2 -> фазовый сдвиг pi * sin(theta)
-    vec = np.exp(-1j * np.pi * n * np.sin(theta_rad)) / np.sqrt(N)
-    return vec
+    return steering_matrix(N, theta_deg, 0.5, normalize=True)[:, 0]
+
+qpsk = QAMModem(4, unit_power=True)
 
 def qpsk_modulate(bits):
     """Модуляция QPSK."""
-    symbols = []
-    for i in range(0, len(bits), 2):
-        b = bits[i:i+2]
-        # 00->1+j, 01->-1+j, 11->-1-j, 10->1-j
-        real = 1 if b[0] == 0 else -1
-        imag = 1 if b[1] == 0 else -1
-        symbols.append((real + 1j*imag)/np.sqrt(2))
-    return np.array(symbols)
+    # 00->1+j, 01->1-j, 11->-1-j, 10->-1+j (с нормировкой 1/sqrt(2))
+    return qpsk.modulate(bits)
 
 def detect_qpsk(received):
     """Демодуляция QPSK."""
-    bits = []
-    for s in received:
-        r = 0 if s.real > 0 else 1
-        i = 0 if s.imag > 0 else 1
-        bits.extend([r, i])
-    return np.array(bits)
+    return qpsk.demodulate(received)
 
 
 print("=== Пункт 1: Направленные векторы и ортогональность ===")
@@ -59,18 +53,14 @@ print("-" * 20)
 print("=== Пункт 2: Вычисление матрицы канала H ===")
 Nr = 8
 Np = 20
-H = np.zeros((Nr, Nt), dtype=complex)
 
 tx_angles = np.random.uniform(-30, 30, Np)
 rx_angles = np.random.uniform(-60, 60, Np)
 # Случайные комплексные амплитуды (затухания)
 alphas = (np.random.randn(Np) + 1j * np.random.randn(Np)) / np.sqrt(2)
 
-for l in range(Np):
-    ar = get_steering_vector(Nr, rx_angles[l])
-    at = get_steering_vector(Nt, tx_angles[l])
-    # H = sum( alpha * ar * at^H )
-    H += alphas[l] * np.outer(ar, at.conj())
+# H = sum( alpha * ar * at^H ) = Ar diag(alpha) At^H — одно матричное произведение
+H = geometric_channel(Nr, Nt, rx_angles, tx_angles, alphas)
 
 print("Матрица H вычислена.")
 print("-" * 20)
@@ -158,31 +148,14 @@ plt.show()
 
 print("=== Пункт 10: Моделирование BER vs SNR ===")
 snr_range = np.arange(0, 13, 1)
-ber_single = []
-ber_mimo = []
-h_siso_ref = (H @ w_tx)[0]
-
-for snr in snr_range:
-    current_noise_power = sig_power / (10**(snr/10))
-    current_std = np.sqrt(current_noise_power / 2)
-
-    noise_iter = current_std * (np.random.randn(*R_clean.shape) + 1j * np.random.randn(*R_clean.shape))
-    R_iter = R_clean + noise_iter
-
-    # --- 1. Прием на одну антенну (SISO) ---
-    y_siso = R_iter[0, :]
-    s_est_siso = y_siso / h_siso_ref
-    bits_siso = detect_qpsk(s_est_siso)
-    errors_siso = np.sum(bits != bits_siso)
-    ber_single.append(errors_siso / num_bits)
-
-    # --- 2. Прием на решетку (MIMO Beamforming) ---
-    z_mimo = w_rx.T @ R_iter
-    channel_gain_mimo = max_sigma * loss_scale
-    s_est_mimo = z_mimo / channel_gain_mimo
-    bits_mimo = detect_qpsk(s_est_mimo)
-    errors_mimo = np.sum(bits != bits_mimo)
-    ber_mimo.append(errors_mimo / num_bits)
+h_eff = loss_scale * (H @ w_tx)  # канал до схемы сложения при передаче по w_tx
+
+# --- 1. Прием на одну антенну (SISO) и 2. на решетку (MIMO Beamforming) ---
+# Обе схемы и все SNR — за один проход, шум единичной дисперсии масштабируется под SNR
+e_first = np.zeros(Nr, dtype=complex)
+e_first[0] = 1
+_, ber = combining_error_rates([h_eff, h_eff], [e_first, w_rx], snr_range, len(symbols), qpsk, seed=42)
+ber_single, ber_mimo = ber
 
 plt.figure(figsize=(10, 6))
 plt.semilogy(snr_range, ber_single, 'b-o', label='Одна антенна')
@@ -1,8 +1,16 @@
 import os
+import sys
+import time
 import numpy as np
 import scipy.io as sp
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from commsim import QAMModem
+from commsim.mimo import detector_ser, legacy_detector_ser, mmse_from_svd, stack_channels
+
+qpsk = QAMModem(4, unit_power=True)
+
 
 def add_noise(signal, target_snr_db):
     """Добавляет шум к сигналу заданного SNR"""
@@ -14,12 +22,8 @@ def add_noise(signal, target_snr_db):
 
 def calculate_ser(received_symbols, transmitted_symbols):
     """Считает Symbol Error Rate"""
-    errors = 0
-    total = received_symbols.size
-    rx_signs = np.sign(received_symbols.real) + 1j*np.sign(received_symbols.imag)
-    tx_signs = np.sign(transmitted_symbols.real) + 1j*np.sign(transmitted_symbols.imag)
-    errors = np.sum(rx_signs != tx_signs)
-    return errors / total
+    errors = np.sum(qpsk.hard_indices(received_symbols) != qpsk.hard_indices(transmitted_symbols))
+    return errors / received_symbols.size
 
 # ==============================================================================
 # Задача 1: Загрузка и нормализация
@@ -74,14 +78,7 @@ print("\n--- Задача 4: Генерация сигнала ---")
 num_bits = 10**4
 bits = np.random.randint(0, 2, num_bits)
 # QPSK
-symbols_qpsk = []
-for i in range(0, len(bits), 2):
-    b0 = bits[i]
-    b1 = bits[i+1] if i+1 < len(bits) else 0
-    real = 1 if b0 == 0 else -1
-    imag = 1 if b1 == 0 else -1
-    symbols_qpsk.append((real + 1j*imag) / np.sqrt(2))
-symbols_qpsk = np.array(symbols_qpsk)
+symbols_qpsk = qpsk.modulate(bits)
 num_symbols = len(symbols_qpsk)
 # print(symbols_qpsk)
 n_vecs = num_symbols // rank
@@ -136,7 +133,7 @@ plt.show()
 print("\n--- Задача 8: SER vs SNR (SVD) ---")
 snr_range = range(0,25)
 ser_svd = []
-constellation = np.array([1+1j, 1-1j, -1+1j, -1-1j]) / np.sqrt(2)
+constellation = qpsk.constellation
 for snr in snr_range:
     y_noisy = add_noise(y_received_clean, snr)
     y_comb = W_combiner_SVD @ y_noisy
@@ -311,7 +308,8 @@ for snr in snr_range_task17:
     ser_zf_17.append(calculate_ser(x_est_zf_full[:rank], x_streams_zf))
 
     # --- 4. MMSE ---
-    W_mmse_curr = np.linalg.inv(H.conj().T @ H + noise_var * np.eye(Nt)) @ H.conj().T
+    # (H^H H + sigma^2 I)^(-1) H^H из SVD задачи 2 — без обращения матрицы на каждой точке SNR
+    W_mmse_curr = mmse_from_svd(U, S, Vh, noise_var)
     x_est_mmse_full = W_mmse_curr @ y_zf_noisy
     ser_mmse_17.append(calculate_ser(x_est_mmse_full[:rank], x_streams_zf))
 
@@ -327,4 +325,38 @@ plt.grid(True, which="both")
 plt.legend()
 plt.show()
 
+# ==============================================================================
+# Задача 18: SER по всем поднесущим и снимкам канала
+# ==============================================================================
+print("\n--- Задача 18: SVD, ZF и MMSE по всем поднесущим и снимкам ---")
+H_all = stack_channels(H_full_raw, Nr, Nt)
+snr_range_task18 = range(0, 25, 2)
+vectors_per_channel = 256
+legacy_channels = min(64, len(H_all))
+print(f"Каналов {Nr}x{Nt}: {len(H_all)} (поднесущие x снимки), векторов на канал: {vectors_per_channel}")
+
+start_time = time.perf_counter()
+ser_all, timing = detector_ser(H_all, snr_range_task18, vectors_per_channel, seed=0)
+elapsed = time.perf_counter() - start_time
+
+start_time = time.perf_counter()
+legacy_detector_ser(H_all[:legacy_channels], snr_range_task18, vectors_per_channel, seed=0)
+legacy_elapsed = (time.perf_counter() - start_time) * len(H_all) / legacy_channels
+
+print("Время по этапам, с:")
+for stage, seconds in timing.items():
+    print(f"  {stage:<7} {seconds:8.3f}")
+print(f"Всего: {elapsed:.2f} с; по каналу и SNR отдельно (оценка по {legacy_channels} каналам): "
+      f"{legacy_elapsed:.2f} с, ускорение {legacy_elapsed / elapsed:.1f}x")
+
+plt.figure(figsize=(8, 6))
+for (name, ser_curve), style in zip(ser_all.items(), ['o-', 's--', 'd-.']):
+    plt.semilogy(snr_range_task18, ser_curve, style, label=name, linewidth=2)
+plt.title(f"SER по всем поднесущим и снимкам ({len(H_all)} каналов {Nr}x{Nt})")
+plt.xlabel("SNR, дБ")
+plt.ylabel("Symbol Error Rate (SER)")
+plt.grid(True, which="both")
+plt.legend()
+plt.show()
+
 print("Выполнение всех задач завершено.")
\ No newline at end of file
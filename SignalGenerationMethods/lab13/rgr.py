@@ -1,12 +1,16 @@
 import os
+import sys
 import numpy as np
 import scipy.io as sp
 import matplotlib.pyplot as plt
-from scipy.interpolate import interp1d
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from commsim import ChannelEstimator, QAMModem
 
 # ==============================================================================
 # Вспомогательные функции
 # ==============================================================================
+qpsk = QAMModem(4, unit_power=True)
 
 def add_noise_return_noise(signal, target_snr_db):
     """
@@ -24,9 +28,7 @@ def add_noise_return_noise(signal, target_snr_db):
 
 def calculate_ser(received_symbols, transmitted_symbols):
     """Считает Symbol Error Rate (для QPSK)"""
-    rx_signs = np.sign(received_symbols.real) + 1j*np.sign(received_symbols.imag)
-    tx_signs = np.sign(transmitted_symbols.real) + 1j*np.sign(transmitted_symbols.imag)
-    errors = np.sum(rx_signs != tx_signs)
+    errors = np.sum(qpsk.hard_indices(received_symbols) != qpsk.hard_indices(transmitted_symbols))
     return errors / received_symbols.size
 
 # ==============================================================================
@@ -71,7 +73,7 @@ pilot_indices = np.arange(0, K_subcarriers, P_step)
 data_indices = np.arange(0, K_subcarriers)
 pilot_val = 1 + 1j
 
-H_est_all = np.zeros((Nr, Nt, K_subcarriers), dtype=complex)
+H_ls_all = np.zeros((Nr, Nt, len(pilot_indices)), dtype=complex)
 SNR_pilot = 20 #
 
 for r in range(Nr):
@@ -82,11 +84,12 @@ for r in range(Nr):
         Y_pilots, _, _ = add_noise_return_noise(Y_pilots_clean, SNR_pilot)
 
         # LS оценка: H = Y / X
-        H_ls = Y_pilots / pilot_val
+        H_ls_all[r, t, :] = Y_pilots / pilot_val
 
-        # Интерполяция
-        interpolator = interp1d(pilot_indices, H_ls, kind='linear', fill_value="extrapolate")
-        H_est_all[r, t, :] = interpolator(data_indices)
+# Линейная интерполяция (с экстраполяцией за последним пилотом) сразу для всех пар антенн:
+# одна матрица весов на расположение пилотов вместо interp1d на каждую пару
+estimator = ChannelEstimator(pilot_indices, K_subcarriers, pilot_val, mode='linear')
+H_est_all = estimator.interpolate(H_ls_all)
 
 chosen_sub = 32
 H_est = H_est_all[:, :, chosen_sub]
@@ -126,11 +129,7 @@ print("\n--- Пункт 5: Формирование сигнала (SVD) ---")
 num_bits = 10**4
 bits = np.random.randint(0, 2, num_bits)
 
-symbols = []
-for i in range(0, len(bits), 2):
-    val = (1 if bits[i]==0 else -1) + 1j*(1 if bits[i+1]==0 else -1)
-    symbols.append(val / np.sqrt(2))
-symbols = np.array(symbols)
+symbols = qpsk.modulate(bits)
 
 n_vecs = len(symbols) // rank
 x_streams = symbols[:n_vecs*rank].reshape(rank, n_vecs)
@@ -1,12 +1,20 @@
 import os
+import sys
+import time
 import numpy as np
 import scipy.io as sp
 import numpy.linalg as la
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from commsim import QAMModem
+from commsim.precoding import greedy_user_selection, precoder, sir_db, sum_rate, user_channels
+
 # ==============================================================================
 # Вспомогательные функции
 # ==============================================================================
+qpsk = QAMModem(4, unit_power=True)
+
 def add_noise_to_signal(signal, snr_db):
     """Добавляет шум к сигналу"""
     sig_power = np.mean(np.abs(signal)**2)
@@ -18,11 +26,9 @@ def add_noise_to_signal(signal, snr_db):
 
 def calculate_ser(received, transmitted):
     """Расчет SER для QPSK"""
-    rx = received.flatten()
-    tx = transmitted.flatten()
-    rx_signs = np.sign(rx.real) + 1j*np.sign(rx.imag)
-    tx_signs = np.sign(tx.real) + 1j*np.sign(tx.imag)
-    return np.sum(rx_signs != tx_signs) / rx.size
+    rx = qpsk.hard_indices(received.flatten())
+    tx = qpsk.hard_indices(transmitted.flatten())
+    return np.sum(rx != tx) / rx.size
 
 # ==============================================================================
 # Пункт 1: Загрузка данных MU-MIMO
@@ -61,30 +67,25 @@ print("Матрица исходного канала H_true сформиров
 print("\n--- 2. Моделирование SRS и LS-оценка ---")
 len_srs = 24
 srs_bits = np.random.randint(0, 2, len_srs * 2)
-SRS_seq = (1/np.sqrt(2)) * ((2*srs_bits[::2]-1) + 1j*(2*srs_bits[1::2]-1))
+SRS_seq = qpsk.modulate(srs_bits)
 
-H_est_list = []
 SNR_SRS_dB = 15
 
-for i, u_idx in enumerate(user_indices):
-    
-    h_user_true = H_true[i, :]
-    Y_received_srs = np.outer(h_user_true, SRS_seq)
-    
-    Y_received_srs_noisy, _ = add_noise_to_signal(Y_received_srs, SNR_SRS_dB)
-    
-    # LS Оценка: H_est = Y / X.
-    # Так как X (SRS) известен, и мы в частотной области:
-    # H_est = Y * conj(SRS) / |SRS|^2. Так как |SRS|=1, то H_est = Y * conj(SRS) / length
-    # LS: h_est = mean(y_received / srs_symbol)
-    
-    H_ls_raw = Y_received_srs_noisy / SRS_seq[np.newaxis, :] # (16, 24)
-    
-    h_user_est = np.mean(H_ls_raw, axis=1)
-    
-    H_est_list.append(h_user_est)
+# Все абоненты сразу: Y (абоненты, антенны, длина SRS)
+Y_received_srs = H_true[:, :, np.newaxis] * SRS_seq[np.newaxis, np.newaxis, :]
+
+# Шум с мощностью, заданной SNR отдельно для каждого абонента (как add_noise_to_signal по одному)
+sig_power = np.mean(np.abs(Y_received_srs)**2, axis=(1, 2), keepdims=True)
+noise_power = sig_power / 10**(SNR_SRS_dB / 10.0)
+noise = np.sqrt(noise_power/2) * (np.random.randn(*Y_received_srs.shape) + 1j * np.random.randn(*Y_received_srs.shape))
+Y_received_srs_noisy = Y_received_srs + noise
 
-H_est = np.vstack(H_est_list) # Матрица оценки (4, 16)
+# LS Оценка: H_est = Y / X.
+# Так как X (SRS) известен, и мы в частотной области:
+# LS: h_est = mean(y_received / srs_symbol)
+H_ls_raw = Y_received_srs_noisy / SRS_seq[np.newaxis, np.newaxis, :] # (4, 16, 24)
+
+H_est = np.mean(H_ls_raw, axis=2) # Матрица оценки (4, 16)
 print(f"Оценка канала выполнена методом LS (SNR={SNR_SRS_dB} дБ).")
 
 
@@ -98,16 +99,8 @@ def calc_zf_precoder(H_channel):
     H_channel: матрица (Users x Antennas) (4x16)
     Возвращает W: матрица (Antennas x Users) (16x4)
     """
-    # H^H
-    H_herm = H_channel.conj().T
-    # Inv(H * H^H)
-    Gram_inv = la.inv(H_channel @ H_herm)
-    # W = H^H * Inv(...)
-    W = H_herm @ Gram_inv
-    
-    for col in range(W.shape[1]):
-        W[:, col] = W[:, col] / la.norm(W[:, col])
-    return W
+    # W = H^H * Inv(H * H^H) через solve, столбцы нормированы (работает и для пачки (..., 4, 16))
+    return precoder(H_channel, 'zf')
 
 W_ideal = calc_zf_precoder(H_true)
 
@@ -123,20 +116,15 @@ print("\n--- 4. Проверка подавления интерференции
 
 # Функция для вывода SIR
 def check_interference(H_ch, W_prec, name):
+    """SIR для канала (4, 16) или пачки поднесущих (..., 4, 16); при нулевой интерференции — 100 дБ"""
+    sir = sir_db(H_ch, W_prec)
     Eff = H_ch @ W_prec
-    
-    diag_pwr = np.sum(np.abs(np.diag(Eff))**2)
-    total_pwr = np.sum(np.abs(Eff)**2)
-    interf_pwr = total_pwr - diag_pwr
-    
-    # SIR
-    if interf_pwr < 1e-15: 
-        sir = 100.0 # Бесконечность
+
+    if np.ndim(sir) == 0:
+        print(f"[{name}] SIR: {sir:.2f} дБ")
+        print(f"Матрица амплитуд (первые 2x2):\n{np.round(np.abs(Eff[:2,:2]), 4)}")
     else:
-        sir = 10 * np.log10(diag_pwr / interf_pwr)
-        
-    print(f"[{name}] SIR: {sir:.2f} дБ")
-    print(f"Матрица амплитуд (первые 2x2):\n{np.round(np.abs(Eff[:2,:2]), 4)}")
+        print(f"[{name}] SIR по {sir.size} поднесущим: среднее {np.mean(sir):.2f} дБ, минимум {np.min(sir):.2f} дБ")
     return sir
 
 check_interference(H_true, W_ideal, "IDEAL: H * W_ideal")
@@ -155,7 +143,7 @@ ser_list = []
 num_bits = 10**4
 
 bits = np.random.randint(0, 2, num_bits)
-syms = (1/np.sqrt(2)) * ((2*bits[::2]-1) + 1j*(2*bits[1::2]-1))
+syms = qpsk.modulate(bits)
 
 len_syms = len(syms)
 x_streams = np.zeros((4, len_syms), dtype=complex)
@@ -163,7 +151,7 @@ x_streams[target_user_idx, :] = syms
 for u in range(4):
     if u != target_user_idx:
         b_noise = np.random.randint(0, 2, num_bits)
-        x_streams[u, :] = (1/np.sqrt(2)) * ((2*b_noise[::2]-1) + 1j*(2*b_noise[1::2]-1))
+        x_streams[u, :] = qpsk.modulate(b_noise)
 
 Tx_signal = W_est @ x_streams
 
@@ -189,4 +177,54 @@ plt.grid(True, which='both', linestyle='--')
 plt.legend()
 plt.show()
 
+
+# ==============================================================================
+# Пункт 6: Прекодеры ZF / RZF / MMSE для всех поднесущих
+# ==============================================================================
+print("\n--- 6. Прекодеры для всех поднесущих ---")
+noise_var = 10**(-10 / 10.0)  # SNR 10 дБ при единичной мощности
+H_sub = user_channels(h_full, user_indices)  # (поднесущие, 4, 16)
+print(f"Тензор канала (поднесущие, абоненты, антенны): {H_sub.shape}")
+
+sir_curves = {}
+for kind, title in [('zf', 'ZF'), ('rzf', 'RZF (alpha = 0.05)'), ('mmse', 'MMSE')]:
+    W_sub = precoder(H_sub, kind, noise_var=noise_var, alpha=0.05)
+    sir_curves[title] = check_interference(H_sub, W_sub, title)
+
+plt.figure(figsize=(9, 5))
+for title, sir_curve in sir_curves.items():
+    plt.plot(sir_curve, label=title)
+plt.title("SIR по поднесущим для выбранных абонентов")
+plt.xlabel("Номер поднесущей")
+plt.ylabel("SIR, дБ")
+plt.grid(True)
+plt.legend()
+plt.show()
+
+# Время: поднесущие по одной (как calc_zf_precoder раньше) против одного пакетного solve
+print("Поднесущих | по одной, с | пачкой, с")
+for count in [25, 50, 100, 200, H_sub.shape[0]]:
+    start_time = time.perf_counter()
+    for k in range(count):
+        H_k = H_sub[k]
+        W_k = H_k.conj().T @ la.inv(H_k @ H_k.conj().T)
+        W_k = W_k / la.norm(W_k, axis=0)
+    loop_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    precoder(H_sub[:count], 'zf')
+    batch_time = time.perf_counter() - start_time
+    print(f"{count:>10} | {loop_time:>11.5f} | {batch_time:>9.5f}")
+
+# ==============================================================================
+# Пункт 7: Жадный выбор абонентов
+# ==============================================================================
+print("\n--- 7. Жадный выбор абонентов (ZF, средняя суммарная скорость) ---")
+start_time = time.perf_counter()
+selected, rates = greedy_user_selection(h_full, len(user_indices), 'zf', noise_var)
+print(f"Выбраны абоненты: {selected} за {time.perf_counter() - start_time:.2f} с")
+for step, rate in enumerate(rates, 1):
+    print(f"  {step} абон.: {rate:.2f} бит/с/Гц")
+fixed_rate = np.mean(sum_rate(H_sub, precoder(H_sub, 'zf'), noise_var))
+print(f"Для сравнения, абоненты {user_indices}: {fixed_rate:.2f} бит/с/Гц")
+
 print("Задание полностью выполнено.")
\ No newline at end of file
@@ -1,6 +1,13 @@
+import os
+import sys
+import time
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from commsim.fading import ScatteringChannel, SumOfSinusoids
+from commsim.stats import LevelCrossingCounter, OnlineHistogram, acf
+
 
 fc = 2e9
 c = 3e8
@@ -53,14 +60,10 @@ BS = np.array([1000.0, 1000.0])
 
 SC = np.random.uniform(-500, 500, (Nsc, 2))
 trk_t = np.arange(Ntrk) * dx / V
-MS_trk = np.vstack([V * trk_t * np.cos(0.0), V * trk_t * np.sin(0.0)]).T
-dBSSC = np.linalg.norm(BS - SC, axis=1)
-
-r_sum = np.empty(Ntrk, dtype=complex)
-for idx, ms in enumerate(MS_trk):
-    dSCMS = np.linalg.norm(SC - ms, axis=1)
-    d_total = dBSSC + dSCMS
-    r_sum[idx] = np.sum(np.exp(-1j * k * d_total))
+# Трек MS по оси x с шагом dx; расстояния до всех рассеивателей считаются блоками
+scattering = ScatteringChannel(BS, SC, lam, dx, direction=0.0)
+MS_trk = scattering.track(0, Ntrk)
+r_sum = scattering.samples(0, Ntrk)
 
 R2 = np.fft.fftshift(np.fft.fft(r_sum, NFFT))
 
@@ -77,10 +80,7 @@ sorted_vals = np.sort(vals)
 cdf = np.arange(1, len(sorted_vals) + 1) / len(sorted_vals)
 
 x = vals - np.mean(vals)
-acf_full = np.correlate(x, x, mode="full")
-acf_pos = acf_full[Ntrk - 1 :]
-denom = np.arange(Ntrk, 0, -1)
-acf_unbiased = acf_pos / denom
+acf_unbiased = acf(x, scale="unbiased", one_sided=True)
 acf_normalized = acf_unbiased / acf_unbiased[0]
 lags = np.arange(len(acf_normalized)) * (dx / V)
 
@@ -96,6 +96,44 @@ print(f"Смещение Допплера (FFT-ось): {doppler2_shift_fft:.6f}
 print()
 
 
+# Задача 3: длинные реализации потоком блоков (без хранения всего трека)
+Nsc_long = 2000
+Ntrk_long = 20000
+Nsos_long = 1_000_000
+block = 4096
+fd = V / lam
+sc_long = ScatteringChannel(BS, np.random.uniform(-500, 500, (Nsc_long, 2)), lam, dx)
+sos = SumOfSinusoids(fd, fs, num_sinusoids=16, method="zheng", seed=0)
+
+print("=== Задача 3: длинные реализации замирания (поток блоков) ===")
+env_bins = np.linspace(0, 4, 81)
+rho_levels = np.array([0.1, 0.3, 0.5, 1.0])  # пороги относительно rms
+env_hists = {}
+# Средняя мощность: Nsc единичных лучей для рассеивателей, 1 для суммы синусоид
+for name, model, total, mean_power in [
+    ("Рассеиватели", sc_long, Ntrk_long, Nsc_long),
+    ("Сумма синусоид (Чжэн)", sos, Nsos_long, 1.0),
+]:
+    start_time = time.perf_counter()
+    hist = OnlineHistogram(env_bins)
+    crossings = LevelCrossingCounter(rho_levels, fs)
+    for chunk in model.blocks(block, total):
+        envelope = np.abs(chunk) / np.sqrt(mean_power)
+        hist.push(envelope)
+        crossings.push(envelope)
+    elapsed = time.perf_counter() - start_time
+    env_hists[name] = hist
+    print(f"{name}: {total} отсчётов за {elapsed:.2f} с")
+    # Теория для релеевского замирания со спектром Кларка; при F = 16 отсчётах на длину волны
+    # короткие глубокие замирания (rho = 0.1) частично проскакивают между отсчётами
+    lcr_theory = np.sqrt(2 * np.pi) * fd * rho_levels * np.exp(-rho_levels ** 2)
+    afd_theory = (np.exp(rho_levels ** 2) - 1) / (rho_levels * fd * np.sqrt(2 * np.pi))
+    for rho, lcr, lcr_t, afd, afd_t in zip(rho_levels, crossings.lcr(), lcr_theory, crossings.afd(), afd_theory):
+        print(f"  rho = {rho:.1f}: LCR {lcr:8.2f} 1/с (теория {lcr_t:8.2f}), "
+              f"AFD {afd * 1e3:7.3f} мс (теория {afd_t * 1e3:7.3f})")
+print()
+
+
 plt.figure(figsize=(10, 8))
 plt.subplot(3, 1, 1)
 plt.plot(t, amplitude, label="|r(t)|")
@@ -186,4 +224,17 @@ plt.grid(True)
 plt.tight_layout()
 
 
+env_centers = (env_bins[:-1] + env_bins[1:]) / 2
+plt.figure(figsize=(6, 4))
+for name, hist in env_hists.items():
+    plt.plot(hist.centers(), hist.density(), label=name)
+plt.plot(env_centers, 2 * env_centers * np.exp(-env_centers ** 2), "k--", label="Рэлей")
+plt.title("Задача 3 — Распределение огибающей длинных реализаций")
+plt.xlabel("|h| / rms")
+plt.ylabel("Плотность вероятности")
+plt.legend()
+plt.grid(True)
+plt.tight_layout()
+
+
 plt.show()
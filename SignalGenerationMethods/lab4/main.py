@@ -1,7 +1,12 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy import signal
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from commsim.stats import acf
+
 sigma = 1.0
 N = 8000
 fs = 120
@@ -13,9 +18,9 @@ filter_order = 5
 cutoff_norm = 0.1
 b, a = signal.butter(filter_order, cutoff_norm, btype='low')
 h_filtered = signal.lfilter(b, a, h)
-acf_orig_raw = np.correlate(h, h, mode='full')
+acf_orig_raw = acf(h)
 acf_orig_normalized = np.abs(acf_orig_raw) / np.max(np.abs(acf_orig_raw))
-acf_filtered_raw = np.correlate(h_filtered, h_filtered, mode='full')
+acf_filtered_raw = acf(h_filtered)
 acf_filtered_normalized = np.abs(acf_filtered_raw) / np.max(np.abs(acf_filtered_raw))
 
 lags = np.arange(-N + 1, N)
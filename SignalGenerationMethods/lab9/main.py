@@ -1,6 +1,13 @@
+import os
+import sys
+import time
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from commsim import arrays
+
 
 D_LAMBDA = 0.5 # Отношение расстояния между элементами к длине волны
 THETA_3DB = 70.0  # Ширина луча по уровню -3 дБ в градусах
@@ -11,18 +18,9 @@ def calculate_af_linear(theta_deg, N, d_lambda, theta0_deg=0):
     Рассчитывает коэффициент антенной решетки (AF) для линейной АР.
     Задания 1 и 2.
     """
-    theta_rad = np.deg2rad(theta_deg)
-    theta0_rad = np.deg2rad(theta0_deg)
-    k_array = np.arange(N)
-# Размер решетки
-    # Фазовый сдвиг для каждого элемента и угла
-    # Формула: n * 2*pi*d/lambda * (sin(theta) - sin(theta_0))
-    phase_diff = 2j * np.pi * d_lambda * (np.sin(theta_rad[:, np.newaxis]) - np.sin(theta0_rad))
-    exponents = k_array[np.newaxis, :] * phase_diff
-    phasors = np.exp(exponents)
-
-    af = np.sum(phasors, axis=1)
-    return af
+    # Сумма N фазоров — ядро Дирихле в замкнутой форме, без матрицы (углы x элементы)
+    # Фазовый сдвиг: n * 2*pi*d/lambda * (sin(theta) - sin(theta_0))
+    return arrays.linear_af(theta_deg, N, d_lambda, theta0_deg)
 
 def calculate_g_element_db(theta_deg, theta_3db=THETA_3DB, a_m=A_M):
     """
@@ -36,22 +34,23 @@ def calculate_af_planar(theta_deg, phi_deg, Nv, Nh, dv_lambda, dh_lambda, theta0
     """
     Рассчитывает коэффициенты АР для планарной решетки (по вертикали и горизонтали).
     """
-    theta_rad = np.deg2rad(theta_deg)
-    phi_rad = np.deg2rad(phi_deg)
-    theta0_rad = np.deg2rad(theta0_deg)
-    phi0_rad = np.deg2rad(phi0_deg)
+    # Вертикальный (вдоль оси z) и горизонтальный (вдоль оси y) коэффициенты АР
+    # в замкнутой форме; результат кэшируется по (геометрия, направление, сетка)
+    return arrays.planar_af(theta_deg, phi_deg, Nv, Nh, dv_lambda, dh_lambda, theta0_deg, phi0_deg)
 
-    # Вертикальный коэффициент АР (вдоль оси z)
-    m = np.arange(Nv)
-    phase_v = 2j * np.pi * dv_lambda * (np.cos(theta_rad) - np.cos(theta0_rad))
-    af_v = np.sum(np.exp(m[np.newaxis, np.newaxis, :] * phase_v[:, :, np.newaxis]), axis=2)
 
-    # Горизонтальный коэффициент АР (вдоль оси y)
-    n = np.arange(Nh)
-    phase_h = 2j * np.pi * dh_lambda * (np.sin(theta_rad) * np.sin(phi_rad) - np.sin(theta0_rad) * np.sin(phi0_rad))
-    af_h = np.sum(np.exp(n[np.newaxis, np.newaxis, :] * phase_h[:, :, np.newaxis]), axis=2)
-
-    return af_v, af_h
+def sweep_planar_steering(theta_deg, phi_deg, weights, d_lambda, steering, fft_size=(1024, 1024)):
+    """
+    ДН (дБ) планарной АР с весами weights для набора направлений steering [(theta0, phi0), ...].
+    Сетка БПФ весов строится один раз, каждое направление — только интерполяция.
+    """
+    norm = np.abs(np.sum(weights)) ** 2
+    patterns = []
+    for theta0, phi0 in steering:
+        af = arrays.planar_af_weighted(theta_deg, phi_deg, weights, d_lambda, d_lambda,
+                                       theta0, phi0, fft_size=fft_size)
+        patterns.append(10 * np.log10(np.abs(af) ** 2 / norm + 1e-12))
+    return patterns
 
 
 def main():
@@ -145,5 +144,48 @@ def main():
     fig2.tight_layout(rect=[0, 0.03, 1, 0.95])
     plt.show()
 
+    # --- Задание 8: Большая АР с амплитудным распределением ---
+    print("\nПланарная АР 64x64 с распределением Тейлора (сетка 1°)...")
+    Nv, Nh = 64, 64
+    phi_grid_deg, theta_grid_deg = np.meshgrid(np.arange(0, 361), np.arange(0, 91))
+    weights = np.outer(arrays.taper(Nv, 'taylor', 30), arrays.taper(Nh, 'taylor', 30))
+    steering = [(theta0, 45.0) for theta0 in (0.0, 15.0, 30.0, 45.0)]
+
+    start = time.perf_counter()
+    af_direct = arrays.planar_af_direct(theta_grid_deg, phi_grid_deg, weights, D_LAMBDA, D_LAMBDA,
+                                        *steering[-1])
+    t_direct = time.perf_counter() - start
+
+    start = time.perf_counter()
+    patterns = sweep_planar_steering(theta_grid_deg, phi_grid_deg, weights, D_LAMBDA, steering)
+    t_sweep = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sweep_planar_steering(theta_grid_deg, phi_grid_deg, weights, D_LAMBDA, steering)
+    t_cached = time.perf_counter() - start
+
+    direct_db = 10 * np.log10(np.abs(af_direct) ** 2 / np.abs(np.sum(weights)) ** 2 + 1e-12)
+    visible = direct_db > -40
+    print(f"  Прямая сумма, 1 направление:      {t_direct * 1e3:8.1f} мс")
+    print(f"  БПФ, {len(steering)} направления:            {t_sweep * 1e3:8.1f} мс")
+    print(f"  Повторный перебор (кэш):          {t_cached * 1e3:8.1f} мс")
+    print(f"  Расхождение БПФ и прямой суммы (выше -40 дБ): "
+          f"{np.max(np.abs(patterns[-1] - direct_db)[visible]):.2f} дБ")
+
+    # Равномерная АР того же размера — через разделимую замкнутую форму
+    af_v_u, af_h_u = calculate_af_planar(theta_grid_deg, phi_grid_deg, Nv, Nh, D_LAMBDA, D_LAMBDA,
+                                         *steering[-1])
+    uniform_db = 10 * np.log10(np.abs(af_v_u * af_h_u) ** 2 / (Nv * Nh) ** 2 + 1e-12)
+
+    fig3 = plt.figure(figsize=(15, 7))
+    fig3.suptitle(f'Планарная АР {Nv}x{Nh}, поворот на (θ={steering[-1][0]}°, φ={steering[-1][1]}°)', fontsize=16)
+    element_gain_db = calculate_g_element_db(theta_grid_deg)
+    plot_planar_polar(fig3, 121, np.deg2rad(phi_grid_deg), np.deg2rad(theta_grid_deg),
+                      uniform_db + element_gain_db, 'Равномерное распределение')
+    plot_planar_polar(fig3, 122, np.deg2rad(phi_grid_deg), np.deg2rad(theta_grid_deg),
+                      patterns[-1] + element_gain_db, 'Распределение Тейлора (-30 дБ)')
+    fig3.tight_layout(rect=[0, 0.03, 1, 0.95])
+    plt.show()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
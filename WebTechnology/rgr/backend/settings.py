@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -155,3 +156,59 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
 }
+
+# Video streaming: "django" serves byte ranges from the app (sendfile-capable
+# WSGI servers use zero-copy), "x-accel" / "x-sendfile" hand the file to nginx
+# or Apache via the X-Accel-Redirect / X-Sendfile header.
+VIDEO_STREAM_MODE = os.getenv("VIDEO_STREAM_MODE", "django")
+VIDEO_STREAM_CHUNK_SIZE = int(os.getenv("VIDEO_STREAM_CHUNK_SIZE", str(64 * 1024)))
+VIDEO_ACCEL_REDIRECT_PREFIX = os.getenv("VIDEO_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+
+# View counting: increments are buffered in the "video-views" cache and
+# written to the database at most once per VIDEO_VIEWS_FLUSH_INTERVAL seconds
+# (see videos/counters.py and `manage.py flush_video_views`). That cache must
+# not evict entries; per-viewer dedup markers go to the evictable default
+# cache. Set VIDEO_VIEWS_NUM_PROXIES to the number of reverse proxies that
+# append to X-Forwarded-For; with 0 the header is ignored.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "video-views": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "video-views",
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": sys.maxsize},
+    },
+}
+VIDEO_VIEWS_CACHE = "video-views"
+VIDEO_VIEWS_DEDUP_CACHE = "default"
+VIDEO_VIEWS_NUM_PROXIES = int(os.getenv("VIDEO_VIEWS_NUM_PROXIES", "0"))
+VIDEO_VIEWS_FLUSH_INTERVAL = int(os.getenv("VIDEO_VIEWS_FLUSH_INTERVAL", "30"))
+VIDEO_VIEWS_DEDUP_SECONDS = int(os.getenv("VIDEO_VIEWS_DEDUP_SECONDS", str(30 * 60)))
+
+# Rendered /api/videos/ pages are cached for this long. Any change to a video
+# bumps the list version (kept in the non-evicting cache), which invalidates
+# them at once in the same process; with LocMemCache other workers catch up
+# when their pages expire.
+VIDEO_LIST_CACHE_SECONDS = int(os.getenv("VIDEO_LIST_CACHE_SECONDS", "60"))
+VIDEO_LIST_VERSION_CACHE = "video-views"
+
+# Resumable uploads (/api/uploads/) and the background task queue.
+VIDEO_UPLOAD_MAX_SIZE = int(os.getenv("VIDEO_UPLOAD_MAX_SIZE", str(10 * 1024 ** 3)))
+VIDEO_UPLOAD_MAX_CHUNK_SIZE = int(os.getenv("VIDEO_UPLOAD_MAX_CHUNK_SIZE", str(64 * 1024 ** 2)))
+VIDEO_UPLOAD_REQUIRE_CHECKSUM = os.getenv("VIDEO_UPLOAD_REQUIRE_CHECKSUM", "1") == "1"
+VIDEO_TASK_WORKERS = int(os.getenv("VIDEO_TASK_WORKERS", "2"))
+VIDEO_TASKS_EAGER = False
+
+# Thumbnails, sprite sheets and HLS renditions (videos/processing.py) are made
+# by local ffmpeg in VIDEO_MEDIA_WORKERS processes; without ffmpeg videos are
+# marked "skipped" and served from the original file.
+VIDEO_MEDIA_PROCESSING = os.getenv("VIDEO_MEDIA_PROCESSING", "1") == "1"
+VIDEO_MEDIA_WORKERS = int(os.getenv("VIDEO_MEDIA_WORKERS", "1"))
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+FFPROBE_BINARY = os.getenv("FFPROBE_BINARY", "ffprobe")
+# (height, video kbit/s, audio kbit/s); renditions taller than the source are skipped
+VIDEO_HLS_RENDITIONS = [(360, 800, 96), (720, 2800, 128), (1080, 5000, 192)]
+VIDEO_HLS_SEGMENT_SECONDS = 6
+VIDEO_SPRITE_INTERVAL = 10
@@ -25,7 +25,9 @@ export async function apiRequest(path, options = {}) {
     headers.set("Authorization", `Bearer ${token}`);
   }
 
-  const response = await fetch(`${API_URL}${path}`, {
+  // Absolute URLs (e.g. the `next` link of a paginated list) are used as is
+  const url = /^https?:\/\//.test(path) ? path : `${API_URL}${path}`;
+  const response = await fetch(url, {
     ...options,
     headers,
   });
@@ -60,8 +62,14 @@ export function login(data) {
   });
 }
 
-export function fetchVideos() {
-  return apiRequest("/videos/");
+export function fetchVideos(next = null) {
+  // The list endpoint is cursor-paginated: { next, previous, results }.
+  // Pass the `next` URL of the previous page to load the following one.
+  return apiRequest(next || "/videos/").then((data) =>
+    Array.isArray(data)
+      ? { results: data, next: null }
+      : { results: data.results, next: data.next }
+  );
 }
 
 export function uploadVideo(formData) {
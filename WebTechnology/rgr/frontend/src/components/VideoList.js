@@ -5,14 +5,17 @@ import "../VideoList.css";
 
 const VideoList = () => {
   const [videos, setVideos] = useState([]);
+  const [nextUrl, setNextUrl] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   useEffect(() => {
     const fetchVideos = async () => {
       try {
         setIsLoading(true);
         const response = await axios.get("http://localhost:8000/api/videos/");
-        setVideos(response.data);
+        setVideos(response.data.results ?? response.data);
+        setNextUrl(response.data.next ?? null);
       } catch (error) {
         console.error("Failed to fetch videos", error);
       } finally {
@@ -23,6 +26,20 @@ const VideoList = () => {
     fetchVideos();
   }, []);
 
+  // The list is cursor-paginated: follow `next` to append the following page
+  const loadMore = async () => {
+    try {
+      setIsLoadingMore(true);
+      const response = await axios.get(nextUrl);
+      setVideos((prev) => [...prev, ...response.data.results]);
+      setNextUrl(response.data.next);
+    } catch (error) {
+      console.error("Failed to fetch more videos", error);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const getThumbnailUrl = (videoId) => {
     return `http://localhost:8000/api/videos/${videoId}/thumbnail`;
   };
@@ -77,6 +94,16 @@ const VideoList = () => {
           ))}
         </div>
       )}
+
+      {!isLoading && nextUrl && (
+        <button
+          className="load-more-btn"
+          onClick={loadMore}
+          disabled={isLoadingMore}
+        >
+          {isLoadingMore ? "Loading..." : "Load more"}
+        </button>
+      )}
     </div>
   );
 };
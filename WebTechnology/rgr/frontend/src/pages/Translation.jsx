@@ -35,14 +35,16 @@ const messages = [
 
 function Translation() {
   const [videos, setVideos] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [currentIndex, setCurrentIndex] = useState(0);
 
   useEffect(() => {
     let active = true;
     fetchVideos()
-      .then((data) => {
+      .then((page) => {
         if (active) {
-          setVideos(data);
+          setVideos(page.results);
+          setNextPage(page.next);
         }
       })
       .catch(() => {
@@ -61,7 +63,17 @@ function Translation() {
   }, [videos, currentIndex]);
 
   const handleNextVideo = () => {
-    if (videos.length > 1) {
+    const isLast = currentIndex % videos.length === videos.length - 1;
+    if (isLast && nextPage) {
+      // Past the loaded page: fetch the next one and continue with its first video
+      fetchVideos(nextPage)
+        .then((page) => {
+          setVideos((prev) => [...prev, ...page.results]);
+          setNextPage(page.next);
+          setCurrentIndex(videos.length);
+        })
+        .catch(() => setNextPage(null));
+    } else if (videos.length > 1) {
       setCurrentIndex((prev) => (prev + 1) % videos.length);
     }
   };
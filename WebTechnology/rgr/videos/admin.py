@@ -1,9 +1,15 @@
 from django.contrib import admin
 
-from .models import Video
+from .models import UploadSession, Video
 
 
 @admin.register(Video)
 class VideoAdmin(admin.ModelAdmin):
     list_display = ("title", "uploaded_by", "created_at", "views")
     search_fields = ("title", "uploaded_by__username")
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ("filename", "owner", "offset", "length", "status", "created_at")
+    list_filter = ("status",)
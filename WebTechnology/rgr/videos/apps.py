@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class VideosConfig(AppConfig):
     name = 'videos'
+    default_auto_field = 'django.db.models.BigAutoField'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,43 @@
+"""Cache of rendered video list pages.
+
+Pages are stored under a key made of a version number and the full request
+URL (host, cursor and page size). Any change to a video bumps the version,
+which invalidates every cached page at once without enumerating keys.
+
+The version lives in ``VIDEO_LIST_VERSION_CACHE``, which must not evict it:
+a culled version would restart at 1 and could serve old pages again. Pages
+and version are per process with ``LocMemCache``, so a bump is seen at once
+only by the process that made the change; other workers serve their pages
+until ``VIDEO_LIST_CACHE_SECONDS`` pass. A shared cache makes the
+invalidation immediate everywhere.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+VERSION_KEY = "videos:list:version"
+
+
+def _version_cache():
+    return caches[getattr(settings, "VIDEO_LIST_VERSION_CACHE", "default")]
+
+
+def list_version():
+    return _version_cache().get_or_set(VERSION_KEY, 1, None)
+
+
+def invalidate_list_cache():
+    version_cache = _version_cache()
+    version_cache.add(VERSION_KEY, 1, None)
+    version_cache.incr(VERSION_KEY)
+
+
+def list_cache_key(request):
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"videos:list:{list_version()}:{url}"
+
+
+def list_cache_timeout():
+    return getattr(settings, "VIDEO_LIST_CACHE_SECONDS", 60)
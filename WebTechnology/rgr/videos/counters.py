@@ -0,0 +1,173 @@
+"""Write-behind view counting.
+
+``record_view`` does not touch the database: it atomically increments a
+per-video pending counter in the ``VIDEO_VIEWS_CACHE`` cache and at most once
+per ``VIDEO_VIEWS_FLUSH_INTERVAL`` seconds per process folds the pending
+counters into ``Video.views`` with ``F("views") + n`` updates, one query per
+distinct increment. Each process remembers the ids it incremented and the
+flush inside a request reads only those counters; ``flush_views()`` without
+ids (``manage.py flush_video_views``) reads the keys of all video ids in
+batches. The counters cache must not evict entries (``CACHES["video-views"]``
+in the settings); otherwise pending views are lost.
+
+A playback is counted once: only requests without ``Range`` or with a range
+starting at byte 0 are considered, and a viewer (session, user or client
+address) is counted once per video within ``VIDEO_VIEWS_DEDUP_SECONDS``. The
+dedup markers live in ``VIDEO_VIEWS_DEDUP_CACHE``, which may evict them. The
+client address is ``REMOTE_ADDR`` unless ``VIDEO_VIEWS_NUM_PROXIES`` trusted
+proxies append to ``X-Forwarded-For``.
+
+With the default per-process ``LocMemCache`` each worker keeps its own buffer
+and flushes it on the interval and at exit; with a shared cache (e.g. Redis
+with ``maxmemory-policy noeviction``) ``manage.py flush_video_views`` also
+flushes counters left behind by workers that died before flushing.
+"""
+
+import atexit
+import hashlib
+import os
+import threading
+from collections import defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+
+from .caching import invalidate_list_cache
+from .models import Video
+
+KEY_PREFIX = "video-views"
+FLUSH_BATCH_SIZE = 500
+
+# ids whose counters this process incremented since its last flush
+_recorded_ids = set()
+_recorded_lock = threading.Lock()
+
+
+def _cache():
+    return caches[getattr(settings, "VIDEO_VIEWS_CACHE", "default")]
+
+
+def _dedup_cache():
+    return caches[getattr(settings, "VIDEO_VIEWS_DEDUP_CACHE", "default")]
+
+
+def _counter_key(video_id):
+    return f"{KEY_PREFIX}:pending:{video_id}"
+
+
+def client_address(request):
+    """``REMOTE_ADDR``, or the address the outermost trusted proxy put in ``X-Forwarded-For``.
+
+    ``X-Forwarded-For`` is sent by the client and is only read when
+    ``VIDEO_VIEWS_NUM_PROXIES`` proxies in front of the app append to it.
+    """
+    remote_addr = request.META.get("REMOTE_ADDR", "")
+    num_proxies = getattr(settings, "VIDEO_VIEWS_NUM_PROXIES", 0)
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    if not num_proxies or not forwarded:
+        return remote_addr
+    addresses = forwarded.split(",")
+    return addresses[-min(num_proxies, len(addresses))].strip()
+
+
+def viewer_key(request):
+    """Identify the viewer by session, user or client address."""
+    session = getattr(request, "session", None)
+    if session is not None and session.session_key:
+        return f"s:{session.session_key}"
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"u:{user.pk}"
+    return "a:" + hashlib.sha1(client_address(request).encode()).hexdigest()
+
+
+def starts_playback(request):
+    """A request opens a playback if it has no ``Range`` or its first range starts at byte 0."""
+    range_header = request.headers.get("Range", "")
+    if not range_header:
+        return True
+    _, _, spec = range_header.partition("=")
+    return spec.split(",")[0].strip().startswith("0-")
+
+
+def record_view(request, video_id):
+    """Count a view of ``video_id``; returns True if the request was counted."""
+    if not starts_playback(request):
+        return False
+    dedup_seconds = getattr(settings, "VIDEO_VIEWS_DEDUP_SECONDS", 30 * 60)
+    seen_key = f"{KEY_PREFIX}:seen:{video_id}:{viewer_key(request)}"
+    if not _dedup_cache().add(seen_key, 1, dedup_seconds):
+        return False
+
+    cache = _cache()
+    key = _counter_key(video_id)
+    cache.add(key, 0, None)
+    cache.incr(key)
+    with _recorded_lock:
+        _recorded_ids.add(video_id)
+
+    interval = getattr(settings, "VIDEO_VIEWS_FLUSH_INTERVAL", 30)
+    if cache.add(f"{KEY_PREFIX}:flush-lock:{os.getpid()}", 1, interval):
+        flush_recorded_views()
+    return True
+
+
+def pending_views(video_ids=None):
+    """Pending increments per video id that are not yet in the database.
+
+    Only the counters of ``video_ids`` are read; ``None`` reads all videos.
+    """
+    cache = _cache()
+    pending = {}
+    if video_ids is None:
+        ids = Video.objects.order_by().values_list("pk", flat=True).iterator(chunk_size=FLUSH_BATCH_SIZE)
+    else:
+        ids = iter(list(video_ids))
+    while batch := list(islice(ids, FLUSH_BATCH_SIZE)):
+        counts = cache.get_many([_counter_key(video_id) for video_id in batch])
+        for video_id in batch:
+            if counts.get(_counter_key(video_id)):
+                pending[video_id] = counts[_counter_key(video_id)]
+    return pending
+
+
+def flush_views(video_ids=None):
+    """Write pending increments to the database; returns ``{video_id: increment}``.
+
+    ``video_ids`` limits the flush to these videos; ``None`` flushes all of them.
+    """
+    cache = _cache()
+    flushed = pending_views(video_ids)
+    by_increment = defaultdict(list)
+    for video_id, count in flushed.items():
+        # decr by the amount read so increments arriving meanwhile stay pending
+        cache.decr(_counter_key(video_id), count)
+        by_increment[count].append(video_id)
+    for count, video_ids in by_increment.items():
+        Video.objects.filter(pk__in=video_ids).update(views=F("views") + count)
+    if flushed:
+        invalidate_list_cache()
+    return flushed
+
+
+def flush_recorded_views():
+    """Flush the counters this process incremented since its last flush."""
+    with _recorded_lock:
+        video_ids = set(_recorded_ids)
+        _recorded_ids.clear()
+    try:
+        return flush_views(video_ids)
+    except Exception:
+        with _recorded_lock:
+            _recorded_ids.update(video_ids)
+        raise
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        flush_recorded_views()
+    except Exception:
+        pass
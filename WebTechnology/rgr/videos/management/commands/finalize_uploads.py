@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from videos.models import UploadSession
+from videos.uploads import retry_finalize, stale_sessions
+
+
+class Command(BaseCommand):
+    help = (
+        "Finalize uploads left in 'processing' (e.g. after a restart lost the "
+        "background queue) and optionally delete abandoned unfinished uploads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale-minutes",
+            type=int,
+            default=30,
+            help="Retry sessions that have been processing for longer than this (default: 30)",
+        )
+        parser.add_argument(
+            "--expire-hours",
+            type=int,
+            default=0,
+            help="Also delete unfinished uploads idle for longer than this (default: keep)",
+        )
+
+    def handle(self, *args, **options):
+        for session in stale_sessions(options["stale_minutes"]):
+            try:
+                video = retry_finalize(session)
+            except Exception as exc:
+                self.stdout.write(self.style.ERROR(f"{session.pk}: failed: {exc}"))
+                continue
+            if video is None:
+                self.stdout.write(f"{session.pk}: claimed by another worker")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{session.pk}: video {video.pk}"))
+
+        if options["expire_hours"]:
+            cutoff = timezone.now() - timedelta(hours=options["expire_hours"])
+            expired = UploadSession.objects.filter(
+                status=UploadSession.Status.UPLOADING, updated_at__lt=cutoff
+            )
+            for session in expired:
+                session_id = session.pk
+                session.discard()
+                self.stdout.write(f"{session_id}: expired")
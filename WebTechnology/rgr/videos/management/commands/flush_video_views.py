@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from videos.counters import flush_views
+
+
+class Command(BaseCommand):
+    help = "Write buffered video view counts to the database."
+
+    def handle(self, *args, **options):
+        flushed = flush_views()
+        total = sum(flushed.values())
+        self.stdout.write(
+            self.style.SUCCESS(f"Flushed {total} view(s) for {len(flushed)} video(s).")
+        )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from videos.models import Video
+from videos.processing import process_video
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnails, sprite sheets and HLS renditions for videos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int, help="Video ids (default: not processed yet)")
+        parser.add_argument("--all", action="store_true", help="Reprocess every video")
+
+    def handle(self, *args, **options):
+        videos = Video.objects.all()
+        if options["ids"]:
+            videos = videos.filter(pk__in=options["ids"])
+        elif not options["all"]:
+            videos = videos.exclude(media_status=Video.MediaStatus.READY)
+        for video_id in videos.values_list("pk", flat=True):
+            process_video(video_id)
+            video = Video.objects.get(pk=video_id)
+            self.stdout.write(f"{video_id}: {video.media_status} {video.media_error}".rstrip())
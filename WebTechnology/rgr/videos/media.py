@@ -0,0 +1,160 @@
+"""ffmpeg-based derivatives of an uploaded video: thumbnail, sprite sheet and HLS renditions.
+
+Everything here is plain Python with no Django imports, so ``render_media``
+can be sent to a worker process (``videos.tasks.run_in_process``). Paths
+are absolute filesystem paths; the result describes the files relative to
+``out_dir``.
+"""
+
+import json
+import math
+import os
+import subprocess
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Rendition:
+    height: int
+    video_kbps: int
+    audio_kbps: int
+
+    @property
+    def name(self):
+        return f"{self.height}p"
+
+    @property
+    def bandwidth(self):
+        # Peak bandwidth for the master playlist: nominal rate plus ~10% container overhead
+        return int((self.video_kbps + self.audio_kbps) * 1000 * 1.1)
+
+
+DEFAULT_RENDITIONS = (
+    Rendition(360, 800, 96),
+    Rendition(720, 2800, 128),
+    Rendition(1080, 5000, 192),
+)
+
+
+class MediaError(Exception):
+    pass
+
+
+def _run(command):
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise MediaError(f"{os.path.basename(command[0])} failed: {result.stderr.strip()[-2000:]}")
+    return result.stdout
+
+
+def probe(ffprobe, source):
+    """Duration (s), width, height and whether the file has audio."""
+    info = json.loads(
+        _run([ffprobe, "-v", "error", "-print_format", "json", "-show_format", "-show_streams", source])
+    )
+    video = next((s for s in info.get("streams", []) if s.get("codec_type") == "video"), None)
+    if video is None:
+        raise MediaError("No video stream")
+    has_audio = any(s.get("codec_type") == "audio" for s in info.get("streams", []))
+    duration = float(info.get("format", {}).get("duration") or video.get("duration") or 0)
+    return duration, int(video["width"]), int(video["height"]), has_audio
+
+
+def thumbnail_command(ffmpeg, source, dest, at_seconds, width=640):
+    return [
+        ffmpeg, "-y", "-v", "error", "-ss", f"{at_seconds:.3f}", "-i", source,
+        "-frames:v", "1", "-vf", f"scale={width}:-2", dest,
+    ]
+
+
+def sprite_layout(duration, interval, columns):
+    """Number of tiles and grid rows for one frame every ``interval`` seconds."""
+    tiles = max(1, math.ceil(duration / interval))
+    return tiles, math.ceil(tiles / columns)
+
+
+def sprite_command(ffmpeg, source, dest, interval, columns, rows, tile_width=160):
+    return [
+        ffmpeg, "-y", "-v", "error", "-i", source,
+        "-vf", f"fps=1/{interval},scale={tile_width}:-2,tile={columns}x{rows}",
+        "-frames:v", "1", dest,
+    ]
+
+
+def hls_command(ffmpeg, source, out_dir, rendition, has_audio, segment_seconds=6):
+    playlist = os.path.join(out_dir, f"{rendition.name}.m3u8")
+    command = [
+        ffmpeg, "-y", "-v", "error", "-i", source,
+        "-vf", f"scale=-2:{rendition.height}",
+        "-c:v", "libx264", "-preset", "veryfast", "-profile:v", "main",
+        "-b:v", f"{rendition.video_kbps}k",
+        "-maxrate", f"{int(rendition.video_kbps * 1.07)}k",
+        "-bufsize", f"{rendition.video_kbps * 2}k",
+        # Keyframes on segment boundaries so every segment starts decodable
+        "-force_key_frames", f"expr:gte(t,n_forced*{segment_seconds})",
+    ]
+    command += ["-c:a", "aac", "-b:a", f"{rendition.audio_kbps}k"] if has_audio else ["-an"]
+    command += [
+        "-f", "hls", "-hls_time", str(segment_seconds), "-hls_playlist_type", "vod",
+        "-hls_segment_filename", os.path.join(out_dir, f"{rendition.name}_%04d.ts"),
+        playlist,
+    ]
+    return command
+
+
+def master_playlist(renditions, source_width, source_height):
+    """HLS master playlist text listing ``renditions`` (lowest bitrate first)."""
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for rendition in sorted(renditions, key=lambda r: r.bandwidth):
+        width = int(round(source_width * rendition.height / source_height / 2)) * 2
+        lines.append(
+            f"#EXT-X-STREAM-INF:BANDWIDTH={rendition.bandwidth},"
+            f"RESOLUTION={width}x{rendition.height}"
+        )
+        lines.append(f"{rendition.name}.m3u8")
+    return "\n".join(lines) + "\n"
+
+
+def select_renditions(renditions, source_height):
+    """Renditions not taller than the source; at least the smallest one."""
+    chosen = [r for r in renditions if r.height <= source_height]
+    return chosen or [min(renditions, key=lambda r: r.height)]
+
+
+def render_media(ffmpeg, ffprobe, source, out_dir, renditions=DEFAULT_RENDITIONS,
+                 sprite_interval=10, sprite_columns=10, segment_seconds=6):
+    """Produce thumbnail.jpg, sprite.jpg and hls/ in ``out_dir``; returns their description."""
+    duration, width, height, has_audio = probe(ffprobe, source)
+    os.makedirs(out_dir, exist_ok=True)
+
+    thumbnail = os.path.join(out_dir, "thumbnail.jpg")
+    _run(thumbnail_command(ffmpeg, source, thumbnail, min(duration * 0.1, 5.0)))
+
+    tiles, rows = sprite_layout(duration, sprite_interval, sprite_columns)
+    sprite = os.path.join(out_dir, "sprite.jpg")
+    _run(sprite_command(ffmpeg, source, sprite, sprite_interval, sprite_columns, rows))
+
+    hls_dir = os.path.join(out_dir, "hls")
+    os.makedirs(hls_dir, exist_ok=True)
+    chosen = select_renditions(renditions, height)
+    for rendition in chosen:
+        _run(hls_command(ffmpeg, source, hls_dir, rendition, has_audio, segment_seconds))
+    with open(os.path.join(hls_dir, "master.m3u8"), "w") as master:
+        master.write(master_playlist(chosen, width, height))
+
+    return {
+        "duration": duration,
+        "thumbnail": "thumbnail.jpg",
+        "sprite": {
+            "path": "sprite.jpg",
+            "interval": sprite_interval,
+            "columns": sprite_columns,
+            "rows": rows,
+            "tiles": tiles,
+        },
+        "hls": "hls/master.m3u8",
+        "renditions": [
+            {"name": r.name, "height": r.height, "bandwidth": r.bandwidth, "playlist": f"hls/{r.name}.m3u8"}
+            for r in chosen
+        ],
+    }
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0003_uploadsession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='duration',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='hls_playlist',
+            field=models.FileField(blank=True, upload_to='videos/'),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='media_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='media_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed'), ('skipped', 'Skipped')], default='pending', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='renditions',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='sprite',
+            field=models.FileField(blank=True, upload_to='videos/'),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='sprite_info',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
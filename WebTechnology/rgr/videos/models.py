@@ -1,3 +1,6 @@
+import os
+import uuid
+
 from django.conf import settings
 from django.db import models
 
@@ -16,8 +19,76 @@ class Video(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     views = models.PositiveIntegerField(default=0)
 
+    class MediaStatus(models.TextChoices):
+        PENDING = "pending"
+        PROCESSING = "processing"
+        READY = "ready"
+        FAILED = "failed"
+        SKIPPED = "skipped"
+
+    # Derivatives produced by videos.processing, stored next to ``file``
+    media_status = models.CharField(
+        max_length=16, choices=MediaStatus.choices, default=MediaStatus.PENDING
+    )
+    media_error = models.TextField(blank=True)
+    duration = models.FloatField(null=True, blank=True)
+    sprite = models.FileField(upload_to="videos/", blank=True)
+    sprite_info = models.JSONField(default=dict, blank=True)
+    hls_playlist = models.FileField(upload_to="videos/", blank=True)
+    renditions = models.JSONField(default=list, blank=True)
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at"], name="video_created_at_idx")]
 
     def __str__(self) -> str:
         return self.title
+
+
+class UploadSession(models.Model):
+    """A resumable upload: chunks are appended to ``part_path`` until ``offset == length``."""
+
+    class Status(models.TextChoices):
+        UPLOADING = "uploading"
+        PROCESSING = "processing"
+        DONE = "done"
+        FAILED = "failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+    )
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    filename = models.CharField(max_length=255)
+    length = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.UPLOADING)
+    error = models.TextField(blank=True)
+    video = models.OneToOneField(
+        Video,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="upload_session",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.offset}/{self.length})"
+
+    @property
+    def part_path(self):
+        return os.path.join(settings.MEDIA_ROOT, "uploads", f"{self.pk}.part")
+
+    def discard(self):
+        """Delete the session together with its part file."""
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
+        self.delete()
@@ -0,0 +1,128 @@
+"""Django side of media processing: schedules ``videos.media`` and stores its results.
+
+``schedule_processing`` queues ``process_video`` on the background thread
+pool once the current transaction commits; ``process_video`` hands the
+ffmpeg work to the process pool and writes the produced paths back to the
+``Video``. Derivatives go to ``<file name without extension>_<pk>/`` next to
+the original; ``reset_media`` drops them when the file is replaced. Without ffmpeg/ffprobe or on non-local storage the video is
+marked ``skipped`` and keeps being served from the original file.
+"""
+
+import os
+import shutil
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from . import media, tasks
+from .caching import invalidate_list_cache
+from .models import Video
+
+
+def _binary(setting, default):
+    return shutil.which(getattr(settings, setting, default) or default)
+
+
+def renditions():
+    configured = getattr(settings, "VIDEO_HLS_RENDITIONS", None)
+    if not configured:
+        return media.DEFAULT_RENDITIONS
+    return tuple(media.Rendition(*spec) for spec in configured)
+
+
+def _derived_dir(file_name, video_id):
+    return f"{os.path.splitext(file_name)[0]}_{video_id}"
+
+
+def derived_dir(video):
+    return _derived_dir(video.file.name, video.pk)
+
+
+def schedule_processing(video_id):
+    if getattr(settings, "VIDEO_MEDIA_PROCESSING", True):
+        transaction.on_commit(lambda: tasks.submit(process_video, video_id))
+
+
+def _update(video_id, **fields):
+    Video.objects.filter(pk=video_id).update(**fields)
+    invalidate_list_cache()
+
+
+def reset_media(video, old_file_name):
+    """Forget the media rendered from ``old_file_name`` after ``video.file`` was replaced.
+
+    Resets the media fields to ``pending`` (a thumbnail is kept unless it was
+    generated) and removes the old derivatives directory.
+    """
+    old_dir = _derived_dir(old_file_name, video.pk)
+    fields = {
+        "media_status": Video.MediaStatus.PENDING,
+        "media_error": "",
+        "duration": None,
+        "sprite": "",
+        "sprite_info": {},
+        "hls_playlist": "",
+        "renditions": [],
+    }
+    if video.thumbnail and video.thumbnail.name.startswith(old_dir + "/"):
+        fields["thumbnail"] = None
+    _update(video.pk, **fields)
+    for name, value in fields.items():
+        setattr(video, name, value)
+    try:
+        shutil.rmtree(default_storage.path(old_dir), ignore_errors=True)
+    except NotImplementedError:
+        pass
+
+
+def process_video(video_id):
+    """Render thumbnail, sprite sheet and HLS renditions for one video (blocking)."""
+    video = Video.objects.get(pk=video_id)
+    ffmpeg = _binary("FFMPEG_BINARY", "ffmpeg")
+    ffprobe = _binary("FFPROBE_BINARY", "ffprobe")
+    try:
+        source = video.file.path
+    except NotImplementedError:
+        source = None
+    if not (ffmpeg and ffprobe and source):
+        _update(
+            video_id,
+            media_status=Video.MediaStatus.SKIPPED,
+            media_error="ffmpeg/ffprobe not found" if source else "Storage has no local paths",
+        )
+        return None
+
+    base = derived_dir(video)
+    _update(video_id, media_status=Video.MediaStatus.PROCESSING, media_error="")
+    try:
+        result = tasks.run_in_process(
+            media.render_media,
+            ffmpeg,
+            ffprobe,
+            source,
+            default_storage.path(base),
+            renditions(),
+            sprite_interval=getattr(settings, "VIDEO_SPRITE_INTERVAL", 10),
+            segment_seconds=getattr(settings, "VIDEO_HLS_SEGMENT_SECONDS", 6),
+        )
+    except Exception as exc:
+        _update(video_id, media_status=Video.MediaStatus.FAILED, media_error=str(exc))
+        return None
+
+    sprite = result["sprite"]
+    fields = {
+        "media_status": Video.MediaStatus.READY,
+        "duration": result["duration"],
+        "sprite": f"{base}/{sprite.pop('path')}",
+        "sprite_info": sprite,
+        "hls_playlist": f"{base}/{result['hls']}",
+        "renditions": [
+            {**rendition, "playlist": f"{base}/{rendition['playlist']}"}
+            for rendition in result["renditions"]
+        ],
+    }
+    if not video.thumbnail:
+        fields["thumbnail"] = f"{base}/{result['thumbnail']}"
+    _update(video_id, **fields)
+    return result
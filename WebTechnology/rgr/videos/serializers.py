@@ -1,7 +1,8 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from .models import Video
+from .models import UploadSession, Video
 
 User = get_user_model()
 
@@ -26,6 +27,9 @@ class VideoSerializer(serializers.ModelSerializer):
     uploaded_by = serializers.CharField(source="uploaded_by.username", read_only=True)
     file_url = serializers.SerializerMethodField()
     thumbnail_url = serializers.SerializerMethodField()
+    sprite_url = serializers.SerializerMethodField()
+    hls_url = serializers.SerializerMethodField()
+    renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Video
@@ -39,26 +43,74 @@ class VideoSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "views",
+            "duration",
+            "media_status",
+            "sprite_url",
+            "sprite_info",
+            "hls_url",
+            "renditions",
         )
 
-    def get_file_url(self, obj):
+    def _absolute_url(self, url):
         request = self.context.get("request")
-        if obj.file and request:
-            return request.build_absolute_uri(obj.file.url)
-        if obj.file:
-            return obj.file.url
-        return ""
+        if request is None or not url.startswith("/"):
+            return url
+        # Scheme and host are resolved once per response, not twice per row
+        base = self.context.get("_base_uri")
+        if base is None:
+            base = self.context["_base_uri"] = request.build_absolute_uri("/").rstrip("/")
+        return base + url
+
+    def get_file_url(self, obj):
+        return self._absolute_url(obj.file.url) if obj.file else ""
 
     def get_thumbnail_url(self, obj):
-        request = self.context.get("request")
-        if obj.thumbnail and request:
-            return request.build_absolute_uri(obj.thumbnail.url)
-        if obj.thumbnail:
-            return obj.thumbnail.url
-        return ""
+        return self._absolute_url(obj.thumbnail.url) if obj.thumbnail else ""
+
+    def get_sprite_url(self, obj):
+        return self._absolute_url(obj.sprite.url) if obj.sprite else ""
+
+    def get_hls_url(self, obj):
+        return self._absolute_url(obj.hls_playlist.url) if obj.hls_playlist else ""
+
+    def get_renditions(self, obj):
+        storage = obj.hls_playlist.storage
+        return [
+            {
+                "name": rendition["name"],
+                "height": rendition["height"],
+                "bandwidth": rendition["bandwidth"],
+                "url": self._absolute_url(storage.url(rendition["playlist"])),
+            }
+            for rendition in obj.renditions
+        ]
 
 
 class VideoCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Video
         fields = ("id", "title", "description", "file", "thumbnail")
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = (
+            "id",
+            "title",
+            "description",
+            "filename",
+            "length",
+            "offset",
+            "status",
+            "error",
+            "video",
+            "created_at",
+        )
+        read_only_fields = ("offset", "status", "error", "video", "created_at")
+
+    def validate_length(self, value):
+        max_size = getattr(settings, "VIDEO_UPLOAD_MAX_SIZE", 10 * 1024 ** 3)
+        if value <= 0 or value > max_size:
+            raise serializers.ValidationError(f"Length must be between 1 and {max_size} bytes.")
+        return value
@@ -0,0 +1,259 @@
+"""Ranged file responses for video playback.
+
+Bytes are never read into memory as a whole: a single range is served by a
+``FileResponse`` over a length-limited view of the file (WSGI servers with
+``wsgi.file_wrapper`` support send it with ``os.sendfile`` from the current
+offset), several ranges as a ``multipart/byteranges`` stream read in
+``VIDEO_STREAM_CHUNK_SIZE`` pieces. With ``VIDEO_STREAM_MODE`` set to
+``"x-accel"`` or ``"x-sendfile"`` the body is left to the front proxy.
+"""
+
+import io
+import mimetypes
+import os
+import uuid
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MAX_RANGES = 16
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class RangeFile(io.RawIOBase):
+    """Read-only window ``[start, start + length)`` of an open binary file.
+
+    ``tell``/``seek`` are relative to the window, so ``FileResponse`` derives
+    ``Content-Length`` from it, while ``fileno`` exposes the real descriptor
+    positioned at the absolute offset for ``sendfile``-capable servers.
+    """
+
+    def __init__(self, fileobj, start, length):
+        super().__init__()
+        self.fileobj = fileobj
+        self.start = start
+        self.length = length
+        self.position = 0
+        self.fileobj.seek(start)
+
+    @property
+    def name(self):
+        return getattr(self.fileobj, "name", "")
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def fileno(self):
+        return self.fileobj.fileno()
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.length
+        self.position = min(max(offset, 0), self.length)
+        self.fileobj.seek(self.start + self.position)
+        return self.position
+
+    def read(self, size=-1):
+        remaining = self.length - self.position
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        data = self.fileobj.read(size) if size else b""
+        self.position += len(data)
+        return data
+
+    def close(self):
+        self.fileobj.close()
+        super().close()
+
+
+def parse_range_header(header, size):
+    """Return a list of ``(start, end)`` byte ranges (inclusive) or ``None``.
+
+    ``None`` means the header is absent, malformed or asks for too many ranges
+    and must be ignored (RFC 7233, section 3.1). Overlapping or adjacent ranges
+    are merged. Raises ``RangeNotSatisfiable`` if no range overlaps the file.
+    """
+    if not header:
+        return None
+    units, _, spec = header.partition("=")
+    if units.strip().lower() != "bytes" or not spec:
+        return None
+    ranges = []
+    for part in spec.split(","):
+        start_str, sep, end_str = part.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if start_str:
+                start = int(start_str)
+                end = int(end_str) if end_str else size - 1
+                if end_str and end < start:
+                    return None
+            elif end_str:
+                suffix = int(end_str)
+                if suffix == 0:
+                    continue
+                start, end = max(size - suffix, 0), size - 1
+            else:
+                return None
+        except ValueError:
+            return None
+        if start < 0 or start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+    if not ranges:
+        raise RangeNotSatisfiable
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end + 1:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+    if len(merged) > MAX_RANGES:
+        return None
+    return merged
+
+
+def file_etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _if_range_matches(header, etag, mtime):
+    if not header:
+        return True
+    header = header.strip()
+    if header.startswith('"'):
+        return header == etag
+    date = parse_http_date_safe(header)
+    return date is not None and int(mtime) == date
+
+
+def _not_modified(request, etag, mtime):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+    return since is not None and int(mtime) <= since
+
+
+def _iter_file(path, ranges, chunk_size, boundary=None, content_type="", size=0):
+    """Yield file ranges in bounded chunks, framed as multipart if ``boundary`` is set."""
+    with open(path, "rb") as fileobj:
+        for start, end in ranges:
+            if boundary:
+                yield (
+                    f"\r\n--{boundary}\r\nContent-Type: {content_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+                ).encode()
+            fileobj.seek(start)
+            remaining = end - start + 1
+            while remaining:
+                data = fileobj.read(min(chunk_size, remaining))
+                if not data:
+                    return
+                remaining -= len(data)
+                yield data
+        if boundary:
+            yield f"\r\n--{boundary}--\r\n".encode()
+
+
+def _multipart_length(ranges, boundary, content_type, size):
+    length = len(f"\r\n--{boundary}--\r\n")
+    for start, end in ranges:
+        length += len(
+            f"\r\n--{boundary}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n".encode()
+        )
+        length += end - start + 1
+    return length
+
+
+def _accel_response(path, name, content_type, mode):
+    # Percent-encoded: Django would MIME-encode a non-latin-1 header value,
+    # which neither nginx nor mod_xsendfile decodes; both unquote the path.
+    response = HttpResponse(content_type=content_type)
+    if mode == "x-accel":
+        prefix = getattr(settings, "VIDEO_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = quote(prefix.rstrip("/") + "/" + name.lstrip("/"))
+    else:
+        response["X-Sendfile"] = quote(path)
+    return response
+
+
+def ranged_file_response(request, path, name=""):
+    """Serve ``path`` honouring ``Range``, ``If-Range`` and conditional GET headers.
+
+    ``name`` is the storage-relative file name used to build the
+    ``X-Accel-Redirect`` location.
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    etag = file_etag(stat)
+    last_modified = http_date(stat.st_mtime)
+
+    mode = getattr(settings, "VIDEO_STREAM_MODE", "django")
+    if mode in ("x-accel", "x-sendfile"):
+        response = _accel_response(path, name, content_type, mode)
+    elif _not_modified(request, etag, stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        response = _django_response(request, path, size, content_type, etag, stat.st_mtime)
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    return response
+
+
+def _django_response(request, path, size, content_type, etag, mtime):
+    chunk_size = getattr(settings, "VIDEO_STREAM_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    ranges = None
+    if _if_range_matches(request.headers.get("If-Range"), etag, mtime):
+        try:
+            ranges = parse_range_header(request.headers.get("Range", ""), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if ranges is None:
+        response = FileResponse(open(path, "rb"), content_type=content_type)
+        response.block_size = chunk_size
+        return response
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response = FileResponse(
+            RangeFile(open(path, "rb"), start, end - start + 1),
+            status=206,
+            content_type=content_type,
+        )
+        response.block_size = chunk_size
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return response
+
+    boundary = uuid.uuid4().hex
+    response = StreamingHttpResponse(
+        _iter_file(path, ranges, chunk_size, boundary, content_type, size),
+        status=206,
+        content_type=f"multipart/byteranges; boundary={boundary}",
+    )
+    response["Content-Length"] = str(_multipart_length(ranges, boundary, content_type, size))
+    return response
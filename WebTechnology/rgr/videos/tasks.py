@@ -0,0 +1,74 @@
+"""Local background queues for work that must not run on request workers.
+
+Tasks run in a process-wide ``ThreadPoolExecutor`` with
+``VIDEO_TASK_WORKERS`` threads. Each task closes its database connection when
+done. CPU-bound steps without database access (``videos.media``) go to a
+``ProcessPoolExecutor`` with ``VIDEO_MEDIA_WORKERS`` processes via
+``run_in_process``. With ``VIDEO_TASKS_EAGER = True`` (tests) both run inline.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_process_executor = None
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "VIDEO_TASK_WORKERS", 2),
+                thread_name_prefix="video-task",
+            )
+        return _executor
+
+
+def _get_process_executor():
+    global _process_executor
+    with _lock:
+        if _process_executor is None:
+            # "spawn": forking a threaded server process is unsafe
+            _process_executor = ProcessPoolExecutor(
+                max_workers=getattr(settings, "VIDEO_MEDIA_WORKERS", 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_executor
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", func.__name__)
+        raise
+    finally:
+        connection.close()
+
+
+def submit(func, *args, **kwargs):
+    """Run ``func(*args, **kwargs)`` on the background queue."""
+    if getattr(settings, "VIDEO_TASKS_EAGER", False):
+        return func(*args, **kwargs)
+    return _get_executor().submit(_run, func, args, kwargs)
+
+
+def run_in_process(func, *args, **kwargs):
+    """Run ``func`` in the worker process pool and wait for its result.
+
+    ``func`` must be importable and must not use the database. Call it from a
+    background task, never from a request.
+    """
+    if getattr(settings, "VIDEO_TASKS_EAGER", False):
+        return func(*args, **kwargs)
+    return _get_process_executor().submit(func, *args, **kwargs).result()
@@ -1,8 +1,34 @@
+import base64
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+from datetime import timedelta
+from unittest import mock, skipUnless
+from urllib.parse import quote, unquote
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from . import media
+from .counters import flush_views, record_view
+from .models import UploadSession, Video
+from .processing import process_video
+from .uploads import UploadError, append_chunk
+
 User = get_user_model()
 
 
@@ -33,3 +59,490 @@ class VideoTests(APITestCase):
     def test_list_videos_public(self):
         response = self.client.get("/api/videos/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+def clear_caches():
+    for alias in caches:
+        caches[alias].clear()
+
+
+class VideoFileMixin:
+    content = bytes(range(256)) * 40
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        user = User.objects.create_user(username="streamer", password="stream1234")
+        self.video = Video.objects.create(
+            title="clip",
+            file=SimpleUploadedFile("clip.mp4", self.content, content_type="video/mp4"),
+            uploaded_by=user,
+        )
+        self.url = f"/api/videos/{self.video.pk}/stream/"
+
+
+class StreamTests(VideoFileMixin, APITestCase):
+
+    def test_full_file(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("ETag", response)
+
+    def test_single_range(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=100-199")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response["Content-Range"], f"bytes 100-199/{len(self.content)}")
+        self.assertEqual(response["Content-Length"], "100")
+        self.assertEqual(b"".join(response.streaming_content), self.content[100:200])
+
+    def test_open_ended_and_suffix_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=10000-")
+        self.assertEqual(b"".join(response.streaming_content), self.content[10000:])
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-24")
+        self.assertEqual(b"".join(response.streaming_content), self.content[-24:])
+
+    def test_multiple_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9, 500-509")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertTrue(response["Content-Type"].startswith("multipart/byteranges"))
+        body = b"".join(response.streaming_content)
+        self.assertEqual(len(body), int(response["Content-Length"]))
+        self.assertIn(self.content[0:10], body)
+        self.assertIn(f"Content-Range: bytes 500-509/{len(self.content)}".encode(), body)
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.content)}-")
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.content)}")
+
+    def test_if_range_mismatch_returns_full_file(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(VIDEO_STREAM_MODE="x-accel", VIDEO_ACCEL_REDIRECT_PREFIX="/protected/")
+    def test_x_accel_redirect(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected/{self.video.file.name}")
+        self.assertEqual(response.content, b"")
+
+    def test_accel_headers_percent_encode_non_ascii_names(self):
+        video = Video.objects.create(
+            title="клип",
+            file=SimpleUploadedFile("клип.mp4", self.content, content_type="video/mp4"),
+            uploaded_by=self.video.uploaded_by,
+        )
+        self.assertIn("клип", video.file.name)
+        url = f"/api/videos/{video.pk}/stream/"
+        with self.settings(VIDEO_STREAM_MODE="x-accel", VIDEO_ACCEL_REDIRECT_PREFIX="/protected/"):
+            header = self.client.get(url)["X-Accel-Redirect"]
+        self.assertEqual(header, "/protected/" + quote(video.file.name))
+        self.assertTrue(header.isascii())
+        with self.settings(VIDEO_STREAM_MODE="x-sendfile"):
+            header = self.client.get(url)["X-Sendfile"]
+        self.assertEqual(unquote(header), video.file.path)
+        self.assertTrue(header.isascii())
+
+
+@override_settings(VIDEO_VIEWS_FLUSH_INTERVAL=3600)
+class ViewCounterTests(VideoFileMixin, APITestCase):
+    def updates(self, queries):
+        return [q for q in queries if q["sql"].startswith("UPDATE") and "views" in q["sql"]]
+
+    def test_seeking_counts_one_playback(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, HTTP_RANGE="bytes=0-")
+            for start in range(1000, 10000, 500):
+                self.client.get(self.url, HTTP_RANGE=f"bytes={start}-")
+            self.client.get(self.url, HTTP_RANGE="bytes=0-")
+        self.assertEqual(len(self.updates(queries)), 1)
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.views, 1)
+
+    def test_database_write_rate(self):
+        # 50 viewers: the first request flushes, the rest stay buffered until the next flush
+        with CaptureQueriesContext(connection) as queries:
+            for viewer in range(50):
+                self.client.get(self.url, REMOTE_ADDR=f"10.0.0.{viewer}")
+        self.assertEqual(len(self.updates(queries)), 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(flush_views(), {self.video.pk: 49})
+        self.assertEqual(len(self.updates(queries)), 1)
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.views, 50)
+
+    def test_request_flush_reads_only_recorded_videos(self):
+        for i in range(3):
+            Video.objects.create(title=f"idle {i}", file=self.video.file.name, uploaded_by=self.video.uploaded_by)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(record_view(RequestFactory().get("/"), self.video.pk))
+        # the flush is a single UPDATE, without listing the videos
+        self.assertEqual([q["sql"].split()[0] for q in queries], ["UPDATE"])
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.views, 1)
+
+    def test_flush_command(self):
+        for viewer in range(3):
+            self.client.get(self.url, REMOTE_ADDR=f"10.0.1.{viewer}")
+        call_command("flush_video_views", stdout=io.StringIO())
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.views, 3)
+
+    def test_more_viewers_than_the_default_cache_holds(self):
+        # 1000 dedup markers overflow the default cache (MAX_ENTRIES=300); no view is lost
+        videos = [self.video] + [
+            Video.objects.create(title=f"clip {i}", file=self.video.file.name, uploaded_by=self.video.uploaded_by)
+            for i in range(4)
+        ]
+        factory = RequestFactory()
+        for viewer in range(1000):
+            request = factory.get("/", REMOTE_ADDR=f"10.1.{viewer // 256}.{viewer % 256}")
+            self.assertTrue(record_view(request, videos[viewer % len(videos)].pk))
+        flush_views()
+        views = dict(Video.objects.values_list("pk", "views"))
+        self.assertEqual(views, {video.pk: 200 for video in videos})
+
+    def test_forwarded_for_needs_trusted_proxies(self):
+        for forwarded in ("1.1.1.1", "2.2.2.2"):
+            self.client.get(self.url, REMOTE_ADDR="10.0.2.1", HTTP_X_FORWARDED_FOR=forwarded)
+        flush_views()
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.views, 1)
+
+        with self.settings(VIDEO_VIEWS_NUM_PROXIES=1):
+            for forwarded in ("1.1.1.1", "9.9.9.9, 2.2.2.2", "8.8.8.8, 2.2.2.2"):
+                self.client.get(self.url, REMOTE_ADDR="10.0.2.1", HTTP_X_FORWARDED_FOR=forwarded)
+        flush_views()
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.views, 3)
+
+
+class VideoListTests(APITestCase):
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+        self.users = [
+            User.objects.create_user(username=f"author{i}", password="author1234")
+            for i in range(5)
+        ]
+        for i in range(25):
+            Video.objects.create(
+                title=f"video {i}",
+                file=f"videos/{i}.mp4",
+                uploaded_by=self.users[i % len(self.users)],
+            )
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        # One query for the page with authors joined in, regardless of page size
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/videos/", {"page_size": 5})
+        self.assertEqual(len(response.data["results"]), 5)
+        cache.clear()
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/videos/", {"page_size": 25})
+        self.assertEqual(len(response.data["results"]), 25)
+        self.assertEqual(response.data["results"][0]["uploaded_by"], "author4")
+        self.assertEqual(
+            response.data["results"][0]["file_url"], "http://testserver/media/videos/24.mp4"
+        )
+
+    def test_cursor_pagination_walks_all_videos(self):
+        titles = []
+        url = "/api/videos/?page_size=10"
+        while url:
+            response = self.client.get(url)
+            titles += [video["title"] for video in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(titles, [f"video {i}" for i in range(24, -1, -1)])
+
+    def test_cached_page_and_invalidation(self):
+        first = self.client.get("/api/videos/")
+        with self.assertNumQueries(0):
+            cached = self.client.get("/api/videos/")
+        self.assertEqual(cached.data, first.data)
+
+        Video.objects.create(title="fresh", file="videos/fresh.mp4", uploaded_by=self.users[0])
+        response = self.client.get("/api/videos/")
+        self.assertEqual(response.data["results"][0]["title"], "fresh")
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    def test_conditional_get(self):
+        response = self.client.get("/api/videos/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/videos/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_update_writes_change_the_list(self):
+        # Flushed view counts bypass updated_at; the list must not answer 304
+        first = self.client.get("/api/videos/")
+        self.assertNotIn("Last-Modified", first)
+        video = Video.objects.latest("created_at")
+        record_view(RequestFactory().get("/"), video.pk)
+        flush_views()
+        response = self.client.get("/api/videos/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["views"], 1)
+        response = self.client.get("/api/videos/", HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@override_settings(VIDEO_TASKS_EAGER=True)
+class UploadTests(VideoFileMixin, APITestCase):
+    content = bytes(range(256)) * 64
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username="uploader", password="upload1234")
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            "/api/uploads/",
+            {"title": "big", "filename": "big.mp4", "length": len(self.content)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response["Upload-Offset"], "0")
+        self.url = response["Location"]
+
+    def patch(self, offset, chunk, checksum=None, url=None):
+        digest = base64.b64encode(hashlib.sha256(chunk).digest()).decode()
+        return self.client.generic(
+            "PATCH",
+            url or self.url,
+            chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+            HTTP_UPLOAD_CHECKSUM=checksum or f"sha256 {digest}",
+        )
+
+    def test_resumable_upload_creates_video(self):
+        half = len(self.content) // 2
+        response = self.patch(0, self.content[:half])
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.head(self.url)["Upload-Offset"], str(half))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.patch(half, self.content[half:])
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        session = UploadSession.objects.get()
+        self.assertEqual(session.status, UploadSession.Status.DONE)
+        with session.video.file.open("rb") as video_file:
+            self.assertEqual(video_file.read(), self.content)
+
+    def test_wrong_offset_conflicts(self):
+        response = self.patch(100, self.content[100:200])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response["Upload-Offset"], "0")
+
+    def test_concurrent_append_without_flock_conflicts(self):
+        session = UploadSession.objects.get()
+
+        class RacingStream(io.BytesIO):
+            # another request advances the offset while this chunk is being written
+            def read(self, size=-1):
+                UploadSession.objects.filter(pk=session.pk).update(offset=500)
+                return super().read(size)
+
+        chunk = self.content[:1000]
+        checksum = "sha256 " + base64.b64encode(hashlib.sha256(chunk).digest()).decode()
+        with mock.patch("videos.uploads.fcntl", None):
+            with self.assertRaises(UploadError) as raised:
+                append_chunk(session, RacingStream(chunk), 0, len(chunk), checksum)
+        self.assertEqual(raised.exception.status, status.HTTP_409_CONFLICT)
+        self.assertEqual(os.path.getsize(session.part_path), 0)
+        self.assertEqual(UploadSession.objects.get().offset, 0)
+
+    def test_checksum_mismatch_discards_chunk(self):
+        bad = "sha256 " + base64.b64encode(hashlib.sha256(b"other").digest()).decode()
+        response = self.patch(0, self.content[:1000], checksum=bad)
+        self.assertEqual(response.status_code, 460)
+        self.assertEqual(UploadSession.objects.get().offset, 0)
+        response = self.patch(0, self.content[:1000])
+        self.assertEqual(response["Upload-Offset"], "1000")
+
+    def test_other_users_cannot_append(self):
+        other = User.objects.create_user(username="intruder", password="intrude1234")
+        self.client.force_authenticate(other)
+        response = self.patch(0, self.content[:10])
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tus_creation_headers(self):
+        def b64(value):
+            return base64.b64encode(value.encode()).decode()
+
+        response = self.client.post(
+            "/api/uploads/",
+            HTTP_TUS_RESUMABLE="1.0.0",
+            HTTP_UPLOAD_LENGTH="10",
+            HTTP_UPLOAD_METADATA=f"filename {b64('клип.mp4')},filetype {b64('video/mp4')}",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response["Upload-Offset"], "0")
+        self.assertEqual(response["Tus-Version"], "1.0.0")
+        session = UploadSession.objects.get(pk=response.data["id"])
+        self.assertEqual((session.filename, session.title, session.length), ("клип.mp4", "клип", 10))
+
+        response = self.client.post("/api/uploads/", HTTP_UPLOAD_LENGTH="10", HTTP_UPLOAD_METADATA="filename !")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_same_name_finalizes_do_not_overwrite(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.patch(0, self.content)
+        first = UploadSession.objects.get().video
+        response = self.client.post(
+            "/api/uploads/", {"title": "again", "filename": "big.mp4", "length": 4}, format="json"
+        )
+        # The second finalize sees the name as free, as if it raced the first one
+        available = default_storage.get_available_name
+        stale = iter([first.file.name])
+        with mock.patch.object(
+            default_storage,
+            "get_available_name",
+            side_effect=lambda name, max_length=None: next(stale, None) or available(name, max_length),
+        ), self.captureOnCommitCallbacks(execute=True):
+            self.patch(0, b"late", url=response["Location"])
+        second = UploadSession.objects.get(pk=response.data["id"]).video
+        self.assertNotEqual(second.file.name, first.file.name)
+        with first.file.open("rb") as video_file:
+            self.assertEqual(video_file.read(), self.content)
+        with second.file.open("rb") as video_file:
+            self.assertEqual(video_file.read(), b"late")
+
+    def test_finalize_uploads_retries_stale_sessions(self):
+        self.patch(0, self.content)  # on_commit never runs: the queued finalize is "lost"
+        session = UploadSession.objects.get()
+        self.assertEqual(session.status, UploadSession.Status.PROCESSING)
+        call_command("finalize_uploads", stdout=io.StringIO())
+        session.refresh_from_db()
+        self.assertEqual(session.status, UploadSession.Status.PROCESSING)
+
+        UploadSession.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        call_command("finalize_uploads", stdout=io.StringIO())
+        session.refresh_from_db()
+        self.assertEqual(session.status, UploadSession.Status.DONE)
+        with session.video.file.open("rb") as video_file:
+            self.assertEqual(video_file.read(), self.content)
+
+    def test_finalize_uploads_expires_abandoned_sessions(self):
+        self.patch(0, self.content[:100])
+        session = UploadSession.objects.get()
+        UploadSession.objects.update(updated_at=timezone.now() - timedelta(days=2))
+        call_command("finalize_uploads", "--expire-hours", "24", stdout=io.StringIO())
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(os.path.exists(session.part_path))
+
+
+class MediaCommandTests(APITestCase):
+    def test_renditions_not_taller_than_source(self):
+        chosen = media.select_renditions(media.DEFAULT_RENDITIONS, 720)
+        self.assertEqual([r.height for r in chosen], [360, 720])
+        chosen = media.select_renditions(media.DEFAULT_RENDITIONS, 240)
+        self.assertEqual([r.height for r in chosen], [360])
+
+    def test_master_playlist(self):
+        playlist = media.master_playlist(media.DEFAULT_RENDITIONS[:2], 1920, 1080)
+        lines = playlist.splitlines()
+        self.assertEqual(lines[0], "#EXTM3U")
+        self.assertIn("RESOLUTION=640x360", lines[2])
+        self.assertEqual(lines[3], "360p.m3u8")
+        self.assertEqual(lines[-1], "720p.m3u8")
+
+    def test_sprite_layout_and_silent_hls(self):
+        self.assertEqual(media.sprite_layout(95, 10, 4), (10, 3))
+        command = media.hls_command("ffmpeg", "in.mp4", "/out", media.DEFAULT_RENDITIONS[0], False)
+        self.assertIn("-an", command)
+        self.assertEqual(command[-1], "/out/360p.m3u8")
+
+
+@override_settings(VIDEO_TASKS_EAGER=True)
+class MediaProcessingTests(VideoFileMixin, APITestCase):
+    @override_settings(FFMPEG_BINARY="ffmpeg-that-does-not-exist")
+    def test_missing_ffmpeg_marks_video_skipped(self):
+        process_video(self.video.pk)
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.media_status, Video.MediaStatus.SKIPPED)
+        response = self.client.get(f"/api/videos/{self.video.pk}/")
+        self.assertEqual(response.data["hls_url"], "")
+        response = self.client.get(f"/api/videos/{self.video.pk}/thumbnail/")
+        self.assertEqual(response["Content-Type"], "image/png")
+
+    def test_serializer_exposes_renditions(self):
+        base = f"videos/clip_{self.video.pk}"
+        Video.objects.filter(pk=self.video.pk).update(
+            media_status=Video.MediaStatus.READY,
+            hls_playlist=f"{base}/hls/master.m3u8",
+            renditions=[
+                {"name": "360p", "height": 360, "bandwidth": 985600, "playlist": f"{base}/hls/360p.m3u8"}
+            ],
+        )
+        response = self.client.get(f"/api/videos/{self.video.pk}/")
+        self.assertEqual(
+            response.data["hls_url"], f"http://testserver/media/{base}/hls/master.m3u8"
+        )
+        self.assertEqual(
+            response.data["renditions"][0]["url"], f"http://testserver/media/{base}/hls/360p.m3u8"
+        )
+
+    def test_replacing_file_resets_media_and_reprocesses(self):
+        base = f"videos/clip_{self.video.pk}"
+        default_storage.save(f"{base}/hls/master.m3u8", io.BytesIO(b"#EXTM3U"))
+        Video.objects.filter(pk=self.video.pk).update(
+            media_status=Video.MediaStatus.READY,
+            duration=3.0,
+            thumbnail=f"{base}/thumbnail.jpg",
+            sprite=f"{base}/sprite.jpg",
+            sprite_info={"columns": 1},
+            hls_playlist=f"{base}/hls/master.m3u8",
+            renditions=[{"name": "360p", "playlist": f"{base}/hls/360p.m3u8"}],
+        )
+        self.client.force_authenticate(self.video.uploaded_by)
+        url = f"/api/videos/{self.video.pk}/"
+
+        with mock.patch("videos.views.schedule_processing") as schedule:
+            response = self.client.patch(url, {"title": "renamed"}, format="multipart")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            schedule.assert_not_called()
+            self.video.refresh_from_db()
+            self.assertEqual(self.video.media_status, Video.MediaStatus.READY)
+
+            new_file = SimpleUploadedFile("other.mp4", b"new content", content_type="video/mp4")
+            response = self.client.patch(url, {"file": new_file}, format="multipart")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            schedule.assert_called_once_with(self.video.pk)
+
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.media_status, Video.MediaStatus.PENDING)
+        self.assertFalse(self.video.thumbnail)
+        self.assertEqual(
+            (self.video.sprite.name, self.video.sprite_info, self.video.hls_playlist.name, self.video.renditions),
+            ("", {}, "", []),
+        )
+        self.assertIsNone(self.video.duration)
+        self.assertFalse(os.path.exists(default_storage.path(base)))
+
+    @skipUnless(shutil.which("ffmpeg") and shutil.which("ffprobe"), "ffmpeg is not installed")
+    def test_ffmpeg_renders_thumbnail_sprite_and_hls(self):
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-v", "error", "-f", "lavfi",
+                "-i", "testsrc=duration=3:size=320x240:rate=25", self.video.file.path,
+            ],
+            check=True,
+        )
+        process_video(self.video.pk)
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.media_status, Video.MediaStatus.READY, self.video.media_error)
+        self.assertTrue(self.video.thumbnail.storage.exists(self.video.thumbnail.name))
+        self.assertTrue(self.video.hls_playlist.storage.exists(self.video.hls_playlist.name))
+        self.assertEqual([r["height"] for r in self.video.renditions], [360])
@@ -0,0 +1,238 @@
+"""Chunked, resumable uploads (tus 1.0 core with the creation, checksum and
+termination extensions).
+
+A client creates an ``UploadSession`` either the tus way (``POST`` with
+``Upload-Length`` and ``Upload-Metadata`` headers, see
+``parse_upload_metadata``) or with a JSON body, and sends the file in
+``PATCH`` requests carrying ``Upload-Offset`` and
+``Upload-Checksum: <algorithm> <base64 digest>``. Each chunk is read from the
+request stream in ``COPY_BLOCK_SIZE`` blocks and written straight into
+``MEDIA_ROOT/uploads/<id>.part``; on a checksum mismatch or a short body the
+part file is truncated back to the old offset. After the last chunk the part
+file is moved into storage and the ``Video`` is created on the background
+queue (``videos.tasks``), so the request returns immediately; media
+processing (``videos.processing``) is queued from there. The queue lives in
+the web process: ``manage.py finalize_uploads`` retries sessions left in
+``processing`` by a restart.
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from . import tasks
+from .models import UploadSession, Video
+from .processing import schedule_processing
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, the conditional UPDATE still guards the offset
+    fcntl = None
+
+TUS_VERSION = "1.0.0"
+CHECKSUM_ALGORITHMS = ("md5", "sha1", "sha256")
+COPY_BLOCK_SIZE = 64 * 1024
+HTTP_CHECKSUM_MISMATCH = 460
+
+
+class UploadError(Exception):
+    def __init__(self, status, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def parse_checksum(header):
+    """``"sha256 <base64>"`` -> ``(hashlib object, expected digest)``."""
+    algorithm, _, encoded = (header or "").strip().partition(" ")
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise UploadError(400, f"Unsupported checksum algorithm: {algorithm or '-'}")
+    try:
+        expected = base64.b64decode(encoded.strip(), validate=True)
+    except ValueError:
+        raise UploadError(400, "Malformed Upload-Checksum header") from None
+    return hashlib.new(algorithm), expected
+
+
+def parse_upload_metadata(header):
+    """``Upload-Metadata`` (``"key base64,key2 base64"``) -> dict of decoded strings."""
+    metadata = {}
+    for pair in (header or "").split(","):
+        key, _, encoded = pair.strip().partition(" ")
+        if not key:
+            continue
+        try:
+            metadata[key] = base64.b64decode(encoded.strip(), validate=True).decode()
+        except (binascii.Error, UnicodeDecodeError):
+            raise UploadError(400, f"Malformed Upload-Metadata value for {key!r}") from None
+    return metadata
+
+
+def creation_data(headers):
+    """Serializer data for a tus creation request (``Upload-Length`` + ``Upload-Metadata``)."""
+    try:
+        length = int(headers["Upload-Length"])
+    except ValueError:
+        raise UploadError(400, "Malformed Upload-Length header") from None
+    metadata = parse_upload_metadata(headers.get("Upload-Metadata"))
+    filename = metadata.get("filename") or metadata.get("name") or "video"
+    return {
+        "title": metadata.get("title") or os.path.splitext(filename)[0] or filename,
+        "description": metadata.get("description", ""),
+        "filename": filename,
+        "length": length,
+    }
+
+
+def _open_part(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    return os.fdopen(fd, "r+b")
+
+
+def append_chunk(session, stream, offset, content_length, checksum_header=None):
+    """Append ``content_length`` bytes from ``stream`` at ``offset``; returns the new offset."""
+    if session.status != UploadSession.Status.UPLOADING:
+        raise UploadError(409, "Upload is already complete")
+    if offset != session.offset:
+        raise UploadError(409, f"Upload-Offset {offset} does not match {session.offset}")
+    max_chunk = getattr(settings, "VIDEO_UPLOAD_MAX_CHUNK_SIZE", 64 * 1024 * 1024)
+    if content_length > max_chunk or offset + content_length > session.length:
+        raise UploadError(413, "Chunk exceeds the chunk size limit or the declared length")
+
+    hasher = expected = None
+    if checksum_header:
+        hasher, expected = parse_checksum(checksum_header)
+    elif getattr(settings, "VIDEO_UPLOAD_REQUIRE_CHECKSUM", True):
+        raise UploadError(400, "Upload-Checksum header is required")
+
+    with _open_part(session.part_path) as part:
+        if fcntl is not None:
+            fcntl.flock(part.fileno(), fcntl.LOCK_EX)
+        # Another request may have appended while this one waited for the lock
+        current = UploadSession.objects.values_list("offset", flat=True).get(pk=session.pk)
+        if current != offset:
+            raise UploadError(409, f"Upload-Offset {offset} does not match {current}")
+
+        part.seek(offset)
+        part.truncate()
+        remaining = content_length
+        while remaining:
+            block = stream.read(min(COPY_BLOCK_SIZE, remaining)) if stream else b""
+            if not block:
+                break
+            if hasher:
+                hasher.update(block)
+            part.write(block)
+            remaining -= len(block)
+        if remaining:
+            part.truncate(offset)
+            raise UploadError(400, "Request body is shorter than Content-Length")
+        if hasher and hasher.digest() != expected:
+            part.truncate(offset)
+            raise UploadError(HTTP_CHECKSUM_MISMATCH, "Checksum mismatch")
+        part.flush()
+        os.fsync(part.fileno())
+
+        new_offset = offset + content_length
+        complete = new_offset == session.length
+        status = UploadSession.Status.PROCESSING if complete else UploadSession.Status.UPLOADING
+        updated = UploadSession.objects.filter(pk=session.pk, offset=offset).update(
+            offset=new_offset, status=status, updated_at=timezone.now()
+        )
+        if not updated:
+            # Only reachable without flock: a concurrent request wrote over the
+            # same bytes first. Drop them and let the client resume from offset.
+            part.truncate(offset)
+            UploadSession.objects.filter(pk=session.pk, status=UploadSession.Status.UPLOADING).update(
+                offset=offset, updated_at=timezone.now()
+            )
+            raise UploadError(409, f"Upload-Offset {offset} was advanced by a concurrent request")
+    session.offset = new_offset
+    session.status = status
+    if complete:
+        transaction.on_commit(lambda: tasks.submit(finalize_upload, session.pk))
+    return new_offset
+
+
+def _move_into_storage(part_path, filename):
+    wanted = "videos/" + get_valid_filename(os.path.basename(filename) or "video")
+    try:
+        default_storage.path(wanted)
+    except NotImplementedError:
+        with open(part_path, "rb") as part:
+            name = default_storage.save(wanted, File(part))
+        os.remove(part_path)
+        return name
+    while True:
+        name = default_storage.get_available_name(wanted)
+        destination = default_storage.path(name)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        # Claim the name with O_EXCL (as FileSystemStorage does) so a concurrent
+        # finalize of a same-named upload picks another one, then move over the claim
+        try:
+            os.close(os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+        except FileExistsError:
+            continue
+        try:
+            os.replace(part_path, destination)
+        except OSError:
+            os.remove(destination)
+            raise
+        return name
+
+
+def finalize_upload(session_id):
+    """Background step: move the assembled file into storage and create the ``Video``."""
+    session = UploadSession.objects.select_related("owner").get(pk=session_id)
+    if session.status != UploadSession.Status.PROCESSING:
+        return session.video
+    try:
+        if not os.path.exists(session.part_path):
+            raise FileNotFoundError(f"Part file {session.part_path} is missing")
+        name = _move_into_storage(session.part_path, session.filename)
+        video = Video.objects.create(
+            title=session.title,
+            description=session.description,
+            file=name,
+            uploaded_by=session.owner,
+        )
+    except Exception as exc:
+        session.status = UploadSession.Status.FAILED
+        session.error = str(exc)
+        session.save(update_fields=["status", "error", "updated_at"])
+        raise
+    session.video = video
+    session.status = UploadSession.Status.DONE
+    session.save(update_fields=["video", "status", "updated_at"])
+    schedule_processing(video.pk)
+    return video
+
+
+def stale_sessions(minutes):
+    """Sessions stuck in ``processing`` for longer than ``minutes``, e.g. after a restart."""
+    cutoff = timezone.now() - timedelta(minutes=minutes)
+    return UploadSession.objects.filter(status=UploadSession.Status.PROCESSING, updated_at__lt=cutoff)
+
+
+def retry_finalize(session):
+    """Claim a stale session (so concurrent retries skip it) and finalize it in this process.
+
+    Returns the ``Video`` or ``None`` if another worker claimed the session first;
+    a failed finalize marks the session ``failed`` and re-raises.
+    """
+    claimed = UploadSession.objects.filter(
+        pk=session.pk, status=UploadSession.Status.PROCESSING, updated_at=session.updated_at
+    ).update(updated_at=timezone.now())
+    if not claimed:
+        return None
+    return finalize_upload(session.pk)
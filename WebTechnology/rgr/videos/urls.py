@@ -2,10 +2,11 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from .views import RegisterView, VideoViewSet
+from .views import RegisterView, UploadViewSet, VideoViewSet
 
 router = DefaultRouter()
 router.register("videos", VideoViewSet, basename="videos")
+router.register("uploads", UploadViewSet, basename="uploads")
 
 urlpatterns = [
     path("auth/register/", RegisterView.as_view(), name="register"),
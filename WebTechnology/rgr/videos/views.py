@@ -1,14 +1,31 @@
-import mimetypes
+import base64
+import hashlib
+import json
 import os
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.http import FileResponse, HttpResponse, Http404
-from rest_framework import generics, permissions, viewsets
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework import generics, mixins, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from .models import Video
-from .serializers import RegisterSerializer, VideoCreateSerializer, VideoSerializer
+from .caching import list_cache_key, list_cache_timeout
+from .counters import record_view
+from .models import UploadSession, Video
+from .pagination import VideoCursorPagination
+from .processing import reset_media, schedule_processing
+from .serializers import (
+    RegisterSerializer,
+    UploadSessionSerializer,
+    VideoCreateSerializer,
+    VideoSerializer,
+)
+from .streaming import ranged_file_response
+from .uploads import CHECKSUM_ALGORITHMS, TUS_VERSION, UploadError, append_chunk, creation_data
 
 User = get_user_model()
 
@@ -19,9 +36,41 @@ class RegisterView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
 
 
+LIST_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "file",
+    "thumbnail",
+    "created_at",
+    "updated_at",
+    "views",
+    "duration",
+    "media_status",
+    "sprite",
+    "sprite_info",
+    "hls_playlist",
+    "renditions",
+    "uploaded_by__username",
+)
+
+# Served while a video has no thumbnail yet, to keep the UI consistent
+PLACEHOLDER_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR4nGNgYAAAAAMA"
+    "ASsJTYQAAAAASUVORK5CYII="
+)
+
+
 class VideoViewSet(viewsets.ModelViewSet):
     queryset = Video.objects.all()
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = VideoCursorPagination
+
+    def get_queryset(self):
+        queryset = Video.objects.select_related("uploaded_by")
+        if self.action == "list":
+            queryset = queryset.only(*LIST_FIELDS)
+        return queryset
 
     def get_serializer_class(self):
         if self.action in ("create", "update", "partial_update"):
@@ -29,7 +78,31 @@ class VideoViewSet(viewsets.ModelViewSet):
         return VideoSerializer
 
     def perform_create(self, serializer):
-        serializer.save(uploaded_by=self.request.user)
+        video = serializer.save(uploaded_by=self.request.user)
+        schedule_processing(video.pk)
+
+    def perform_update(self, serializer):
+        old_file_name = serializer.instance.file.name
+        video = serializer.save()
+        if video.file.name != old_file_name:
+            reset_media(video, old_file_name)
+            schedule_processing(video.pk)
+
+    def list(self, request, *args, **kwargs):
+        key = list_cache_key(request)
+        page = cache.get(key)
+        if page is None:
+            videos = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+            data = self.get_paginated_response(self.get_serializer(videos, many=True).data).data
+            body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+            page = {"data": data, "etag": f'"{hashlib.md5(body).hexdigest()}"'}
+            cache.set(key, page, list_cache_timeout())
+
+        # ETag only: deletes and .update() writes (view flush, media processing)
+        # leave updated_at alone, so no Last-Modified derived from rows is safe.
+        response = Response(page["data"])
+        response["ETag"] = page["etag"]
+        return get_conditional_response(request, etag=page["etag"], response=response)
 
     @action(detail=True, methods=["get"], url_path="stream", permission_classes=[permissions.AllowAny])
     def stream(self, request, pk=None):
@@ -38,42 +111,99 @@ class VideoViewSet(viewsets.ModelViewSet):
         if not os.path.exists(video_path):
             raise Http404("Video not found")
 
-        range_header = request.headers.get("Range", "")
-        content_type, _ = mimetypes.guess_type(video_path)
-        content_type = content_type or "application/octet-stream"
+        record_view(request, video.pk)
+        return ranged_file_response(request, video_path, video.file.name)
+
+    @action(detail=True, methods=["get"], url_path="thumbnail", permission_classes=[permissions.AllowAny])
+    def thumbnail(self, request, pk=None):
+        video = self.get_object()
+        if video.thumbnail and video.thumbnail.storage.exists(video.thumbnail.name):
+            return FileResponse(video.thumbnail.open("rb"))
+        return HttpResponse(PLACEHOLDER_PNG, content_type="image/png")
+
+
+class UploadViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """Resumable uploads: ``POST`` creates, ``HEAD``/``GET`` report the offset, ``PATCH`` appends.
 
-        if range_header:
+    ``POST`` accepts tus creation headers (``Upload-Length``, ``Upload-Metadata``
+    with ``filename``/``title``/``description``) or a JSON body.
+    """
+
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(owner=self.request.user)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response["Tus-Resumable"] = TUS_VERSION
+        response["Tus-Version"] = TUS_VERSION
+        response["Tus-Extension"] = "creation,checksum,termination"
+        response["Tus-Max-Size"] = str(getattr(settings, "VIDEO_UPLOAD_MAX_SIZE", 10 * 1024 ** 3))
+        response["Tus-Checksum-Algorithm"] = ",".join(CHECKSUM_ALGORITHMS)
+        response["Cache-Control"] = "no-store"
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def _offset_headers(self, response, session):
+        response["Upload-Offset"] = str(session.offset)
+        response["Upload-Length"] = str(session.length)
+        return response
+
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        if "Upload-Length" in request.headers:
             try:
-                units, range_spec = range_header.split("=")
-                if units != "bytes":
-                    return HttpResponse(status=416)
-                start_str, end_str = range_spec.split("-")
-                file_size = os.path.getsize(video_path)
-                start = int(start_str) if start_str else 0
-                end = int(end_str) if end_str else file_size - 1
-                end = min(end, file_size - 1)
-                if start > end:
-                    return HttpResponse(status=416)
-                length = end - start + 1
-
-                with open(video_path, "rb") as video_file:
-                    video_file.seek(start)
-                    data = video_file.read(length)
-
-                response = HttpResponse(
-                    data,
-                    status=206,
-                    content_type=content_type,
-                )
-                response["Content-Range"] = f"bytes {start}-{end}/{file_size}"
-                response["Accept-Ranges"] = "bytes"
-                response["Content-Length"] = str(length)
-                video.views = video.views + 1
-                video.save(update_fields=["views"])
-                return response
-            except (ValueError, OSError):
-                return HttpResponse(status=416)
-
-        video.views = video.views + 1
-        video.save(update_fields=["views"])
-        return FileResponse(open(video_path, "rb"), content_type=content_type)
+                data = creation_data(request.headers)
+            except UploadError as exc:
+                return Response({"detail": exc.detail}, status=exc.status)
+        else:
+            data = request.data
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        session = serializer.instance
+        response = Response(serializer.data, status=status.HTTP_201_CREATED)
+        response["Location"] = request.build_absolute_uri(f"{session.pk}/")
+        return self._offset_headers(response, session)
+
+    def retrieve(self, request, *args, **kwargs):
+        session = self.get_object()
+        return self._offset_headers(Response(self.get_serializer(session).data), session)
+
+    def partial_update(self, request, *args, **kwargs):
+        session = self.get_object()
+        if request.content_type != "application/offset+octet-stream":
+            return Response(
+                {"detail": "Content-Type must be application/offset+octet-stream"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except (KeyError, ValueError):
+            return Response(
+                {"detail": "Upload-Offset and Content-Length are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            append_chunk(
+                session,
+                request.stream,
+                offset,
+                content_length,
+                request.headers.get("Upload-Checksum"),
+            )
+        except UploadError as exc:
+            response = Response({"detail": exc.detail}, status=exc.status)
+            return self._offset_headers(response, session)
+        return self._offset_headers(Response(status=status.HTTP_204_NO_CONTENT), session)
+
+    def perform_destroy(self, instance):
+        instance.discard()